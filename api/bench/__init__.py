@@ -0,0 +1,4 @@
+"""Offline benchmarks for the API, driven by synthetic FastF1 sessions.
+
+    cd api && python -m bench.run --help
+"""
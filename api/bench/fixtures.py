@@ -0,0 +1,780 @@
+"""Synthetic FastF1 sessions for offline benchmarks.
+
+Builds FastF1-shaped objects without touching the network: an event
+schedule, `Session` objects whose `load()` fills laps, results, track status,
+weather, race control messages and car/position telemetry for a full grid,
+and an Ergast stand-in for the standings and pre-2018 routes. `install()`
+patches them into `fastf1` so every blueprint runs unchanged.
+
+Data is deterministic for a given seed and shaped like a real race: a closed
+track with braking zones, per-driver pace, tyre degradation, two pit stops
+per car, a safety car period and a retirement.
+"""
+
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+import fastf1
+import fastf1.ergast
+import numpy as np
+import pandas as pd
+from fastf1.core import Laps, Session, SessionResults, Telemetry
+from fastf1.events import Event, EventSchedule
+from fastf1.mvapi import CircuitInfo
+
+TEAMS = {
+    "red_bull": ("Red Bull Racing", "3671C6"),
+    "ferrari": ("Ferrari", "E8002D"),
+    "mercedes": ("Mercedes", "27F4D2"),
+    "mclaren": ("McLaren", "FF8000"),
+    "aston_martin": ("Aston Martin", "229971"),
+    "alpine": ("Alpine", "FF87BC"),
+    "williams": ("Williams", "64C4FF"),
+    "rb": ("RB", "6692FF"),
+    "sauber": ("Kick Sauber", "52E252"),
+    "haas": ("Haas F1 Team", "B6BABD"),
+}
+
+# (number, abbreviation, first name, last name, team id)
+DRIVERS = [
+    ("1", "VER", "Max", "Verstappen", "red_bull"),
+    ("11", "PER", "Sergio", "Perez", "red_bull"),
+    ("16", "LEC", "Charles", "Leclerc", "ferrari"),
+    ("55", "SAI", "Carlos", "Sainz", "ferrari"),
+    ("44", "HAM", "Lewis", "Hamilton", "mercedes"),
+    ("63", "RUS", "George", "Russell", "mercedes"),
+    ("4", "NOR", "Lando", "Norris", "mclaren"),
+    ("81", "PIA", "Oscar", "Piastri", "mclaren"),
+    ("14", "ALO", "Fernando", "Alonso", "aston_martin"),
+    ("18", "STR", "Lance", "Stroll", "aston_martin"),
+    ("10", "GAS", "Pierre", "Gasly", "alpine"),
+    ("31", "OCO", "Esteban", "Ocon", "alpine"),
+    ("23", "ALB", "Alexander", "Albon", "williams"),
+    ("2", "SAR", "Logan", "Sargeant", "williams"),
+    ("22", "TSU", "Yuki", "Tsunoda", "rb"),
+    ("3", "RIC", "Daniel", "Ricciardo", "rb"),
+    ("77", "BOT", "Valtteri", "Bottas", "sauber"),
+    ("24", "ZHO", "Guanyu", "Zhou", "sauber"),
+    ("27", "HUL", "Nico", "Hulkenberg", "haas"),
+    ("20", "MAG", "Kevin", "Magnussen", "haas"),
+]
+
+LOCATIONS = [
+    ("Bahrain", "Sakhir"),
+    ("Saudi Arabia", "Jeddah"),
+    ("Australia", "Melbourne"),
+    ("Japan", "Suzuka"),
+    ("China", "Shanghai"),
+    ("United States", "Miami"),
+    ("Italy", "Imola"),
+    ("Monaco", "Monaco"),
+    ("Canada", "Montreal"),
+    ("Spain", "Barcelona"),
+    ("Austria", "Spielberg"),
+    ("United Kingdom", "Silverstone"),
+    ("Hungary", "Budapest"),
+    ("Belgium", "Spa-Francorchamps"),
+    ("Netherlands", "Zandvoort"),
+    ("Italy", "Monza"),
+    ("Azerbaijan", "Baku"),
+    ("Singapore", "Marina Bay"),
+    ("United States", "Austin"),
+    ("Mexico", "Mexico City"),
+    ("Brazil", "Sao Paulo"),
+    ("United States", "Las Vegas"),
+    ("Qatar", "Lusail"),
+    ("Abu Dhabi", "Yas Island"),
+]
+
+CONVENTIONAL_SESSIONS = ("Practice 1", "Practice 2", "Practice 3", "Qualifying", "Race")
+SPRINT_SESSIONS = ("Practice 1", "Sprint Qualifying", "Sprint", "Qualifying", "Race")
+POINTS = (25, 18, 15, 12, 10, 8, 6, 4, 2, 1)
+
+TRACK_LENGTH_M = 5000.0
+TRACK_SAMPLES = 2000
+# (position along the lap as a fraction, minimum speed in km/h)
+CORNERS = [
+    (0.06, 95),
+    (0.14, 160),
+    (0.22, 240),
+    (0.31, 110),
+    (0.38, 180),
+    (0.47, 80),
+    (0.55, 210),
+    (0.63, 130),
+    (0.71, 260),
+    (0.79, 100),
+    (0.87, 150),
+    (0.94, 190),
+]
+TOP_SPEED = 325.0
+COMPOUND_DEGRADATION = {"SOFT": 0.0009, "MEDIUM": 0.0005, "HARD": 0.0003}
+COMPOUND_PACE = {"SOFT": -0.008, "MEDIUM": 0.0, "HARD": 0.006}
+PIT_LOSS_S = 21.0
+# A missing lap or session time; pd.NaT would make all-empty columns datetime64
+NO_TIME = np.timedelta64("NaT", "ns")
+
+
+class Track:
+    """A closed synthetic circuit with a speed profile along it."""
+
+    def __init__(self):
+        s = np.linspace(0.0, 1.0, TRACK_SAMPLES, endpoint=False)
+        theta = 2 * np.pi * s
+        radius = 1 + 0.25 * np.sin(3 * theta) + 0.1 * np.cos(5 * theta)
+        x, y = radius * np.cos(theta), 0.6 * radius * np.sin(theta)
+        perimeter = np.hypot(np.diff(x, append=x[:1]), np.diff(y, append=y[:1])).sum()
+        # FastF1 positions are in 1/10 m
+        scale = TRACK_LENGTH_M / perimeter * 10
+        self.s = s
+        self.x = x * scale
+        self.y = y * scale
+
+        speed = np.full_like(s, TOP_SPEED)
+        for at, minimum in CORNERS:
+            distance = np.minimum(np.abs(s - at), 1 - np.abs(s - at))
+            dip = (TOP_SPEED - minimum) * np.exp(-((distance / 0.025) ** 2))
+            speed = np.minimum(speed, TOP_SPEED - dip)
+        self.speed = speed
+        self.accel = np.gradient(np.concatenate([speed[-1:], speed, speed[:1]]))[1:-1]
+
+        dt = (TRACK_LENGTH_M / TRACK_SAMPLES) / (speed / 3.6)
+        self.lap_time = dt.sum()
+        self.tau = np.concatenate([[0.0], np.cumsum(dt)[:-1]]) / self.lap_time
+
+    def progress(self, tau):
+        """Track position (fraction of a lap) at a fraction of the lap time."""
+        return np.interp(tau, self.tau, self.s)
+
+    def at(self, s, column):
+        return np.interp(s, self.s, getattr(self, column), period=1.0)
+
+    def circuit_info(self, with_distance=True):
+        """Corner markers, with distances only if `with_distance`.
+
+        FastF1 places markers along a reference lap's telemetry, so a
+        session loaded without telemetry gets NaN distances.
+        """
+        corners = []
+        for number, (at, _) in enumerate(CORNERS, start=1):
+            corners.append(
+                {
+                    "X": float(self.at(at, "x")),
+                    "Y": float(self.at(at, "y")),
+                    "Number": number,
+                    "Letter": "",
+                    "Angle": float(np.degrees(2 * np.pi * at) % 360),
+                    "Distance": at * TRACK_LENGTH_M if with_distance else np.nan,
+                }
+            )
+        corners = pd.DataFrame(corners)
+        return CircuitInfo(
+            corners=corners,
+            marshal_lights=corners.copy(),
+            marshal_sectors=corners.copy(),
+            rotation=0.0,
+        )
+
+
+class SyntheticSession(Session):
+    """A FastF1 Session whose `load()` fills in generated data."""
+
+    def __init__(self, event, session_name, season):
+        super().__init__(event, session_name, f1_api_support=False)
+        self._season = season
+
+    def load(self, *, laps=True, telemetry=True, weather=True, messages=True, **_):
+        data = self._season.session_data(int(self.event["RoundNumber"]), self.name)
+        self._session_start_time = data["start"]
+        self._t0_date = data["t0_date"]
+        self._results = SessionResults(data["results"], _force_default_cols=True)
+        self._session_status = data["session_status"]
+        self._track_status = data["track_status"]
+        self._total_laps = data["total_laps"]
+        if laps:
+            self._laps = Laps(data["laps"], session=self)
+        if telemetry:
+            self._car_data = {
+                drv: Telemetry(frame, session=self, driver=drv)
+                for drv, frame in data["car_data"].items()
+            }
+            self._pos_data = {
+                drv: Telemetry(frame, session=self, driver=drv)
+                for drv, frame in data["pos_data"].items()
+            }
+        if weather:
+            self._weather_data = data["weather"]
+        if messages:
+            self._race_control_messages = data["race_control"]
+
+    def get_circuit_info(self):
+        return self._season.track.circuit_info(hasattr(self, "_car_data"))
+
+
+class SyntheticEvent(Event):
+    """An Event whose sessions are synthetic."""
+
+    _metadata = [*Event._metadata, "season"]
+
+    def __init__(self, *args, season=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.season = season
+
+    @property
+    def _constructor(self):
+        return SyntheticEvent
+
+    def get_session(self, identifier):
+        name = self.get_session_name(identifier)
+        return SyntheticSession(self, name, self.season)
+
+
+class ErgastResponse:
+    """The subset of an Ergast multi-response the routes read."""
+
+    def __init__(self, frame, description):
+        self.content = [frame]
+        self.description = pd.DataFrame([description])
+
+
+class SyntheticErgast:
+    """Ergast stand-in serving standings and results from a SyntheticSeason."""
+
+    season = None
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def _standings(self, season):
+        return self.season.standings(season)
+
+    def get_driver_standings(self, season=None, round=None, **kwargs):
+        rows, last_round = self._standings(season)
+        return ErgastResponse(rows, {"season": season, "round": last_round})
+
+    def get_constructor_standings(self, season=None, round=None, **kwargs):
+        rows, last_round = self._standings(season)
+        teams = (
+            rows.groupby(["constructorId", "constructorName"])[["points", "wins"]]
+            .sum()
+            .reset_index()
+            .sort_values("points", ascending=False, ignore_index=True)
+        )
+        teams["position"] = np.arange(1, len(teams) + 1)
+        return ErgastResponse(teams, {"season": season, "round": last_round})
+
+    def get_race_results(self, season=None, round=None, **kwargs):
+        return ErgastResponse(
+            self.season.ergast_results(round, "Race"),
+            {"season": season, "round": round},
+        )
+
+    def get_qualifying_results(self, season=None, round=None, **kwargs):
+        return ErgastResponse(
+            self.season.ergast_results(round, "Qualifying"),
+            {"season": season, "round": round},
+        )
+
+
+def _td(seconds):
+    return pd.to_timedelta(seconds, unit="s")
+
+
+class SyntheticSeason:
+    """A deterministic season of synthetic events and sessions.
+
+    `race_laps` and `hz` set the size of the generated race: the defaults
+    (70 laps, 4 Hz car and position data for 20 drivers) roughly match a
+    real FastF1 race load. Other sessions run `session_laps` laps.
+    """
+
+    def __init__(
+        self,
+        year=2024,
+        rounds=24,
+        completed_rounds=16,
+        race_laps=70,
+        session_laps=18,
+        hz=4.0,
+        seed=0,
+        sprint_rounds=(5, 6, 11, 19, 21, 23),
+    ):
+        self.year = year
+        self.rounds = rounds
+        self.completed_rounds = completed_rounds
+        self.race_laps = race_laps
+        self.session_laps = session_laps
+        self.hz = hz
+        self.seed = seed
+        self.sprint_rounds = set(sprint_rounds)
+        self.track = Track()
+        self._data = {}
+
+    # --- Schedule ---
+
+    def schedule(self, year=None, include_testing=False, **kwargs):
+        year = year or self.year
+        start = datetime(year, 3, 2, 15, tzinfo=timezone.utc)
+        rows = []
+        for i in range(self.rounds):
+            country, location = LOCATIONS[i % len(LOCATIONS)]
+            race_date = start + timedelta(weeks=i)
+            sprint = (i + 1) in self.sprint_rounds
+            names = SPRINT_SESSIONS if sprint else CONVENTIONAL_SESSIONS
+            row = {
+                "RoundNumber": i + 1,
+                "Country": country,
+                "Location": location,
+                "OfficialEventName": f"FORMULA 1 {country.upper()} GRAND PRIX {year}",
+                "EventDate": pd.Timestamp(race_date.replace(tzinfo=None)),
+                "EventName": f"{location} Grand Prix",
+                "EventFormat": "sprint_qualifying" if sprint else "conventional",
+                "F1ApiSupport": False,
+            }
+            for n, name in enumerate(names, start=1):
+                if name == "Race":
+                    date = pd.Timestamp(race_date)
+                else:
+                    date = pd.Timestamp(race_date) - pd.Timedelta(
+                        hours=48 - (n - 1) * 10
+                    )
+                row[f"Session{n}"] = name
+                row[f"Session{n}Date"] = date
+                row[f"Session{n}DateUtc"] = date.tz_convert(None)
+            rows.append(row)
+        return EventSchedule(pd.DataFrame(rows), year=year, _force_default_cols=True)
+
+    def get_event(self, year, key, **kwargs):
+        schedule = self.schedule(year)
+        if isinstance(key, int) or str(key).isdigit():
+            match = schedule[schedule["RoundNumber"] == int(key)]
+        else:
+            needle = str(key).lower()
+            match = schedule[
+                schedule["EventName"].str.lower().str.contains(needle, regex=False)
+                | schedule["Location"].str.lower().str.contains(needle, regex=False)
+                | schedule["Country"].str.lower().str.contains(needle, regex=False)
+            ]
+        if match.empty:
+            raise ValueError(f"No synthetic event matching {key!r}")
+        return SyntheticEvent(match.iloc[0].to_dict(), year=year, season=self)
+
+    def get_session(self, year, key, identifier, **kwargs):
+        return self.get_event(year, key).get_session(identifier)
+
+    def ergast(self):
+        """An Ergast class bound to this season."""
+        return type("Ergast", (SyntheticErgast,), {"season": self})
+
+    # --- Ergast tables ---
+
+    def standings(self, season):
+        rng = np.random.default_rng(self.seed + 7)
+        pace = self._pace(rng)
+        last_round = min(self.completed_rounds, self.rounds)
+        points = np.zeros(len(DRIVERS))
+        wins = np.zeros(len(DRIVERS), dtype=int)
+        for _ in range(last_round):
+            order = np.argsort(pace + rng.normal(0, 0.004, len(DRIVERS)))
+            for place, idx in enumerate(order[: len(POINTS)]):
+                points[idx] += POINTS[place]
+            wins[order[0]] += 1
+        rows = []
+        for idx, (number, abbr, first, last, team) in enumerate(DRIVERS):
+            rows.append(
+                {
+                    "points": float(points[idx]),
+                    "wins": int(wins[idx]),
+                    "driverNumber": int(number),
+                    "driverId": last.lower(),
+                    "driverCode": abbr,
+                    "givenName": first,
+                    "familyName": last,
+                    "constructorIds": [team],
+                    "constructorNames": [TEAMS[team][0]],
+                    "constructorId": team,
+                    "constructorName": TEAMS[team][0],
+                }
+            )
+        frame = pd.DataFrame(rows).sort_values(
+            "points", ascending=False, ignore_index=True
+        )
+        frame["position"] = np.arange(1, len(frame) + 1)
+        return frame, last_round
+
+    def ergast_results(self, round_number, session_name):
+        results = self.session_data(round_number, session_name)["results"]
+        rows = []
+        for _, row in results.iterrows():
+            number, abbr, first, last, team = _driver(row["DriverNumber"])
+            rows.append(
+                {
+                    "number": int(number),
+                    "position": int(row["Position"]),
+                    "points": float(row["Points"]),
+                    "grid": int(row["GridPosition"]),
+                    "status": row["Status"],
+                    "driverId": last.lower(),
+                    "driverCode": abbr,
+                    "givenName": first,
+                    "familyName": last,
+                    "constructorId": team,
+                    "constructorName": TEAMS[team][0],
+                    "Q1": row["Q1"],
+                    "Q2": row["Q2"],
+                    "Q3": row["Q3"],
+                }
+            )
+        return pd.DataFrame(rows)
+
+    # --- Sessions ---
+
+    def _pace(self, rng):
+        """Per-driver lap time factor offsets, grouped by team."""
+        team_pace = {team: i * 0.0025 for i, team in enumerate(TEAMS)}
+        return np.array([team_pace[d[4]] + rng.normal(0, 0.0015) for d in DRIVERS])
+
+    def session_data(self, round_number, session_name):
+        key = (int(round_number), session_name)
+        if key not in self._data:
+            self._data[key] = self._generate(*key)
+        return self._data[key]
+
+    def _generate(self, round_number, session_name):
+        rng = np.random.default_rng([self.seed, round_number, len(session_name)])
+        is_race = session_name in ("Race", "Sprint")
+        total_laps = self.race_laps if session_name == "Race" else self.session_laps
+        start = timedelta(hours=1)
+        t0_date = datetime(self.year, 3, 2, 14) + timedelta(weeks=round_number - 1)
+
+        pace = self._pace(rng)
+        track = self.track
+        n_drivers = len(DRIVERS)
+        sc_laps = set()
+        if is_race and total_laps > 20:
+            sc_start = int(rng.integers(total_laps // 3, total_laps // 2))
+            sc_laps = set(range(sc_start, sc_start + 4))
+        retired = int(rng.integers(n_drivers // 2, n_drivers)) if is_race else None
+        retire_lap = int(rng.integers(total_laps // 2, total_laps)) if is_race else None
+
+        lap_rows = []
+        driver_laps = {}
+        for idx, (number, abbr, _, _, team) in enumerate(DRIVERS):
+            if is_race and total_laps > 20:
+                stops = sorted(
+                    {
+                        int(total_laps * 0.3 + rng.integers(-4, 5)),
+                        int(total_laps * 0.65 + rng.integers(-4, 5)),
+                    }
+                )
+                compounds = ["MEDIUM", "HARD", "SOFT" if idx % 2 else "HARD"]
+            elif is_race:
+                stops = []
+                compounds = ["MEDIUM"]
+            else:
+                stops = [total_laps // 2]
+                compounds = ["SOFT", "SOFT"]
+
+            clock = start.total_seconds() + (idx * 0.25 if is_race else idx * 40.0)
+            stint, tyre_life = 1, 0
+            best = np.inf
+            laps_done = []
+            for lap in range(1, total_laps + 1):
+                if idx == retired and lap > retire_lap:
+                    break
+                compound = compounds[stint - 1]
+                tyre_life += 1
+                fuel = 0.0015 * (total_laps - lap) if is_race else 0.0
+                factor = (
+                    1
+                    + pace[idx]
+                    + COMPOUND_PACE[compound]
+                    + COMPOUND_DEGRADATION[compound] * tyre_life
+                    + fuel
+                    + rng.normal(0, 0.002)
+                )
+                if lap == 1 and is_race:
+                    factor += 0.06
+                if lap in sc_laps:
+                    factor = 1.45
+                lap_time = track.lap_time * factor
+                pit_in = lap in stops
+                pit_out = lap - 1 in stops
+                if pit_in:
+                    lap_time += PIT_LOSS_S * 0.4
+                if pit_out:
+                    lap_time += PIT_LOSS_S * 0.6
+
+                lap_start = clock
+                clock += lap_time
+                s1 = lap_time * np.interp(1 / 3, track.s, track.tau)
+                s2 = lap_time * np.interp(2 / 3, track.s, track.tau) - s1
+                s3 = lap_time - s1 - s2
+                accurate = not (pit_in or pit_out or lap == 1 or lap in sc_laps)
+                personal_best = accurate and lap_time < best
+                if personal_best:
+                    best = lap_time
+
+                lap_rows.append(
+                    {
+                        "Time": _td(clock),
+                        "Driver": abbr,
+                        "DriverNumber": number,
+                        "LapTime": _td(lap_time),
+                        "LapNumber": float(lap),
+                        "Stint": float(stint),
+                        "PitOutTime": _td(lap_start) if pit_out else NO_TIME,
+                        "PitInTime": _td(clock) if pit_in else NO_TIME,
+                        "Sector1Time": _td(s1),
+                        "Sector2Time": _td(s2),
+                        "Sector3Time": _td(s3),
+                        "Sector1SessionTime": _td(lap_start + s1),
+                        "Sector2SessionTime": _td(lap_start + s1 + s2),
+                        "Sector3SessionTime": _td(clock),
+                        "SpeedI1": float(track.at(0.25, "speed") / factor),
+                        "SpeedI2": float(track.at(0.6, "speed") / factor),
+                        "SpeedFL": float(track.at(0.99, "speed") / factor),
+                        "SpeedST": float(track.speed.max() / factor),
+                        "IsPersonalBest": personal_best,
+                        "Compound": compound,
+                        "TyreLife": float(tyre_life),
+                        "FreshTyre": True,
+                        "Team": TEAMS[team][0],
+                        "LapStartTime": _td(lap_start),
+                        "LapStartDate": t0_date + timedelta(seconds=lap_start),
+                        "TrackStatus": "4" if lap in sc_laps else "1",
+                        "Position": np.nan,
+                        "Deleted": False,
+                        "DeletedReason": "",
+                        "FastF1Generated": False,
+                        "IsAccurate": accurate,
+                    }
+                )
+                laps_done.append((lap_start, clock, factor))
+                if pit_in:
+                    stint += 1
+                    tyre_life = 0
+            driver_laps[number] = np.array(laps_done)
+
+        laps = pd.DataFrame(lap_rows)
+        if is_race:
+            # Running order at the end of each lap
+            laps["Position"] = (
+                laps.groupby("LapNumber")["Time"].rank(method="first").astype(float)
+            )
+        results = self._results(laps, session_name, is_race, retired)
+
+        # One sample clock for every car, as in the live timing feed: FastF1
+        # joins all drivers' samples on SessionTime to find the car ahead
+        first = min(w[0, 0] for w in driver_laps.values())
+        last = max(w[-1, 1] for w in driver_laps.values())
+        clock = np.arange(first - 1.0, last + 1.0, 1 / self.hz)
+        clock += rng.uniform(-0.02, 0.02, clock.size)
+        car_data, pos_data = {}, {}
+        for number, windows in driver_laps.items():
+            car_data[number], pos_data[number] = self._telemetry(
+                windows, clock, t0_date, start, rng
+            )
+
+        sc_times = laps[laps["TrackStatus"] == "4"]["LapStartTime"]
+        track_status = [{"Time": _td(0), "Status": "1", "Message": "AllClear"}]
+        race_control = [
+            {
+                "Time": t0_date + start,
+                "Category": "Flag",
+                "Message": "GREEN LIGHT - PIT EXIT OPEN",
+                "Status": None,
+                "Flag": "GREEN",
+                "Scope": "Track",
+                "Sector": np.nan,
+                "RacingNumber": None,
+                "Lap": 1,
+            }
+        ]
+        if not sc_times.empty:
+            sc_in = sc_times.min()
+            sc_out = laps[laps["TrackStatus"] == "4"]["Time"].max()
+            track_status += [
+                {"Time": sc_in, "Status": "4", "Message": "SCDeployed"},
+                {"Time": sc_out, "Status": "1", "Message": "AllClear"},
+            ]
+            race_control += [
+                {
+                    "Time": t0_date + sc_in,
+                    "Category": "SafetyCar",
+                    "Message": "SAFETY CAR DEPLOYED",
+                    "Status": "DEPLOYED",
+                    "Flag": None,
+                    "Scope": None,
+                    "Sector": np.nan,
+                    "RacingNumber": None,
+                    "Lap": int(min(sc_laps)),
+                },
+                {
+                    "Time": t0_date + sc_out,
+                    "Category": "SafetyCar",
+                    "Message": "SAFETY CAR IN THIS LAP",
+                    "Status": "IN THIS LAP",
+                    "Flag": None,
+                    "Scope": None,
+                    "Sector": np.nan,
+                    "RacingNumber": None,
+                    "Lap": int(max(sc_laps)),
+                },
+            ]
+        end = laps["Time"].max()
+        minutes = np.arange(0, end.total_seconds() + 60, 60)
+        weather = pd.DataFrame(
+            {
+                "Time": _td(minutes),
+                "AirTemp": 24 + np.cumsum(rng.normal(0, 0.05, minutes.size)),
+                "Humidity": 45 + np.cumsum(rng.normal(0, 0.2, minutes.size)),
+                "Pressure": np.full(minutes.size, 1012.0),
+                "Rainfall": np.zeros(minutes.size, dtype=bool),
+                "TrackTemp": 38 + np.cumsum(rng.normal(0, 0.1, minutes.size)),
+                "WindDirection": rng.integers(0, 360, minutes.size),
+                "WindSpeed": np.abs(rng.normal(1.5, 0.5, minutes.size)),
+            }
+        )
+
+        return {
+            "start": start,
+            "t0_date": t0_date,
+            "total_laps": total_laps,
+            "laps": laps,
+            "results": results,
+            "car_data": car_data,
+            "pos_data": pos_data,
+            "track_status": pd.DataFrame(track_status),
+            "session_status": pd.DataFrame(
+                {"Time": [pd.Timedelta(start), end], "Status": ["Started", "Finished"]}
+            ),
+            "weather": weather,
+            "race_control": pd.DataFrame(race_control),
+        }
+
+    def _results(self, laps, session_name, is_race, retired):
+        rows = []
+        best = laps.groupby("DriverNumber")["LapTime"].min()
+        if is_race:
+            last = laps.groupby("DriverNumber").agg(
+                laps=("LapNumber", "max"), finish=("Time", "max")
+            )
+            order = last.sort_values(["laps", "finish"], ascending=[False, True])
+        else:
+            order = best.sort_values().to_frame("best")
+        winner = order.iloc[0]
+        for place, number in enumerate(order.index, start=1):
+            driver = _driver(number)
+            team_name, color = TEAMS[driver[4]]
+            row = {
+                "DriverNumber": number,
+                "BroadcastName": f"{driver[2][0]} {driver[3].upper()}",
+                "Abbreviation": driver[1],
+                "DriverId": driver[3].lower(),
+                "TeamName": team_name,
+                "TeamColor": color,
+                "TeamId": driver[4],
+                "FirstName": driver[2],
+                "LastName": driver[3],
+                "FullName": f"{driver[2]} {driver[3]}",
+                "HeadshotUrl": "",
+                "CountryCode": "",
+                "Position": float(place),
+                "ClassifiedPosition": str(place),
+                "GridPosition": float(place),
+                "Q1": NO_TIME,
+                "Q2": NO_TIME,
+                "Q3": NO_TIME,
+                "Time": NO_TIME,
+                "Status": "Finished",
+                "Points": 0.0,
+            }
+            if is_race:
+                row["GridPosition"] = float((place * 7) % len(DRIVERS) + 1)
+                laps_done = order.loc[number, "laps"]
+                if DRIVERS.index(driver) == retired:
+                    row["Status"] = "Retired"
+                    row["ClassifiedPosition"] = "R"
+                elif laps_done < winner["laps"]:
+                    row["Status"] = f"+{int(winner['laps'] - laps_done)} Lap"
+                elif place == 1:
+                    row["Time"] = order.loc[number, "finish"]
+                else:
+                    row["Time"] = order.loc[number, "finish"] - winner["finish"]
+                if session_name == "Race" and place <= len(POINTS):
+                    row["Points"] = float(POINTS[place - 1])
+            elif "Qualifying" in session_name:
+                row["Q1"] = best[number] + _td(0.4)
+                if place <= 15:
+                    row["Q2"] = best[number] + _td(0.2)
+                if place <= 10:
+                    row["Q3"] = best[number]
+            rows.append(row)
+        return pd.DataFrame(rows)
+
+    def _telemetry(self, windows, clock, t0_date, start, rng):
+        """Car and position samples covering one driver's laps.
+
+        Both share the session `clock`, padded by a sample on either side of
+        the driver's first and last lap so FastF1 can slice every lap.
+        """
+        track = self.track
+        step = 1 / self.hz
+        first, last = windows[0, 0] - step, windows[-1, 1] + step
+        times = clock[(clock >= first) & (clock <= last)]
+        lap = np.clip(windows[:, 1].searchsorted(times), 0, len(windows) - 1)
+        lap_start, lap_end, factor = windows[lap].T
+        s = track.progress((times - lap_start) / (lap_end - lap_start))
+        session_time = _td(times)
+        frames = []
+        for source in ("car", "pos"):
+            frame = {
+                "Date": pd.Timestamp(t0_date) + session_time,
+                "SessionTime": session_time,
+                "Time": session_time - start,
+            }
+            if source == "car":
+                speed = track.at(s, "speed") / factor
+                accel = track.at(s, "accel")
+                frame.update(
+                    {
+                        "RPM": np.clip(4000 + speed * 33, 4000, 12000).round(),
+                        "Speed": speed.round(),
+                        "nGear": np.clip(speed // 40 + 1, 1, 8).astype(int),
+                        "Throttle": np.where(accel >= 0, 100.0, 0.0),
+                        "Brake": accel < -2,
+                        "DRS": np.where((s < 0.04) | (s > 0.97), 12, 0),
+                    }
+                )
+            else:
+                frame.update(
+                    {
+                        "X": track.at(s, "x") + rng.normal(0, 5, s.size),
+                        "Y": track.at(s, "y") + rng.normal(0, 5, s.size),
+                        "Z": np.full(s.size, 100.0),
+                        "Status": "OnTrack",
+                    }
+                )
+            frame["Source"] = source
+            frames.append(pd.DataFrame(frame))
+        return frames
+
+
+def _driver(number):
+    return next(d for d in DRIVERS if d[0] == str(number))
+
+
+@contextmanager
+def install(season=None):
+    """Patch fastf1 so every route is served from a SyntheticSeason."""
+    season = season or SyntheticSeason()
+    with ExitStack() as stack:
+        for target, name, replacement in (
+            (fastf1, "get_session", season.get_session),
+            (fastf1, "get_event", season.get_event),
+            (fastf1, "get_event_schedule", season.schedule),
+            (fastf1.ergast, "Ergast", season.ergast()),
+        ):
+            stack.enter_context(mock.patch.object(target, name, replacement))
+        yield season
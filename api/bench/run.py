@@ -0,0 +1,237 @@
+"""Benchmark every API route against synthetic sessions.
+
+    cd api && python -m bench.run [--iterations 20] [--only laps,race-summary]
+                                  [--json results.json]
+                                  [--baseline results.json] [--tolerance 1.25]
+
+Each case is requested once cold (empty session cache) and then
+`--iterations` times warm through the Flask test client. Reported per case:
+cold latency, warm p50/p95, the Server-Timing split of the last warm
+request, peak traced allocations of one warm request and the payload size.
+
+With --baseline the run exits non-zero when a case's warm p50 or peak
+allocations grow past `--tolerance` times the baseline, so it can gate CI.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+from .fixtures import SyntheticSeason, install
+
+
+def cases(season):
+    year = season.year
+    event = season.schedule(year).iloc[0]["EventName"]
+    race = {"year": year, "event_key": event, "session_name": "Race"}
+    pair = {**race, "driver1_number": "1", "driver2_number": "16"}
+    # A lap every car completes (the retirement comes after half distance)
+    lap = max(1, season.race_laps // 2)
+    # Races of 20 laps or fewer are run without stops
+    stint = 2 if season.race_laps > 20 else 1
+    return [
+        ("events", "/api/events", {"year": year}),
+        ("sessions", "/api/sessions", {"year": year, "event_key": event}),
+        ("drivers", "/api/drivers", race),
+        ("laps", "/api/laps", {**race, "driver_number": "1"}),
+        ("race-comparison", "/api/race-comparison", pair),
+        (
+            "lap-telemetry",
+            "/api/lap-telemetry",
+            {**pair, "lap1_number": lap, "lap2_number": lap},
+        ),
+        ("fastest-lap", "/api/fastest-lap", pair),
+        (
+            "multi-telemetry",
+            "/api/multi-telemetry",
+            {**race, "laps": f"1,16,44,4:{lap},81:{lap}"},
+        ),
+        (
+            "corner-analysis",
+            "/api/corner-analysis",
+            {**race, "laps": f"1,16,44:{lap}"},
+        ),
+        (
+            "stint-telemetry",
+            "/api/stint-telemetry",
+            {**race, "driver_number": "1", "stint": stint},
+        ),
+        ("race-summary", "/api/race-summary", race),
+        ("minisectors", "/api/minisectors", {**race, "count": 50}),
+        ("track-map", "/api/track-map", {**race, "tolerance": 2}),
+        ("tyre-degradation", "/api/tyre-degradation", race),
+        ("race-trace", "/api/race-trace", race),
+        ("pit-stops", "/api/pit-stops", race),
+        ("weather", "/api/weather", {**race, "laps": 1}),
+        ("race-control", "/api/race-control", {**race, "category": "safety_car"}),
+        ("weekend-summary", "/api/weekend-summary", {"year": year, "event_key": event}),
+        (
+            "weekend-summary-historical",
+            "/api/weekend-summary",
+            {"year": 2010, "event_key": event},
+        ),
+        ("standings", "/api/standings", {"year": year}),
+        ("championship-scenarios", "/api/championship-scenarios", {"year": year}),
+        ("pace-index", "/api/pace-index", {"year": year}),
+        ("teammate-battles", "/api/teammate-battles", {"year": year}),
+        ("metrics", "/api/_metrics", {}),
+    ]
+
+
+def _server_timing(header):
+    timings = {}
+    for part in (header or "").split(","):
+        name, _, rest = part.strip().partition(";")
+        if rest.startswith("dur="):
+            timings[name] = float(rest[4:])
+    return timings
+
+
+def _request(client, path, params):
+    start = time.perf_counter()
+    response = client.get(path, query_string=params)
+    elapsed = (time.perf_counter() - start) * 1000
+    return response, elapsed
+
+
+def _check(path, response):
+    """Only 2xx answers are benchmarked; anything else fails the case."""
+    if not 200 <= response.status_code < 300:
+        raise RuntimeError(
+            f"{path} returned {response.status_code}: {response.get_data(True)[:200]}"
+        )
+
+
+def run_case(client, sessions, path, params, iterations):
+    sessions.clear()
+    response, cold_ms = _request(client, path, params)
+    _check(path, response)
+
+    warm = []
+    for _ in range(iterations):
+        response, elapsed = _request(client, path, params)
+        _check(path, response)
+        warm.append(elapsed)
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    _request(client, path, params)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "status": response.status_code,
+        "cold_ms": round(cold_ms, 2),
+        "warm_p50_ms": round(float(np.percentile(warm, 50)), 2),
+        "warm_p95_ms": round(float(np.percentile(warm, 95)), 2),
+        "server_timing": _server_timing(response.headers.get("Server-Timing")),
+        "alloc_peak_kb": round(peak / 1024, 1),
+        "payload_kb": round(len(response.get_data()) / 1024, 1),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """List the cases that regressed against a baseline run."""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        for metric in ("warm_p50_ms", "alloc_peak_kb"):
+            if before[metric] and result[metric] > before[metric] * tolerance:
+                regressions.append(
+                    f"{name}: {metric} {before[metric]} -> {result[metric]}"
+                )
+    return regressions
+
+
+def _print_table(results):
+    header = (
+        f"{'case':<28}{'cold ms':>10}{'p50 ms':>10}{'p95 ms':>10}"
+        f"{'load':>9}{'compute':>9}{'json':>9}{'alloc KB':>11}{'body KB':>10}"
+    )
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        timing = r["server_timing"]
+        print(
+            f"{name:<28}{r['cold_ms']:>10.1f}{r['warm_p50_ms']:>10.1f}"
+            f"{r['warm_p95_ms']:>10.1f}{timing.get('load', 0):>9.1f}"
+            f"{timing.get('compute', 0):>9.1f}{timing.get('serialize', 0):>9.1f}"
+            f"{r['alloc_peak_kb']:>11.1f}{r['payload_kb']:>10.1f}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--only", help="Comma-separated case names to run")
+    parser.add_argument("--laps", type=int, default=70, help="Race distance")
+    parser.add_argument("--hz", type=float, default=4.0, help="Telemetry rate")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Write results to this file")
+    parser.add_argument("--baseline", help="Fail on regressions against this file")
+    parser.add_argument("--tolerance", type=float, default=1.25)
+    args = parser.parse_args(argv)
+
+    # Keep job and cache state out of the developer's data directory
+    os.environ["F1_DATA_PATH"] = tempfile.mkdtemp(prefix="f1_bench_")
+    os.environ.setdefault(
+        "F1_FASTF1_CACHE_PATH", tempfile.mkdtemp(prefix="f1_bench_fastf1_")
+    )
+    for name in ("F1_SHARED_SESSIONS", "F1_JOB_MODE"):
+        os.environ.pop(name, None)
+    # Worker processes would not see the patched FastF1
+    os.environ["F1_SEASON_WORKERS"] = "0"
+    # The internal stats endpoints are only served with the ops token
+    os.environ["F1_OPS_TOKEN"] = ops_token = os.urandom(16).hex()
+
+    from f1_backend import create_app, sessions
+
+    season = SyntheticSeason(race_laps=args.laps, hz=args.hz, seed=args.seed)
+    selected = set(args.only.split(",")) if args.only else None
+
+    results = {}
+    with install(season):
+        app = create_app()
+        client = app.test_client()
+        client.environ_base["HTTP_X_F1_OPS_TOKEN"] = ops_token
+        for name, path, params in cases(season):
+            if selected and name not in selected:
+                continue
+            try:
+                results[name] = run_case(
+                    client, sessions, path, params, args.iterations
+                )
+            except Exception as e:
+                print(f"[BENCH] {name} failed: {e}", file=sys.stderr)
+                results[name] = None
+
+    failed = [name for name, r in results.items() if r is None]
+    results = {name: r for name, r in results.items() if r is not None}
+    _print_table(results)
+
+    if args.json:
+        with open(args.json, "w") as handle:
+            json.dump({"cases": results}, handle, indent=2, sort_keys=True)
+
+    for name in failed:
+        print(f"[BENCH] FAILED: {name}", file=sys.stderr)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as handle:
+            baseline = json.load(handle)["cases"]
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"[BENCH] Regression: {line}", file=sys.stderr)
+
+    return 1 if failed or regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,9 @@
-from flask import Flask, jsonify
+from flask import Flask, jsonify, request
 from flask_cors import CORS
 import fastf1
 import os
+import pandas as pd
+from . import live, metrics, profiling, upstream
 import logging
 import sys
 
@@ -14,26 +16,67 @@ def create_app():
     """Create and configure an instance of the Flask application."""
     app = Flask(__name__, instance_relative_config=True)
 
+    # Routes get shallow copies of cached session frames (see `sessions`);
+    # with copy-on-write an assignment into one copies the touched columns
+    # instead of writing through to the cache. This is process-wide, and
+    # the default from pandas 3.0 on.
+    pd.set_option("mode.copy_on_write", True)
+
     # Configure CORS to allow all origins
-    CORS(app, resources={r"/*": {"origins": "*"}})
+    CORS(
+        app,
+        resources={r"/*": {"origins": "*"}},
+        expose_headers=["Server-Timing", "X-Profile-Id", "ETag"],
+    )
+
+    # Per-request phase timings (Server-Timing header and /api/_metrics)
+    metrics.init_app(app)
+
+    # Token-gated single-request profiles (no-op unless F1_PROFILE_TOKEN is set)
+    profiling.init_app(app)
 
     try:
         # Determine cache path
         if os.environ.get("VERCEL") or os.environ.get("VERCEL_ENV"):
             cache_path = "/tmp/fastf1_cache"
+            data_path = "/tmp/f1_pitwall"
         else:
             # For local dev, use the project structure
             cache_path = os.path.join(app.instance_path, "fastf1_cache")
+            data_path = os.path.join(app.instance_path, "f1_data")
+
+        cache_path = os.environ.get("F1_FASTF1_CACHE_PATH", cache_path)
+        app.config["FASTF1_CACHE_PATH"] = cache_path
+        app.config["DATA_PATH"] = os.environ.get("F1_DATA_PATH", data_path)
 
         logger.info(f"Setting up FastF1 cache at: {cache_path}")
         os.makedirs(cache_path, exist_ok=True)
         fastf1.Cache.enable_cache(cache_path)
         logger.info("FastF1 cache enabled successfully")
 
+        # Optional record/replay of upstream HTTP (F1_UPSTREAM_MODE)
+        upstream.install(app)
+
+        # Optional live session fed by a live-timing recording (F1_LIVE_FILE)
+        live.init_app(app)
+
     except Exception as e:
         logger.error(f"Failed to initialize FastF1 cache: {str(e)}")
         # We don't crash the app here, but routes might fail later
 
+    # ETags on JSON responses so clients can revalidate cached data with
+    # If-None-Match and get an empty 304 when nothing changed
+    @app.after_request
+    def conditional_json(response):
+        if (
+            request.method == "GET"
+            and response.status_code == 200
+            and response.mimetype == "application/json"
+        ):
+            response.add_etag()
+            response.make_conditional(request)
+        return response
+
     # Health check route
     @app.route("/")
     @app.route("/api")
@@ -51,12 +94,33 @@ def create_app():
 
     # Import and register blueprints
     try:
-        from .blueprints import schedule, telemetry, recap, standings
+        from .blueprints import (
+            schedule,
+            telemetry,
+            recap,
+            standings,
+            ops,
+            jobs,
+            analysis,
+            circuit,
+            strategy,
+            season,
+            conditions,
+            live_timing,
+        )
 
         app.register_blueprint(schedule.schedule_bp, url_prefix="/api")
         app.register_blueprint(telemetry.telemetry_bp, url_prefix="/api")
         app.register_blueprint(recap.recap_bp, url_prefix="/api")
         app.register_blueprint(standings.standings_bp, url_prefix="/api")
+        app.register_blueprint(ops.ops_bp, url_prefix="/api")
+        app.register_blueprint(jobs.jobs_bp, url_prefix="/api")
+        app.register_blueprint(analysis.analysis_bp, url_prefix="/api")
+        app.register_blueprint(circuit.circuit_bp, url_prefix="/api")
+        app.register_blueprint(strategy.strategy_bp, url_prefix="/api")
+        app.register_blueprint(season.season_bp, url_prefix="/api")
+        app.register_blueprint(conditions.conditions_bp, url_prefix="/api")
+        app.register_blueprint(live_timing.live_timing_bp, url_prefix="/api")
         logger.info("Blueprints registered successfully")
     except Exception as e:
         logger.error(f"Failed to register blueprints: {str(e)}")
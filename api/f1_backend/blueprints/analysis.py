@@ -0,0 +1,206 @@
+from flask import Blueprint, request, jsonify
+import fastf1
+import numpy as np
+import sys
+import traceback
+from .. import circuits, sessions
+from ..executor import offload
+from ..utils import validate_year, error_response
+
+analysis_bp = Blueprint("analysis", __name__)
+
+DEFAULT_MINISECTORS = 25
+MIN_MINISECTORS = 5
+MAX_MINISECTORS = 200
+POINTS_PER_MINISECTOR = 8
+
+
+def _fastest_laps(laps):
+    """Each driver's fastest non-deleted timed lap, fastest first."""
+    valid = laps["LapTime"].notna()
+    if "Deleted" in laps.columns:
+        valid &= ~laps["Deleted"].fillna(False).astype(bool)
+    timed = laps[valid]
+    if timed.empty:
+        return timed
+    idx = timed.groupby("DriverNumber", observed=True)["LapTime"].idxmin()
+    return timed.loc[idx.dropna()].sort_values("LapTime")
+
+
+def _interp_rows(x_rows, y_rows, x_new):
+    """Interpolate many monotonic rows at the same points in one pass.
+
+    Each row's x values lie in [0, 1]. Offsetting row i by 2 * i makes the
+    concatenation of all rows monotonic, so a single searchsorted finds the
+    bracketing samples for every row and every point at once.
+    """
+    offsets = 2.0 * np.arange(len(x_rows))
+    lengths = np.array([len(x) for x in x_rows])
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    flat_x = np.concatenate([x + o for x, o in zip(x_rows, offsets)])
+    flat_y = np.concatenate(y_rows)
+
+    targets = x_new[None, :] + offsets[:, None]
+    hi = np.searchsorted(flat_x, targets, side="left")
+    lo_bound = starts[:, None]
+    hi_bound = (starts + lengths - 1)[:, None]
+    hi = np.clip(hi, lo_bound + 1, hi_bound)
+    lo = hi - 1
+
+    x0, x1 = flat_x[lo], flat_x[hi]
+    y0, y1 = flat_y[lo], flat_y[hi]
+    weight = np.where(x1 > x0, (targets - x0) / np.where(x1 > x0, x1 - x0, 1), 0)
+    return y0 + np.clip(weight, 0, 1) * (y1 - y0)
+
+
+def _minisector_points(pos, car, boundaries, lap_length):
+    """Downsampled X/Y polyline of every minisector of the reference lap."""
+    car_time = car["SessionTime"].dt.total_seconds().to_numpy()
+    car_distance = car["Distance"].to_numpy(dtype=float)
+    pos_time = pos["SessionTime"].dt.total_seconds().to_numpy()
+    pos_fraction = np.interp(pos_time, car_time, car_distance) / lap_length
+    x = pos["X"].to_numpy(dtype=float)
+    y = pos["Y"].to_numpy(dtype=float)
+
+    polylines = []
+    for start, end in zip(boundaries[:-1], boundaries[1:]):
+        fractions = np.linspace(start, end, POINTS_PER_MINISECTOR)
+        polylines.append(
+            [
+                [round(float(px), 1), round(float(py), 1)]
+                for px, py in zip(
+                    np.interp(fractions, pos_fraction, x),
+                    np.interp(fractions, pos_fraction, y),
+                )
+            ]
+        )
+    return polylines
+
+
+def _compute_minisectors(session, year, count):
+    fastest = _fastest_laps(session.laps)
+    if fastest.empty:
+        return None
+
+    drivers, fractions, times, car_frames = [], [], [], []
+    for _, lap in fastest.iterrows():
+        car = lap.get_car_data().add_distance()
+        car = car[car["Distance"].notna()]
+        if len(car) < 2 or car["Distance"].iloc[-1] <= 0:
+            continue
+        distance = car["Distance"].to_numpy(dtype=float)
+        drivers.append(lap)
+        # Normalise to lap fraction so line and integration differences cancel
+        fractions.append(distance / distance[-1])
+        times.append(car["Time"].dt.total_seconds().to_numpy())
+        car_frames.append(car)
+
+    if not drivers:
+        return None
+
+    boundaries = np.linspace(0.0, 1.0, count + 1)
+    crossing = _interp_rows(fractions, times, boundaries)
+    sector_times = np.diff(crossing, axis=1)
+    winners = np.argmin(sector_times, axis=0)
+    best = sector_times[winners, np.arange(count)]
+
+    reference = drivers[0]
+    lap_length = float(car_frames[0]["Distance"].iloc[-1])
+    polylines = []
+    try:
+        pos = reference.get_pos_data()
+        if not pos.empty:
+            polylines = _minisector_points(
+                pos, car_frames[0], boundaries * lap_length, lap_length
+            )
+    except Exception as e:
+        print(f"[ANALYSIS] No position data for track map: {e}", file=sys.stderr)
+
+    rotation = None
+    try:
+        layout = circuits.circuit_info(session, year)
+        rotation = layout["rotation"] if layout else None
+    except Exception as e:
+        print(f"[ANALYSIS] No circuit info: {e}", file=sys.stderr)
+
+    driver_rows = []
+    for i, lap in enumerate(drivers):
+        driver_number = str(lap["DriverNumber"])
+        info = session.get_driver(driver_number)
+        driver_rows.append(
+            {
+                "driver_number": driver_number,
+                "abbreviation": str(lap["Driver"]),
+                "team": str(info["TeamName"]) if "TeamName" in info else None,
+                "team_color": str(info["TeamColor"]) if "TeamColor" in info else None,
+                "lap_number": int(lap["LapNumber"]),
+                "lap_time_seconds": float(lap["LapTime"].total_seconds()),
+                "minisectors_won": int((winners == i).sum()),
+            }
+        )
+
+    minisectors = []
+    for k in range(count):
+        minisectors.append(
+            {
+                "index": k + 1,
+                "start_distance": round(float(boundaries[k] * lap_length), 1),
+                "end_distance": round(float(boundaries[k + 1] * lap_length), 1),
+                "fastest_driver": driver_rows[winners[k]]["driver_number"],
+                "fastest_abbreviation": driver_rows[winners[k]]["abbreviation"],
+                "fastest_time": round(float(best[k]), 3),
+                # Aligned with `drivers`
+                "times": [round(float(t), 3) for t in sector_times[:, k]],
+                "points": polylines[k] if polylines else [],
+            }
+        )
+
+    return {
+        "count": count,
+        "lap_length": round(lap_length, 1),
+        "rotation": rotation,
+        "drivers": driver_rows,
+        "minisectors": minisectors,
+    }
+
+
+@analysis_bp.route("/minisectors", methods=["GET"])
+@offload("telemetry")
+def get_minisectors():
+    """Fastest driver per mini-sector, from every driver's fastest lap."""
+    year = request.args.get("year", type=int)
+    is_valid, error_msg = validate_year(year)
+    if not is_valid:
+        return error_response(error_msg)
+
+    event_key = request.args.get("event_key", type=str)
+    session_name = request.args.get("session_name", type=str)
+    count = request.args.get("count", DEFAULT_MINISECTORS, type=int)
+
+    if not all([year, event_key, session_name]):
+        return error_response(
+            "Year, event_key, and session_name parameters are required."
+        )
+    if year < 2018:
+        return error_response(
+            "High-resolution telemetry is not available for seasons before 2018.",
+            400,
+        )
+    count = min(max(count, MIN_MINISECTORS), MAX_MINISECTORS)
+
+    try:
+        session = fastf1.get_session(year, event_key, session_name)
+        result = sessions.cached_result(
+            (sessions.session_key(session, year), count),
+            "minisectors",
+            lambda: _compute_minisectors(
+                sessions.load(session, year, telemetry=True), year, count
+            ),
+        )
+        if result is None:
+            return error_response("No timed laps with telemetry in this session.", 404)
+        return jsonify(result), 200
+    except Exception as e:
+        print(f"[ANALYSIS] Minisectors error: {e}", file=sys.stderr)
+        traceback.print_exc()
+        return error_response(f"An error occurred: {str(e)}", 500)
@@ -0,0 +1,107 @@
+from flask import Blueprint, request, jsonify
+import fastf1
+import sys
+import traceback
+from .. import circuits, sessions
+from ..executor import offload
+from ..utils import validate_year, error_response
+
+circuit_bp = Blueprint("circuit", __name__)
+
+DEFAULT_TOLERANCE_M = 2.0
+MIN_TOLERANCE_M = 0.1
+MAX_TOLERANCE_M = 50.0
+
+
+def _build_layout(session, year):
+    """Resolve a session's layout and build its outline if it has none yet.
+
+    Only called when the index has no outline for this location and season.
+    A layout stored for another season is found without telemetry; building
+    a new outline loads it for the fastest lap's position data. Returns None
+    when the session has no timed lap to build from.
+    """
+    session = sessions.load(session, year)
+    layout = circuits.circuit_info(session, year)
+    if layout is None:
+        raise ValueError("No circuit info available for this session.")
+
+    if not layout.get("outline"):
+        session = sessions.load(session, year, telemetry=True)
+        lap = session.laps.pick_fastest()
+        if lap is None or lap.empty:
+            return None
+        outline = circuits.outline_from_position(lap.get_pos_data())
+        if outline is None:
+            raise ValueError("No position data to build the track outline from.")
+        layout = circuits.update_layout(
+            layout["key"],
+            outline=outline,
+            source={
+                "year": year,
+                "session": session.name,
+                "driver": str(lap["Driver"]),
+                "lap_number": int(lap["LapNumber"]),
+            },
+        )
+        print(f"[CIRCUIT] Built track outline for {layout['key']}", file=sys.stderr)
+
+    return layout["key"], layout
+
+
+@circuit_bp.route("/track-map", methods=["GET"])
+@offload("telemetry")
+def get_track_map():
+    """Simplified circuit outline with corner markers and rotation.
+
+    The outline is built once per circuit layout from a reference lap's
+    position data, then reused for every session and season on that layout.
+    """
+    year = request.args.get("year", type=int)
+    is_valid, error_msg = validate_year(year)
+    if not is_valid:
+        return error_response(error_msg)
+
+    event_key = request.args.get("event_key", type=str)
+    session_name = request.args.get("session_name", "Race", type=str)
+    tolerance = request.args.get("tolerance", DEFAULT_TOLERANCE_M, type=float)
+
+    if not all([year, event_key]):
+        return error_response("Year and event_key parameters are required.")
+    if year < 2018:
+        return error_response(
+            "Position data is not available for seasons before 2018.", 400
+        )
+    tolerance = round(min(max(tolerance, MIN_TOLERANCE_M), MAX_TOLERANCE_M), 1)
+
+    try:
+        session = fastf1.get_session(year, event_key, session_name)
+        location = session.event["Location"]
+
+        key = circuits.layout_for(location, year)
+        layout = circuits.get_layout(key) if key else None
+        if not layout or not layout.get("outline"):
+            built = _build_layout(session, year)
+            if built is None:
+                return error_response("No timed laps in this session.", 404)
+            key, layout = built
+
+        points = circuits.simplified_outline(key, tolerance)
+        return (
+            jsonify(
+                {
+                    "layout": key,
+                    "location": str(location),
+                    "rotation": layout.get("rotation"),
+                    "tolerance_m": tolerance,
+                    "points": points,
+                    "corners": layout.get("corners", []),
+                    "source": layout.get("source"),
+                }
+            ),
+            200,
+        )
+    except Exception as e:
+        print(f"[CIRCUIT] Track map error: {e}", file=sys.stderr)
+        traceback.print_exc()
+        return error_response(f"An error occurred: {str(e)}", 500)
@@ -0,0 +1,164 @@
+from flask import Blueprint, request, jsonify
+import fastf1
+import numpy as np
+import pandas as pd
+import sys
+import traceback
+from .. import race_control, sessions, weather
+from ..executor import offload
+from ..utils import validate_year, error_response
+
+conditions_bp = Blueprint("conditions", __name__)
+
+
+def _lap_samples(session, year, start, n):
+    """Weather sample index at the start of each lap of the leader."""
+    laps = sessions.load(session, year).laps
+    starts = laps.groupby("LapNumber")["LapStartTime"].min().dropna()
+    offsets = starts.dt.total_seconds().to_numpy() - start
+    index = np.clip(offsets // weather.SAMPLE_SECONDS, 0, n - 1).astype(int)
+    return {
+        "lap_numbers": starts.index.astype(int).tolist(),
+        "lap_samples": index.tolist(),
+    }
+
+
+@conditions_bp.route("/weather", methods=["GET"])
+@offload("session")
+def get_weather():
+    """Per-minute weather series of a session.
+
+    `time` is session time in seconds at the start of each sample, the same
+    clock as lap start times. With `?laps=1` the response also maps every lap
+    to the sample it started in, for overlaying on lap charts.
+    """
+    year = request.args.get("year", type=int)
+    is_valid, error_msg = validate_year(year)
+    if not is_valid:
+        return error_response(error_msg)
+
+    event_key = request.args.get("event_key", type=str)
+    session_name = request.args.get("session_name", type=str)
+    with_laps = request.args.get("laps", "").lower() in ("1", "true", "yes")
+
+    if not all([year, event_key, session_name]):
+        return error_response(
+            "Year, event_key, and session_name parameters are required."
+        )
+    if year < 2018:
+        return error_response(
+            "Weather data is not available for seasons before 2018.", 400
+        )
+
+    try:
+        session = fastf1.get_session(year, event_key, session_name)
+        series = weather.session_weather(session, year)
+        if not series:
+            return error_response("No weather data for this session.", 404)
+
+        start = float(series["start_s"])
+        values = {k: v for k, v in series.items() if k != "start_s"}
+        n = len(next(iter(values.values())))
+        payload = {
+            "interval_s": weather.SAMPLE_SECONDS,
+            "time": (start + weather.SAMPLE_SECONDS * np.arange(n)).tolist(),
+            **{name: np.round(v, 1).tolist() for name, v in values.items()},
+        }
+        if with_laps:
+            payload.update(_lap_samples(session, year, start, n))
+        return jsonify(payload), 200
+    except Exception as e:
+        print(f"[WEATHER] Weather error: {e}", file=sys.stderr)
+        traceback.print_exc()
+        return error_response(f"An error occurred: {str(e)}", 500)
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def _timestamp(value):
+    """Parse an ISO time to naive UTC, the clock of message times."""
+    if not value:
+        return None
+    stamp = pd.Timestamp(value)
+    if stamp.tzinfo is not None:
+        stamp = stamp.tz_convert("UTC").tz_localize(None)
+    return np.datetime64(stamp, "ns")
+
+
+@conditions_bp.route("/race-control", methods=["GET"])
+@offload("session")
+def get_race_control():
+    """Filtered, paginated race control messages of a session.
+
+    Filters: `category` (comma-separated, see race_control.CATEGORIES),
+    `driver_number`, `lap_from`/`lap_to` and `since`/`until` (ISO times).
+    `counts` always covers the whole session, for filter chips.
+    """
+    year = request.args.get("year", type=int)
+    is_valid, error_msg = validate_year(year)
+    if not is_valid:
+        return error_response(error_msg)
+
+    event_key = request.args.get("event_key", type=str)
+    session_name = request.args.get("session_name", type=str)
+    if not all([year, event_key, session_name]):
+        return error_response(
+            "Year, event_key, and session_name parameters are required."
+        )
+    if year < 2018:
+        return error_response(
+            "Race control messages are not available for seasons before 2018.", 400
+        )
+
+    categories = [
+        c for c in request.args.get("category", "", type=str).split(",") if c
+    ]
+    unknown = set(categories) - set(race_control.CATEGORIES)
+    if unknown:
+        return error_response(f"Unknown category: {', '.join(sorted(unknown))}.")
+    page = max(request.args.get("page", 1, type=int), 1)
+    page_size = request.args.get("page_size", DEFAULT_PAGE_SIZE, type=int)
+    page_size = min(max(page_size, 1), MAX_PAGE_SIZE)
+
+    try:
+        since = _timestamp(request.args.get("since"))
+        until = _timestamp(request.args.get("until"))
+    except (TypeError, ValueError):
+        return error_response("since and until must be ISO timestamps.")
+
+    try:
+        session = fastf1.get_session(year, event_key, session_name)
+        index = race_control.session_index(session, year)
+        if index is None:
+            return error_response("No race control messages for this session.", 404)
+
+        ids = race_control.query(
+            index,
+            categories=categories,
+            driver=request.args.get("driver_number", type=str),
+            lap_from=request.args.get("lap_from", type=int),
+            lap_to=request.args.get("lap_to", type=int),
+            since=since,
+            until=until,
+        )
+        start = (page - 1) * page_size
+        return (
+            jsonify(
+                {
+                    "total": int(len(ids)),
+                    "page": page,
+                    "page_size": page_size,
+                    "counts": race_control.counts(index),
+                    "messages": [
+                        index["rows"][i] for i in ids[start : start + page_size]
+                    ],
+                }
+            ),
+            200,
+        )
+    except Exception as e:
+        print(f"[RACE_CONTROL] Race control error: {e}", file=sys.stderr)
+        traceback.print_exc()
+        return error_response(f"An error occurred: {str(e)}", 500)
@@ -0,0 +1,44 @@
+from flask import Blueprint, request, jsonify
+import time
+from .. import jobs
+from ..utils import error_response
+
+jobs_bp = Blueprint("jobs", __name__)
+
+
+@jobs_bp.route("/jobs/<job_id>", methods=["GET"])
+def get_job(job_id):
+    """Poll a background job.
+
+    Pending jobs answer 202 with their status. Finished jobs answer with the
+    original route's payload and status code, so clients can handle them
+    exactly like a synchronous response. `?wait=<seconds>` long-polls until
+    the job finishes or the wait expires.
+    """
+    wait = min(
+        request.args.get("wait", default=0.0, type=float), jobs.MAX_WAIT_SECONDS
+    )
+    deadline = time.monotonic() + max(0.0, wait)
+
+    row = jobs.get_job(job_id)
+    while row is not None and row["status"] in ("queued", "running"):
+        if time.monotonic() >= deadline:
+            break
+        time.sleep(0.5)
+        row = jobs.get_job(job_id)
+
+    if row is None:
+        return error_response(f"Unknown job {job_id}.", 404)
+
+    if row["status"] in ("queued", "running"):
+        response = jsonify(jobs.row_to_status(row))
+        response.status_code = 202
+        response.headers["Retry-After"] = "2"
+        return response
+
+    response = jsonify({})
+    response.set_data(row["result"] or "{}")
+    response.status_code = row["status_code"] or 500
+    response.headers["X-Job-Id"] = row["id"]
+    response.headers["X-Job-Status"] = row["status"]
+    return response
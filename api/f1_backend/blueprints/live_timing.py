@@ -0,0 +1,38 @@
+from flask import Blueprint, Response, request, jsonify
+from .. import live
+from ..utils import error_response
+
+live_timing_bp = Blueprint("live_timing", __name__)
+
+
+@live_timing_bp.route("/live/state", methods=["GET"])
+def get_live_state():
+    """Current snapshot of the live session (404 when live mode is off)."""
+    feed = live.current()
+    if feed is None:
+        return error_response("Live mode is not enabled.", 404)
+    return jsonify(feed.snapshot()), 200
+
+
+@live_timing_bp.route("/live/stream", methods=["GET"])
+def get_live_stream():
+    """Server-sent events: a `snapshot` event, then `delta` events.
+
+    Reconnecting clients send `Last-Event-ID` (or `?since=`) and receive only
+    the deltas they missed, or a fresh snapshot if those left the buffer.
+    """
+    feed = live.current()
+    if feed is None:
+        return error_response("Live mode is not enabled.", 404)
+
+    last_seq = request.headers.get("Last-Event-ID") or request.args.get("since")
+    try:
+        last_seq = int(last_seq) if last_seq else None
+    except ValueError:
+        last_seq = None
+
+    return Response(
+        live.stream(last_seq),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
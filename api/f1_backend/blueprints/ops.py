@@ -0,0 +1,84 @@
+from flask import Blueprint, Response, jsonify, request, send_from_directory
+import hmac
+import os
+from .. import executor, metrics, profiling, sessions, upstream
+from ..utils import error_response
+
+ops_bp = Blueprint("ops", __name__)
+
+# Internal stats endpoints, only served with the F1_OPS_TOKEN
+_GATED_ENDPOINTS = {
+    "ops.get_pool_stats",
+    "ops.get_session_cache_stats",
+    "ops.get_upstream_stats",
+    "ops.get_metrics",
+}
+
+
+def _ops_authorized():
+    """Whether the request carries F1_OPS_TOKEN (never, when it is unset)."""
+    token = os.environ.get("F1_OPS_TOKEN")
+    if not token:
+        return False
+    supplied = request.headers.get("X-F1-Ops-Token", "")
+    auth = request.headers.get("Authorization", "")
+    if not supplied and auth.startswith("Bearer "):
+        supplied = auth[len("Bearer ") :]
+    return bool(supplied) and hmac.compare_digest(supplied, token)
+
+
+@ops_bp.before_request
+def _require_ops_token():
+    # Answer 404 like an unknown route so the endpoints are not advertised
+    if request.endpoint in _GATED_ENDPOINTS and not _ops_authorized():
+        return error_response("Not found.", 404)
+
+
+@ops_bp.route("/_pools", methods=["GET"])
+def get_pool_stats():
+    """Queue depth and throughput counters for the heavy-work pools."""
+    return (
+        jsonify(
+            {
+                "pools": executor.pool_stats(),
+                "admission": executor.admission_stats(),
+            }
+        ),
+        200,
+    )
+
+
+@ops_bp.route("/_sessions", methods=["GET"])
+def get_session_cache_stats():
+    """Sessions held in this worker and in the cross-worker shared store."""
+    return jsonify(sessions.cache_stats()), 200
+
+
+@ops_bp.route("/_upstream", methods=["GET"])
+def get_upstream_stats():
+    """Record/replay mode and how many upstream responses it has handled."""
+    return jsonify(upstream.stats()), 200
+
+
+@ops_bp.route("/_metrics", methods=["GET"])
+def get_metrics():
+    """Per-route phase histograms and cache counters in Prometheus format."""
+    body = metrics.render_prometheus(
+        pools=executor.pool_stats(), sessions=sessions.cache_stats()
+    )
+    return Response(body, mimetype="text/plain; version=0.0.4")
+
+
+@ops_bp.route("/_profiles", methods=["GET"])
+def get_profiles():
+    """Stored request profiles (requires the profiling token)."""
+    if not profiling.authorized():
+        return error_response("Not found.", 404)
+    return jsonify({"profiles": profiling.list_profiles()}), 200
+
+
+@ops_bp.route("/_profiles/<path:name>", methods=["GET"])
+def get_profile(name):
+    if not profiling.authorized():
+        return error_response("Not found.", 404)
+    return send_from_directory(profiling.profile_dir(), name)
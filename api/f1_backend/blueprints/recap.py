@@ -4,6 +4,9 @@ import pandas as pd
 import numpy as np
 import sys
 import traceback
+from .. import live, sessions, weather
+from ..executor import offload
+from ..jobs import job_eligible, estimate_weekend
 from ..utils import (
     validate_year,
     error_response,
@@ -168,13 +171,26 @@ def _get_track_status_incidents(session):
     return incidents
 
 
-def _extract_session_insights(session, results, s_name):
+def _extract_session_insights(session, year, results, s_name):
     """Helper to aggregate session-specific highlight data."""
     lname = s_name.lower()
+    feed = live.feed_for(session, year)
     insights = {
-        "track": {"weather": "N/A", "air_temp": None, "track_temp": None},
-        "incidents": _get_track_status_incidents(session),
+        "track": weather.track_summary(session, year),
+        "incidents": (
+            feed.incidents()
+            if feed is not None
+            else _get_track_status_incidents(session)
+        ),
     }
+    if feed is not None:
+        # The session is still running: report where it stands
+        standings = feed.standings()
+        insights["live"] = {
+            "lap_count": feed.lap_count(),
+            "track_status": feed.track_status(),
+            "leader": standings[0]["abbreviation"] if standings else None,
+        }
 
     try:
         # Practice Highlights
@@ -193,7 +209,7 @@ def _extract_session_insights(session, results, s_name):
                 }
             elif hasattr(session, "laps") and not session.laps.empty:
                 # Fallback to calculating from raw laps
-                laps_count = session.laps.groupby("Driver").size()
+                laps_count = session.laps.groupby("Driver", observed=True).size()
                 if not laps_count.empty:
                     mileage_king_abbr = laps_count.idxmax()
                     insights["mileage_king"] = {
@@ -316,6 +332,8 @@ def _extract_session_insights(session, results, s_name):
 
 
 @recap_bp.route("/weekend-summary", methods=["GET"])
+@job_eligible(estimate_weekend)
+@offload("session")
 def get_weekend_summary():
     year = request.args.get("year", type=int)
     is_valid, error_msg = validate_year(year)
@@ -345,7 +363,8 @@ def get_weekend_summary():
                         k in session.name.lower()
                         for k in ["qualifying", "shootout", "qualy"]
                     )
-                    session.load(telemetry=False, weather=False, messages=is_quali)
+                    # Weather comes with the load; see weather.py
+                    sessions.load(session, year, weather=True, messages=is_quali)
                 except Exception as load_error:
                     print(
                         f"[RECAP] Load failed for session {s_name}: {load_error}",
@@ -383,10 +402,14 @@ def get_weekend_summary():
                         )
                         laps_with_times = session.laps[session.laps["LapTime"].notna()]
                         laps_fallback = (
-                            laps_with_times.groupby("Driver")["LapTime"].min().to_dict()
+                            laps_with_times.groupby("Driver", observed=True)["LapTime"]
+                            .min()
+                            .to_dict()
                         )
                         laps_count_fallback = (
-                            session.laps.groupby("Driver").size().to_dict()
+                            session.laps.groupby("Driver", observed=True)
+                            .size()
+                            .to_dict()
                         )
 
                 if (results is None or results.empty) and not laps_fallback:
@@ -405,7 +428,9 @@ def get_weekend_summary():
                         else None
                     ),
                     "results": [],
-                    "insights": _extract_session_insights(session, results, s_name),
+                    "insights": _extract_session_insights(
+                        session, year, results, s_name
+                    ),
                 }
 
                 drivers_to_process = (
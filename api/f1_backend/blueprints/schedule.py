@@ -1,6 +1,8 @@
 from flask import Blueprint, request, jsonify
 import fastf1
 import pandas as pd
+from ..executor import offload
+from ..sessions import load_session
 from ..utils import (
     validate_year,
     error_response,
@@ -101,6 +103,7 @@ def get_sessions():
 
 
 @schedule_bp.route("/drivers", methods=["GET"])
+@offload("session")
 def get_drivers():
     year = request.args.get("year", type=int)
     is_valid, error_msg = validate_year(year)
@@ -142,8 +145,7 @@ def get_drivers():
                     drivers.append(base)
             return jsonify({"drivers": drivers}), 200
 
-        session = fastf1.get_session(year, event_key, session_name)
-        session.load(telemetry=False, weather=False, messages=False)
+        session = load_session(year, event_key, session_name)
 
         drivers = []
         for driver_number in session.drivers:
@@ -0,0 +1,99 @@
+from flask import Blueprint, request, jsonify
+import sys
+import traceback
+from .. import season_store, sessions
+from ..executor import offload
+from ..jobs import job_eligible, estimate_season
+from ..utils import validate_year, error_response
+
+season_bp = Blueprint("season", __name__)
+
+
+@season_bp.route("/pace-index", methods=["GET"])
+@job_eligible(estimate_season)
+@offload("session")
+def get_pace_index():
+    """Season ranking of driver and car pace from qualifying and race laps.
+
+    Sessions are summarised once into checkpoints; a request only loads the
+    sessions that finished since the last run.
+    """
+    year = request.args.get("year", type=int)
+    is_valid, error_msg = validate_year(year)
+    if not is_valid:
+        return error_response(error_msg)
+    if year < 2018:
+        return error_response(
+            "Lap timing data is not available for seasons before 2018.", 400
+        )
+
+    try:
+        summaries, failed = season_store.season_summaries(year)
+        if not summaries:
+            return error_response("No finished sessions in this season yet.", 404)
+        signature = tuple((s["round"], s["session"]) for s in summaries)
+        result = sessions.cached_result(
+            (year, signature),
+            "pace_index",
+            lambda: season_store.pace_index(summaries),
+        )
+        return (
+            jsonify(
+                {
+                    "year": year,
+                    **result,
+                    # Retried on the next request
+                    "failed_sessions": [
+                        {"round": r, "event": e, "session": s} for r, e, s in failed
+                    ],
+                }
+            ),
+            200,
+        )
+    except Exception as e:
+        print(f"[SEASON] Pace index error: {e}", file=sys.stderr)
+        traceback.print_exc()
+        return error_response(f"An error occurred: {str(e)}", 500)
+
+
+@season_bp.route("/teammate-battles", methods=["GET"])
+@job_eligible(estimate_season)
+@offload("session")
+def get_teammate_battles():
+    """Qualifying and race head-to-heads and points split within each team.
+
+    Built from the same per-session checkpoints as the pace index (FastF1
+    results from 2018, Ergast results before).
+    """
+    year = request.args.get("year", type=int)
+    is_valid, error_msg = validate_year(year)
+    if not is_valid:
+        return error_response(error_msg)
+
+    try:
+        summaries, failed = season_store.season_summaries(year)
+        if not summaries:
+            return error_response("No finished sessions in this season yet.", 404)
+        signature = tuple((s["round"], s["session"]) for s in summaries)
+        result = sessions.cached_result(
+            (year, signature),
+            "teammate_battles",
+            lambda: season_store.teammate_battles(summaries),
+        )
+        return (
+            jsonify(
+                {
+                    "year": year,
+                    "rounds": len({s["round"] for s in summaries}),
+                    **result,
+                    "failed_sessions": [
+                        {"round": r, "event": e, "session": s} for r, e, s in failed
+                    ],
+                }
+            ),
+            200,
+        )
+    except Exception as e:
+        print(f"[SEASON] Teammate battles error: {e}", file=sys.stderr)
+        traceback.print_exc()
+        return error_response(f"An error occurred: {str(e)}", 500)
@@ -3,6 +3,7 @@ import fastf1
 import pandas as pd
 import sys
 import traceback
+from .. import championship
 from ..utils import validate_year, error_response, get_historical_team_color
 
 standings_bp = Blueprint("standings", __name__)
@@ -28,6 +29,94 @@ def _safe_float(val, default=0.0):
         return default
 
 
+def _fetch_driver_standings(ergast, year):
+    """Fetch the WDC table for a season.
+
+    Returns a tuple of (rows, round) where round is the last round included
+    in the standings, or None if the season has no results yet.
+    """
+    driver_standings_data = []
+    ds_round = None
+
+    ds_res = ergast.get_driver_standings(season=year, limit=1000)
+    if ds_res.content and not ds_res.content[0].empty:
+        df = ds_res.content[0]
+        ds_round = int(ds_res.description["round"].iloc[0])
+
+        for _, row in df.iterrows():
+            # constructorNames is a list (driver can have multiple constructors in a season)
+            # For very old seasons, these may be NaN or unexpected types
+            constructor_names = row.get("constructorNames")
+            constructor_ids = row.get("constructorIds")
+
+            try:
+                if isinstance(constructor_names, list) and len(constructor_names) > 0:
+                    team_name = str(constructor_names[0])
+                elif pd.notna(constructor_names):
+                    team_name = str(constructor_names)
+                else:
+                    team_name = "Unknown"
+            except (TypeError, IndexError):
+                team_name = "Unknown"
+
+            try:
+                if isinstance(constructor_ids, list) and len(constructor_ids) > 0:
+                    team_id = str(constructor_ids[0])
+                elif pd.notna(constructor_ids):
+                    team_id = str(constructor_ids)
+                else:
+                    team_id = ""
+            except (TypeError, IndexError):
+                team_id = ""
+
+            driver_standings_data.append(
+                {
+                    "position": _safe_int(
+                        row.get("position"), len(driver_standings_data) + 1
+                    ),
+                    "driver_code": (
+                        str(row.get("driverCode", ""))
+                        if pd.notna(row.get("driverCode"))
+                        else str(row.get("familyName", "??"))[:3].upper()
+                    ),
+                    "driver_name": f"{row.get('givenName', '')} {row.get('familyName', '')}".strip(),
+                    "team_name": team_name,
+                    "team_color": get_historical_team_color(team_id),
+                    "points": _safe_float(row.get("points")),
+                    "wins": _safe_int(row.get("wins")),
+                }
+            )
+
+    return driver_standings_data, ds_round
+
+
+def _fetch_constructor_standings(ergast, year):
+    """Fetch the WCC table for a season (empty before 1958)."""
+    constructor_standings_data = []
+    if year < 1958:
+        return constructor_standings_data
+
+    cs_res = ergast.get_constructor_standings(season=year, limit=1000)
+    if cs_res.content and not cs_res.content[0].empty:
+        df = cs_res.content[0]
+        for _, row in df.iterrows():
+            cid = str(row.get("constructorId", ""))
+            constructor_standings_data.append(
+                {
+                    "position": _safe_int(
+                        row.get("position"),
+                        len(constructor_standings_data) + 1,
+                    ),
+                    "constructor_name": str(row.get("constructorName", "Unknown")),
+                    "constructor_id": cid,
+                    "team_color": get_historical_team_color(cid),
+                    "points": _safe_float(row.get("points")),
+                    "wins": _safe_int(row.get("wins")),
+                }
+            )
+    return constructor_standings_data
+
+
 @standings_bp.route("/standings", methods=["GET"])
 def get_standings():
     """Get driver and constructor championship standings for a given season.
@@ -45,62 +134,9 @@ def get_standings():
         ergast = fastf1.ergast.Ergast()
 
         # --- Driver Standings ---
-        driver_standings_data = []
-        ds_round = None
+        driver_standings_data, ds_round = _fetch_driver_standings(ergast, year)
         ds_round_name = None
 
-        ds_res = ergast.get_driver_standings(season=year, limit=1000)
-        if ds_res.content and not ds_res.content[0].empty:
-            df = ds_res.content[0]
-            ds_round = int(ds_res.description["round"].iloc[0])
-
-            for _, row in df.iterrows():
-                # constructorNames is a list (driver can have multiple constructors in a season)
-                # For very old seasons, these may be NaN or unexpected types
-                constructor_names = row.get("constructorNames")
-                constructor_ids = row.get("constructorIds")
-
-                try:
-                    if (
-                        isinstance(constructor_names, list)
-                        and len(constructor_names) > 0
-                    ):
-                        team_name = str(constructor_names[0])
-                    elif pd.notna(constructor_names):
-                        team_name = str(constructor_names)
-                    else:
-                        team_name = "Unknown"
-                except (TypeError, IndexError):
-                    team_name = "Unknown"
-
-                try:
-                    if isinstance(constructor_ids, list) and len(constructor_ids) > 0:
-                        team_id = str(constructor_ids[0])
-                    elif pd.notna(constructor_ids):
-                        team_id = str(constructor_ids)
-                    else:
-                        team_id = ""
-                except (TypeError, IndexError):
-                    team_id = ""
-
-                driver_standings_data.append(
-                    {
-                        "position": _safe_int(
-                            row.get("position"), len(driver_standings_data) + 1
-                        ),
-                        "driver_code": (
-                            str(row.get("driverCode", ""))
-                            if pd.notna(row.get("driverCode"))
-                            else str(row.get("familyName", "??"))[:3].upper()
-                        ),
-                        "driver_name": f"{row.get('givenName', '')} {row.get('familyName', '')}".strip(),
-                        "team_name": team_name,
-                        "team_color": get_historical_team_color(team_id),
-                        "points": _safe_float(row.get("points")),
-                        "wins": _safe_int(row.get("wins")),
-                    }
-                )
-
         # Resolve the round name from the event schedule
         if ds_round is not None:
             try:
@@ -113,33 +149,13 @@ def get_standings():
 
         # --- Constructor Standings (WCC started in 1958) ---
         constructor_standings_data = []
-        if year >= 1958:
-            try:
-                cs_res = ergast.get_constructor_standings(season=year, limit=1000)
-                if cs_res.content and not cs_res.content[0].empty:
-                    df = cs_res.content[0]
-                    for _, row in df.iterrows():
-                        cid = str(row.get("constructorId", ""))
-                        constructor_standings_data.append(
-                            {
-                                "position": _safe_int(
-                                    row.get("position"),
-                                    len(constructor_standings_data) + 1,
-                                ),
-                                "constructor_name": str(
-                                    row.get("constructorName", "Unknown")
-                                ),
-                                "constructor_id": cid,
-                                "team_color": get_historical_team_color(cid),
-                                "points": _safe_float(row.get("points")),
-                                "wins": _safe_int(row.get("wins")),
-                            }
-                        )
-            except Exception as e:
-                print(
-                    f"[STANDINGS] Error fetching constructor standings: {e}",
-                    file=sys.stderr,
-                )
+        try:
+            constructor_standings_data = _fetch_constructor_standings(ergast, year)
+        except Exception as e:
+            print(
+                f"[STANDINGS] Error fetching constructor standings: {e}",
+                file=sys.stderr,
+            )
 
         return (
             jsonify(
@@ -158,3 +174,105 @@ def get_standings():
         print(f"[STANDINGS] Error: {e}", file=sys.stderr)
         traceback.print_exc()
         return error_response(f"Failed to fetch standings: {str(e)}", 500)
+
+
+def _remaining_rounds(year, last_round):
+    """List the rounds after `last_round` with their sprint flag."""
+    schedule = fastf1.get_event_schedule(year, include_testing=False)
+    remaining = []
+    for _, event in schedule.iterrows():
+        round_number = _safe_int(event.get("RoundNumber"), None)
+        if round_number is None or (last_round and round_number <= last_round):
+            continue
+        event_format = str(event.get("EventFormat", "")).lower()
+        remaining.append(
+            {
+                "round": round_number,
+                "event_name": str(event.get("EventName", "")),
+                "sprint": event_format.startswith("sprint"),
+            }
+        )
+    return remaining
+
+
+def _scenario_rows(rows, round_sessions, cars):
+    """Attach best/worst reachable positions to a list of standings rows."""
+    points = tuple(row["points"] for row in rows)
+    sessions = tuple(s for sessions in round_sessions for s in sessions)
+    evaluated = championship.evaluate(points, sessions, cars)
+    return [
+        {**row, **outcome, "can_win": outcome["best_position"] == 1}
+        for row, outcome in zip(rows, evaluated)
+    ]
+
+
+@standings_bp.route("/championship-scenarios", methods=["GET"])
+def get_championship_scenarios():
+    """Best/worst reachable championship positions for the current standings.
+
+    Covers every remaining round of the season, including sprint points and
+    the fastest lap bonus where the season awards them, plus the clinch
+    conditions for both championship leaders.
+    """
+    year = request.args.get("year", type=int)
+    is_valid, error_msg = validate_year(year)
+    if not is_valid:
+        return error_response(error_msg)
+
+    try:
+        ergast = fastf1.ergast.Ergast()
+        drivers, ds_round = _fetch_driver_standings(ergast, year)
+        if not drivers:
+            return error_response(f"No standings available for {year}.", 404)
+
+        try:
+            constructors = _fetch_constructor_standings(ergast, year)
+        except Exception as e:
+            print(
+                f"[STANDINGS] Error fetching constructor standings: {e}",
+                file=sys.stderr,
+            )
+            constructors = []
+
+        remaining = _remaining_rounds(year, ds_round)
+        round_sessions = tuple(
+            championship.build_round_sessions(year, r["sprint"]) for r in remaining
+        )
+
+        driver_clinch = championship.clinch_conditions(
+            [d["points"] for d in drivers],
+            [d["driver_name"] for d in drivers],
+            round_sessions,
+        )
+        constructor_clinch = championship.clinch_conditions(
+            [c["points"] for c in constructors],
+            [c["constructor_name"] for c in constructors],
+            round_sessions,
+            cars=2,
+        )
+        if remaining:
+            for clinch in (driver_clinch, constructor_clinch):
+                if clinch is not None:
+                    clinch["next_round"] = remaining[0]
+
+        return (
+            jsonify(
+                {
+                    "year": year,
+                    "round": ds_round,
+                    "remaining_rounds": remaining,
+                    "drivers": _scenario_rows(drivers, round_sessions, 1),
+                    "constructors": _scenario_rows(constructors, round_sessions, 2),
+                    "clinch": {
+                        "drivers": driver_clinch,
+                        "constructors": constructor_clinch,
+                    },
+                }
+            ),
+            200,
+        )
+
+    except Exception as e:
+        print(f"[STANDINGS] Scenario error: {e}", file=sys.stderr)
+        traceback.print_exc()
+        return error_response(f"Failed to compute scenarios: {str(e)}", 500)
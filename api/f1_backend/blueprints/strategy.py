@@ -0,0 +1,611 @@
+from flask import Blueprint, request, jsonify
+import fastf1
+import numpy as np
+import pandas as pd
+import sys
+import threading
+import traceback
+import warnings
+from .. import live, sessions
+from ..executor import offload
+from ..utils import validate_year, error_response
+
+strategy_bp = Blueprint("strategy", __name__)
+
+# Track status codes: 4 safety car, 5 red flag, 6 VSC, 7 VSC ending
+NEUTRALISED_STATUS = "[4567]"
+
+# Lap time gained per lap of fuel burned (~1.8 kg/lap at ~0.03 s/kg)
+DEFAULT_FUEL_CORRECTION_S = 0.055
+MAX_FUEL_CORRECTION_S = 0.2
+MIN_STINT_LAPS = 3
+# Laps slower than this share of the stint median are traffic or incidents
+SLOW_LAP_RATIO = 1.07
+
+
+def _session_args(default_session="Race"):
+    """Validate the shared year/event_key/session_name query parameters."""
+    year = request.args.get("year", type=int)
+    is_valid, error_msg = validate_year(year)
+    if not is_valid:
+        return None, error_response(error_msg)
+
+    event_key = request.args.get("event_key", type=str)
+    session_name = request.args.get("session_name", default_session, type=str)
+    if not all([year, event_key, session_name]):
+        return None, error_response("Year and event_key parameters are required.")
+    if year < 2018:
+        return None, error_response(
+            "Lap timing data is not available for seasons before 2018.", 400
+        )
+    return (year, event_key, session_name), None
+
+
+def _result_key(session, year, *params):
+    """Cache key for a per-session result.
+
+    While the live feed streams the session, the feed's current lap is part
+    of the key so the result is recomputed as laps complete instead of the
+    first answer being served for the rest of the session.
+    """
+    feed = live.feed_for(session, year)
+    lap = feed.lap_count()["current"] if feed is not None else None
+    return (sessions.session_key(session, year), *params, lap)
+
+
+def _driver_info(session):
+    """Abbreviation, team and colour per driver number."""
+    info = {}
+    results = session.results
+    if results is None or results.empty:
+        return info
+    for _, row in results.iterrows():
+        info[str(row["DriverNumber"])] = {
+            "abbreviation": str(row["Abbreviation"]),
+            "team": str(row["TeamName"]) if pd.notna(row["TeamName"]) else None,
+            "team_color": (
+                str(row["TeamColor"]) if pd.notna(row["TeamColor"]) else "777777"
+            ),
+        }
+    return info
+
+
+def _neutralised(laps):
+    """Boolean mask of laps run (partly) under SC, VSC or red flag."""
+    if "TrackStatus" not in laps.columns:
+        return np.zeros(len(laps), dtype=bool)
+    status = laps["TrackStatus"].astype(str)
+    return status.str.contains(NEUTRALISED_STATUS, regex=True).to_numpy()
+
+
+def _green_laps(laps):
+    """Timed laps that reflect tyre pace: no pit, SC/VSC, lap 1 or deletion."""
+    # Copy-on-write hands out read-only arrays; `keep` is combined in place
+    keep = laps["LapTime"].notna().to_numpy(copy=True)
+    keep &= laps["PitInTime"].isna().to_numpy()
+    keep &= laps["PitOutTime"].isna().to_numpy()
+    keep &= laps["LapNumber"].to_numpy() > 1
+    keep &= ~_neutralised(laps)
+    if "Deleted" in laps.columns:
+        keep &= ~laps["Deleted"].fillna(False).astype(bool).to_numpy()
+    return laps[keep]
+
+
+def _group_sums(groups, n_groups, x, y):
+    n = np.bincount(groups, minlength=n_groups).astype(float)
+    sx = np.bincount(groups, x, n_groups)
+    sy = np.bincount(groups, y, n_groups)
+    return n, sx, sy
+
+
+def _fit_stints(groups, n_groups, x, y):
+    """Least-squares line per group, for every group at once.
+
+    Returns (intercept, slope, r2, n); groups with fewer than two distinct x
+    values get NaN coefficients.
+    """
+    n, sx, sy = _group_sums(groups, n_groups, x, y)
+    safe_n = np.maximum(n, 1)
+    dx = x - (sx / safe_n)[groups]
+    dy = y - (sy / safe_n)[groups]
+    sxx = np.bincount(groups, dx * dx, n_groups)
+    sxy = np.bincount(groups, dx * dy, n_groups)
+    syy = np.bincount(groups, dy * dy, n_groups)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = np.where(sxx > 0, sxy / sxx, np.nan)
+        intercept = sy / safe_n - slope * sx / safe_n
+        r2 = np.where(syy > 0, sxy * sxy / (sxx * syy), np.nan)
+    return intercept, slope, r2, n
+
+
+def _fit_compounds(groups, n_groups, compound_of_group, x, y):
+    """Common slope per compound with a separate intercept per stint.
+
+    Demeaning within each stint removes the car/driver offset, so each
+    compound's slope is one pooled least-squares over all its stints.
+    """
+    n, sx, sy = _group_sums(groups, n_groups, x, y)
+    safe_n = np.maximum(n, 1)
+    dx = x - (sx / safe_n)[groups]
+    dy = y - (sy / safe_n)[groups]
+    lap_compound = compound_of_group[groups]
+    n_compounds = int(compound_of_group.max()) + 1
+    sxx = np.bincount(lap_compound, dx * dx, n_compounds)
+    sxy = np.bincount(lap_compound, dx * dy, n_compounds)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(sxx > 0, sxy / sxx, np.nan)
+
+
+def _round(value, digits=4):
+    return round(float(value), digits) if np.isfinite(value) else None
+
+
+def _compute_degradation(session, fuel_correction):
+    laps = _green_laps(session.laps)
+    laps = laps[laps["Stint"].notna() & laps["TyreLife"].notna()]
+    if laps.empty:
+        return None
+
+    total_laps = int(session.laps["LapNumber"].max())
+    lap_number = laps["LapNumber"].to_numpy(dtype=float)
+    # Normalise every lap to an empty tank
+    y = laps["LapTime"].dt.total_seconds().to_numpy()
+    y = y - fuel_correction * (total_laps - lap_number)
+    x = laps["TyreLife"].to_numpy(dtype=float)
+
+    stint_keys = pd.MultiIndex.from_arrays(
+        [laps["DriverNumber"].astype(str), laps["Stint"].astype(int)]
+    )
+    groups, stint_index = pd.factorize(stint_keys)
+
+    # Drop traffic and incident laps against each stint's median
+    median = pd.Series(y).groupby(groups).transform("median").to_numpy()
+    clean = y <= median * SLOW_LAP_RATIO
+    x, y, groups, lap_number = x[clean], y[clean], groups[clean], lap_number[clean]
+    compounds = laps["Compound"].astype(str).to_numpy()[clean]
+
+    n_groups = len(stint_index)
+    counts = np.bincount(groups, minlength=n_groups)
+    fitted = counts[groups] >= MIN_STINT_LAPS
+    x, y, groups, lap_number = x[fitted], y[fitted], groups[fitted], lap_number[fitted]
+    compounds = compounds[fitted]
+    if len(x) == 0:
+        return None
+
+    intercept, slope, r2, n = _fit_stints(groups, n_groups, x, y)
+
+    compound_codes, compound_names = pd.factorize(compounds)
+    compound_of_group = np.zeros(n_groups, dtype=int)
+    compound_of_group[groups] = compound_codes
+    compound_slope = _fit_compounds(groups, n_groups, compound_of_group, x, y)
+
+    order = np.argsort(groups, kind="stable")
+    bounds = np.searchsorted(groups[order], np.arange(n_groups + 1))
+    drivers = _driver_info(session)
+
+    stints = []
+    for g, (driver_number, stint) in enumerate(stint_index):
+        if n[g] < MIN_STINT_LAPS:
+            continue
+        rows = order[bounds[g] : bounds[g + 1]]
+        info = drivers.get(driver_number, {})
+        stints.append(
+            {
+                "driver_number": driver_number,
+                "abbreviation": info.get("abbreviation"),
+                "team_color": info.get("team_color"),
+                "stint": int(stint),
+                "compound": str(compound_names[compound_of_group[g]]),
+                "start_lap": int(lap_number[rows].min()),
+                "end_lap": int(lap_number[rows].max()),
+                "laps": int(n[g]),
+                "intercept": _round(intercept[g], 3),
+                "slope": _round(slope[g]),
+                "r2": _round(r2[g], 3),
+                # Aligned arrays of the laps used in the fit
+                "tyre_life": x[rows].astype(int).tolist(),
+                "lap_times": np.round(y[rows], 3).tolist(),
+            }
+        )
+
+    compound_rows = []
+    for c, name in enumerate(compound_names):
+        in_compound = compound_of_group[np.unique(groups)] == c
+        compound_rows.append(
+            {
+                "compound": str(name),
+                "slope": _round(compound_slope[c]),
+                "stints": int(in_compound.sum()),
+                "laps": int((compound_codes == c).sum()),
+            }
+        )
+    compound_rows.sort(key=lambda row: row["slope"] is None)
+
+    return {
+        "fuel_correction": fuel_correction,
+        "total_laps": total_laps,
+        "compounds": compound_rows,
+        "stints": stints,
+    }
+
+
+@strategy_bp.route("/tyre-degradation", methods=["GET"])
+@offload("session")
+def get_tyre_degradation():
+    """Lap time vs tyre life trends per stint and per compound.
+
+    Pit in/out laps, lap 1, SC/VSC laps and slow outliers are excluded and
+    lap times are fuel-corrected to an empty tank before fitting.
+    """
+    args, error = _session_args()
+    if error:
+        return error
+    year, event_key, session_name = args
+
+    is_race = session_name.lower() in ("race", "sprint")
+    default_correction = DEFAULT_FUEL_CORRECTION_S if is_race else 0.0
+    fuel_correction = request.args.get(
+        "fuel_correction", default_correction, type=float
+    )
+    fuel_correction = round(min(max(fuel_correction, 0.0), MAX_FUEL_CORRECTION_S), 3)
+
+    try:
+        session = fastf1.get_session(year, event_key, session_name)
+        result = sessions.cached_result(
+            _result_key(session, year, fuel_correction),
+            "tyre_degradation",
+            lambda: _compute_degradation(
+                sessions.load(session, year), fuel_correction
+            ),
+        )
+        if result is None:
+            return error_response("No green-flag stints in this session.", 404)
+        return jsonify(result), 200
+    except Exception as e:
+        print(f"[STRATEGY] Tyre degradation error: {e}", file=sys.stderr)
+        traceback.print_exc()
+        return error_response(f"An error occurred: {str(e)}", 500)
+
+
+# --- Race trace ---
+
+_trace_lock = threading.Lock()
+
+
+def _nullable(matrix, digits=3):
+    return [
+        [None if np.isnan(v) else round(float(v), digits) for v in row]
+        for row in matrix
+    ]
+
+
+def _lap_matrix(laps, rows, first_lap, n_laps, values):
+    """Scatter one value per lap into a drivers x laps matrix."""
+    matrix = np.full((len(rows), n_laps), np.nan)
+    row = laps["DriverNumber"].astype(str).map(rows).to_numpy()
+    col = laps["LapNumber"].to_numpy(dtype=int) - first_lap
+    ok = ~pd.isna(row) & (col >= 0) & (col < n_laps)
+    matrix[row[ok].astype(int), col[ok]] = values[ok]
+    return matrix
+
+
+def _trace_columns(laps, rows, first_lap, last_lap, origin):
+    """Cumulative race time for laps first_lap..last_lap of every driver.
+
+    `origin` is each driver's elapsed session time at the end of the lap
+    before `first_lap`. Lap durations come from consecutive lap end times,
+    falling back to LapTime where a timestamp is missing; a lap with neither
+    (a retirement) leaves every later lap of that driver empty.
+    """
+    n_laps = last_lap - first_lap + 1
+    ends = _lap_matrix(
+        laps, rows, first_lap, n_laps, laps["Time"].dt.total_seconds().to_numpy()
+    )
+    lap_times = _lap_matrix(
+        laps, rows, first_lap, n_laps, laps["LapTime"].dt.total_seconds().to_numpy()
+    )
+    durations = np.diff(ends, axis=1, prepend=origin[:, None])
+    durations = np.where(np.isnan(durations), lap_times, durations)
+    return origin[:, None] + np.cumsum(durations, axis=1)
+
+
+def _first_new_lap(state, laps):
+    """Lowest lap number in `laps` not yet reflected in the trace, or None."""
+    numbers = laps["DriverNumber"].astype(str)
+    for number in numbers.unique():
+        if number not in state["rows"]:
+            state["rows"][number] = len(state["rows"])
+            blank = np.full((1, state["elapsed"].shape[1]), np.nan)
+            state["elapsed"] = np.vstack([state["elapsed"], blank])
+
+    row = numbers.map(state["rows"]).to_numpy(dtype=int)
+    col = laps["LapNumber"].to_numpy(dtype=int) - 1
+    width = state["elapsed"].shape[1]
+    known = col < width
+    known[known] = ~np.isnan(state["elapsed"][row[known], col[known]])
+    if known.all():
+        return None
+    return int(col[~known].min()) + 1
+
+
+def _extend_trace(state, laps):
+    """Fold laps completed since the trace was last built into it.
+
+    Only the columns from the earliest new lap onwards are recomputed, so a
+    live trace costs a few columns per update even when a lap arrives for a
+    car that is behind the leader.
+    """
+    if laps.empty:
+        return state
+    first_lap = _first_new_lap(state, laps)
+    if first_lap is None:
+        return state
+    last_lap = max(int(laps["LapNumber"].max()), state["last_lap"])
+    if first_lap > 1:
+        origin = state["elapsed"][:, first_lap - 2]
+    else:
+        origin = np.full(len(state["rows"]), state["start"])
+    new = _trace_columns(
+        laps[laps["LapNumber"] >= first_lap],
+        state["rows"],
+        first_lap,
+        last_lap,
+        origin,
+    )
+    state["elapsed"] = np.hstack([state["elapsed"][:, : first_lap - 1], new])
+    state["last_lap"] = last_lap
+    state["payload"] = _trace_payload(state)
+    return state
+
+
+def _new_trace(laps, drivers):
+    if laps.empty:
+        return None
+    start = laps.loc[laps["LapNumber"] == laps["LapNumber"].min(), "LapStartTime"]
+    state = {
+        "rows": {},
+        "drivers": drivers,
+        "start": float(start.min().total_seconds()),
+        "elapsed": np.empty((0, 0)),
+        "last_lap": 0,
+    }
+    return _extend_trace(state, laps)
+
+
+def _build_trace(session):
+    return _new_trace(session.laps, _driver_info(session))
+
+
+def _trace_payload(state):
+    elapsed = state["elapsed"]
+    cumulative = elapsed - state["start"]
+    done = ~np.isnan(cumulative)
+
+    # Rank every lap column at once; unfinished laps sort last
+    order = np.argsort(np.where(done, cumulative, np.inf), axis=0, kind="stable")
+    ranked = np.take_along_axis(cumulative, order, axis=0)
+    ahead = np.diff(ranked, axis=0, prepend=np.nan)
+    interval = np.empty_like(cumulative)
+    np.put_along_axis(interval, order, ahead, axis=0)
+    position = np.empty_like(cumulative)
+    places = np.broadcast_to(
+        np.arange(1, len(cumulative) + 1, dtype=float)[:, None], cumulative.shape
+    )
+    np.put_along_axis(position, order, places, axis=0)
+
+    leader = np.min(np.where(done, cumulative, np.inf), axis=0)
+    gap = np.where(done, cumulative - leader, np.nan)
+    interval = np.where(done & (position > 1), interval, np.where(done, 0.0, np.nan))
+    position = np.where(done, position, np.nan)
+
+    # Final order: most laps completed, then least time
+    laps_done = done.sum(axis=1)
+    final = np.where(
+        laps_done > 0,
+        cumulative[np.arange(len(cumulative)), np.maximum(laps_done - 1, 0)],
+        np.inf,
+    )
+    rows = np.lexsort((final, -laps_done))
+
+    numbers = list(state["rows"])
+    drivers = []
+    for i in rows:
+        info = state["drivers"].get(numbers[i], {})
+        drivers.append(
+            {
+                "driver_number": numbers[i],
+                "abbreviation": info.get("abbreviation"),
+                "team_color": info.get("team_color"),
+            }
+        )
+    return {
+        "laps": list(range(1, state["last_lap"] + 1)),
+        # Row i of every matrix belongs to drivers[i]; None marks laps not run
+        "drivers": drivers,
+        "cumulative": _nullable(cumulative[rows]),
+        "gap_to_leader": _nullable(gap[rows]),
+        "interval": _nullable(interval[rows]),
+        "position": [
+            [None if np.isnan(p) else int(p) for p in row] for row in position[rows]
+        ],
+    }
+
+
+@strategy_bp.route("/race-trace", methods=["GET"])
+@offload("session")
+def get_race_trace():
+    """Cumulative time, gap to leader, interval and position per driver/lap.
+
+    Built once per session. While the live feed streams this session the
+    cached trace is only extended with laps completed since the last request;
+    live updates need the feed.
+    """
+    args, error = _session_args()
+    if error:
+        return error
+    year, event_key, session_name = args
+
+    try:
+        session = fastf1.get_session(year, event_key, session_name)
+        key = sessions.session_key(session, year)
+        feed = live.feed_for(session, year)
+        if feed is not None:
+            laps = feed.laps_frame()
+            if laps.empty:
+                return error_response("No laps completed yet.", 404)
+            with _trace_lock:
+                state = sessions.cached_result(
+                    key,
+                    "live_race_trace",
+                    lambda: _new_trace(laps, feed.driver_info()),
+                )
+                state["drivers"] = feed.driver_info()
+                _extend_trace(state, laps)
+        else:
+            # FastF1 only publishes a session's laps once it is over, so live
+            # updates come from the feed alone
+            state = sessions.cached_result(
+                key,
+                "race_trace",
+                lambda: _build_trace(sessions.load(session, year)),
+            )
+        if state is None:
+            return error_response("No laps in this session.", 404)
+        return jsonify(state["payload"]), 200
+    except Exception as e:
+        print(f"[STRATEGY] Race trace error: {e}", file=sys.stderr)
+        traceback.print_exc()
+        return error_response(f"An error occurred: {str(e)}", 500)
+
+
+# --- Pit stops ---
+
+# Green-flag laps either side of a stop used as the driver's reference pace
+PACE_WINDOW_LAPS = 5
+
+
+def _status_label(statuses):
+    if "4" in statuses:
+        return "SC"
+    if "6" in statuses or "7" in statuses:
+        return "VSC"
+    if "5" in statuses:
+        return "Red Flag"
+    return None
+
+
+def _compute_pit_stops(session):
+    laps = session.laps.sort_values(["DriverNumber", "LapNumber"])
+    if laps.empty:
+        return None
+
+    driver = laps["DriverNumber"].astype(str).to_numpy()
+    lap_number = laps["LapNumber"].to_numpy(dtype=int)
+    pit_in = laps["PitInTime"].dt.total_seconds().to_numpy()
+    pit_out = laps["PitOutTime"].dt.total_seconds().to_numpy()
+    lap_time = laps["LapTime"].dt.total_seconds().to_numpy()
+    status = laps["TrackStatus"].astype(str).to_numpy()
+
+    # A stop is an in-lap followed by the same driver's out-lap
+    same_driver = driver[:-1] == driver[1:]
+    consecutive = lap_number[1:] == lap_number[:-1] + 1
+    stop = same_driver & consecutive & ~np.isnan(pit_in[:-1]) & ~np.isnan(pit_out[1:])
+    in_idx = np.flatnonzero(stop)
+    out_idx = in_idx + 1
+    if len(in_idx) == 0:
+        return {"stops": [], "median_pit_lane": None, "median_loss": None}
+
+    # Reference pace from green laps around each stop, gathered in one go
+    rows = {number: i for i, number in enumerate(pd.unique(driver))}
+    first_lap = int(lap_number.min())
+    n_laps = int(lap_number.max()) - first_lap + 1
+    green = _green_laps(laps)
+    pace = _lap_matrix(
+        green, rows, first_lap, n_laps, green["LapTime"].dt.total_seconds().to_numpy()
+    )
+    offsets = np.concatenate(
+        [np.arange(-PACE_WINDOW_LAPS, 0), np.arange(2, PACE_WINDOW_LAPS + 2)]
+    )
+    window = lap_number[in_idx][:, None] - first_lap + offsets[None, :]
+    inside = (window >= 0) & (window < n_laps)
+    stop_rows = np.array([rows[d] for d in driver[in_idx]])
+    samples = np.where(
+        inside,
+        pace[stop_rows[:, None], np.clip(window, 0, n_laps - 1)],
+        np.nan,
+    )
+    with warnings.catch_warnings():
+        # Stops with no green laps nearby (e.g. under a long SC) stay NaN
+        warnings.simplefilter("ignore", RuntimeWarning)
+        reference = np.nanmedian(samples, axis=1)
+
+    pit_lane = pit_out[out_idx] - pit_in[in_idx]
+    loss = lap_time[in_idx] + lap_time[out_idx] - 2 * reference
+    stop_number = (
+        pd.Series(driver[in_idx]).groupby(driver[in_idx]).cumcount().to_numpy() + 1
+    )
+    labels = [_status_label(status[i] + status[o]) for i, o in zip(in_idx, out_idx)]
+    compound = laps["Compound"].astype(str).to_numpy()
+    tyre_life = laps["TyreLife"].to_numpy(dtype=float)
+    drivers = _driver_info(session)
+
+    stops = []
+    for k, (i, o) in enumerate(zip(in_idx, out_idx)):
+        info = drivers.get(driver[i], {})
+        stops.append(
+            {
+                "driver_number": driver[i],
+                "abbreviation": info.get("abbreviation"),
+                "team": info.get("team"),
+                "team_color": info.get("team_color"),
+                "stop": int(stop_number[k]),
+                "lap": int(lap_number[i]),
+                "compound_in": compound[i],
+                "compound_out": compound[o],
+                "tyre_life_in": _round(tyre_life[i], 0),
+                "pit_lane_seconds": _round(pit_lane[k], 3),
+                "reference_pace_seconds": _round(reference[k], 3),
+                "time_loss_seconds": _round(loss[k], 3),
+                "track_status": labels[k],
+            }
+        )
+    stops.sort(key=lambda s: (s["lap"], s["pit_lane_seconds"] or 0))
+
+    # SC/VSC stops are much cheaper, so the medians use green-flag stops only
+    green_flag = np.array([label is None for label in labels])
+    return {
+        "stops": stops,
+        "median_pit_lane": _median(pit_lane[green_flag]),
+        "median_loss": _median(loss[green_flag]),
+    }
+
+
+def _median(values):
+    values = values[np.isfinite(values)]
+    return _round(np.median(values), 3) if len(values) else None
+
+
+@strategy_bp.route("/pit-stops", methods=["GET"])
+@offload("session")
+def get_pit_stops():
+    """Every pit stop with pit-lane time and loss against green-flag pace."""
+    args, error = _session_args()
+    if error:
+        return error
+    year, event_key, session_name = args
+
+    try:
+        session = fastf1.get_session(year, event_key, session_name)
+        result = sessions.cached_result(
+            _result_key(session, year),
+            "pit_stops",
+            lambda: _compute_pit_stops(sessions.load(session, year)),
+        )
+        if result is None:
+            return error_response("No laps in this session.", 404)
+        return jsonify(result), 200
+    except Exception as e:
+        print(f"[STRATEGY] Pit stops error: {e}", file=sys.stderr)
+        traceback.print_exc()
+        return error_response(f"An error occurred: {str(e)}", 500)
@@ -1,10 +1,20 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify
 import fastf1
+import json
 import pandas as pd
 import numpy as np
 import sys
 import traceback
 from datetime import datetime
+from .. import circuits, lap_store, live, sessions
+from ..executor import offload
+from ..sessions import load_session
+from ..jobs import (
+    job_eligible,
+    estimate_corner_analysis,
+    estimate_lap_telemetry,
+    estimate_session_route,
+)
 from ..utils import (
     validate_year,
     error_response,
@@ -118,6 +128,7 @@ def _format_lap_entry(lap, driver_number=None):
 
 
 @telemetry_bp.route("/race-comparison", methods=["GET"])
+@offload("session")
 def get_race_comparison():
     year = request.args.get("year", type=int)
     is_valid, error_msg = validate_year(year)
@@ -141,8 +152,7 @@ def get_race_comparison():
                 400,
             )
 
-        session = fastf1.get_session(year, event_key, session_name)
-        session.load(telemetry=False, weather=False, messages=False)
+        session = load_session(year, event_key, session_name)
 
         driver1_laps = session.laps.pick_drivers(driver1_number)
         driver2_laps = session.laps.pick_drivers(driver2_number)
@@ -190,6 +200,7 @@ def get_race_comparison():
 
 
 @telemetry_bp.route("/laps", methods=["GET"])
+@offload("session")
 def get_laps():
     year = request.args.get("year", type=int)
     is_valid, error_msg = validate_year(year)
@@ -210,8 +221,7 @@ def get_laps():
                 400,
             )
 
-        session = fastf1.get_session(year, event_key, session_name)
-        session.load(telemetry=False, weather=False, messages=False)
+        session = load_session(year, event_key, session_name)
 
         driver_laps = session.laps.pick_drivers(driver_number)
 
@@ -235,7 +245,26 @@ def get_laps():
         return error_response(f"An error occurred: {str(e)}", 500)
 
 
+def _lap_channels(session, year, lap):
+    """A lap's telemetry channels from the per-lap store, or None.
+
+    `session` only needs its laps loaded. A lap that is not stored yet is
+    sliced from the session loaded with telemetry and stored on the way.
+    """
+    driver_number, lap_number = lap["DriverNumber"], int(lap["LapNumber"])
+    channels = lap_store.read(session, year, driver_number, lap_number)
+    if channels is not None:
+        return channels
+    session = sessions.load(session, year, telemetry=True)
+    picked = session.laps.pick_drivers(driver_number).pick_laps(lap_number)
+    if picked.empty:
+        return None
+    return lap_store.store(session, year, picked.iloc[0])
+
+
 @telemetry_bp.route("/lap-telemetry", methods=["GET"])
+@job_eligible(estimate_lap_telemetry)
+@offload("telemetry")
 def get_lap_telemetry():
     year = request.args.get("year", type=int)
     is_valid, error_msg = validate_year(year)
@@ -270,8 +299,7 @@ def get_lap_telemetry():
                 400,
             )
 
-        session = fastf1.get_session(year, event_key, session_name)
-        session.load(telemetry=True, weather=False, messages=False)
+        session = load_session(year, event_key, session_name)
 
         driver1_lap = session.laps.pick_drivers(driver1_number).pick_laps(lap1_number)
         driver2_lap = session.laps.pick_drivers(driver2_number).pick_laps(lap2_number)
@@ -286,61 +314,48 @@ def get_lap_telemetry():
                 f"No data for Driver {driver2_number} Lap {lap2_number}.", 404
             )
 
-        driver1_telemetry = driver1_lap.get_telemetry()
-        driver2_telemetry = driver2_lap.get_telemetry()
-
-        # Get circuit info for turns
-        circuit_info = session.get_circuit_info()
-        turns = []
-        if circuit_info is not None and circuit_info.corners is not None:
-            for _, turn in circuit_info.corners.iterrows():
-                turns.append(
-                    {"number": str(turn["Number"]), "distance": float(turn["Distance"])}
-                )
-
-        def format_telemetry(telemetry, driver_number, lap_number):
-            if telemetry.empty:
-                return []
-
-            min_distance = telemetry["Distance"].min()
+        # Stored laps are keyed by the picked lap's number, as the query may
+        # name the driver by abbreviation
+        driver1_telemetry = _lap_channels(session, year, driver1_lap.iloc[0])
+        if driver1_telemetry is None:
+            return error_response(
+                f"No telemetry for Driver {driver1_number} Lap {lap1_number}.", 404
+            )
+        driver2_telemetry = _lap_channels(session, year, driver2_lap.iloc[0])
+        if driver2_telemetry is None:
+            return error_response(
+                f"No telemetry for Driver {driver2_number} Lap {lap2_number}.", 404
+            )
 
-            telemetry_data = []
-            for idx, point in telemetry.iterrows():
-                telemetry_data.append(
-                    {
-                        "time": (
-                            float(point["Time"].total_seconds())
-                            if pd.notna(point["Time"])
-                            else None
-                        ),
-                        "distance": (
-                            float(point["Distance"] - min_distance)
-                            if pd.notna(point["Distance"])
-                            else None
-                        ),
-                        "speed": (
-                            float(point["Speed"]) if pd.notna(point["Speed"]) else None
-                        ),
-                        "throttle": (
-                            float(point["Throttle"])
-                            if pd.notna(point["Throttle"])
-                            else None
-                        ),
-                        "brake": (
-                            bool(point["Brake"]) if pd.notna(point["Brake"]) else None
-                        ),
-                        "drs": (
-                            int(point["DRS"]) >= 10 if pd.notna(point["DRS"]) else False
-                        ),
-                        "n_gear": (
-                            int(point["nGear"]) if pd.notna(point["nGear"]) else None
-                        ),
-                        "rpm": float(point["RPM"]) if pd.notna(point["RPM"]) else None,
-                        "driver_number": driver_number,
-                        "lap_number": lap_number,
-                    }
-                )
-            return telemetry_data
+        # Turn positions come from the per-layout circuit cache
+        turns = circuits.turns(session, year)
+
+        def format_telemetry(channels, driver_number, lap_number):
+            rows = zip(
+                _rounded(channels["time"], 3),
+                _rounded(channels["distance"], 2),
+                _rounded(channels["speed"], 1),
+                _rounded(channels["throttle"], 1),
+                channels["brake"].tolist(),
+                channels["drs"].tolist(),
+                channels["n_gear"].tolist(),
+                _rounded(channels["rpm"], 0),
+            )
+            return [
+                {
+                    "time": time,
+                    "distance": distance,
+                    "speed": speed,
+                    "throttle": throttle,
+                    "brake": bool(brake) if brake >= 0 else None,
+                    "drs": drs >= 10,
+                    "n_gear": n_gear if n_gear >= 0 else None,
+                    "rpm": rpm,
+                    "driver_number": driver_number,
+                    "lap_number": lap_number,
+                }
+                for time, distance, speed, throttle, brake, drs, n_gear, rpm in rows
+            ]
 
         driver1_info = session.get_driver(driver1_number)
         driver2_info = session.get_driver(driver2_number)
@@ -405,6 +420,8 @@ def get_lap_telemetry():
 
 
 @telemetry_bp.route("/fastest-lap", methods=["GET"])
+@job_eligible(estimate_session_route(telemetry=True))
+@offload("telemetry")
 def get_fastest_lap():
     year = request.args.get("year", type=int)
     is_valid, error_msg = validate_year(year)
@@ -428,10 +445,9 @@ def get_fastest_lap():
                 400,
             )
 
-        session = fastf1.get_session(year, event_key, session_name)
         # Use telemetry if available
         use_telemetry = year >= 2018
-        session.load(telemetry=use_telemetry, weather=False, messages=False)
+        session = load_session(year, event_key, session_name, telemetry=use_telemetry)
 
         driver1_laps = session.laps.pick_drivers(driver1_number)
         driver2_laps = session.laps.pick_drivers(driver2_number)
@@ -570,7 +586,488 @@ def get_fastest_lap():
         return error_response(f"An error occurred: {str(e)}", 500)
 
 
+MAX_COMPARED_LAPS = 20
+DEFAULT_GRID_POINTS = 500
+MAX_GRID_POINTS = 2000
+
+
+def _parse_lap_selection(raw):
+    """Parse `1:fastest,16:12,44` into [(driver, lap or None)]."""
+    selection = []
+    for item in (raw or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        driver, _, lap = item.partition(":")
+        lap = lap.strip().lower()
+        if lap in ("", "fastest"):
+            selection.append((driver.strip(), None))
+        elif lap.isdigit():
+            selection.append((driver.strip(), int(lap)))
+        else:
+            raise ValueError(f"Invalid lap '{lap}' for driver {driver}.")
+    return selection
+
+
+def _pick_lap(laps, driver_number, lap_number):
+    """A driver's given lap, or their fastest non-deleted lap."""
+    driver_laps = laps.pick_drivers(driver_number)
+    if driver_laps.empty:
+        return None
+    if lap_number is not None:
+        lap = driver_laps.pick_laps(lap_number)
+        return None if lap.empty else lap.iloc[0]
+    if "Deleted" in driver_laps.columns:
+        driver_laps = driver_laps[~driver_laps["Deleted"].fillna(False).astype(bool)]
+    timed = driver_laps[driver_laps["LapTime"].notna()]
+    if timed.empty:
+        return None
+    return timed.loc[timed["LapTime"].idxmin()]
+
+
+def _resample(distance, values, grid, step=False):
+    """Resample a channel onto `grid`; NaN beyond the trace's own distance."""
+    if step:
+        idx = np.clip(np.searchsorted(distance, grid, side="right") - 1, 0, None)
+        out = values[idx].astype(float)
+    else:
+        out = np.interp(grid, distance, values.astype(float))
+    out[(grid < distance[0]) | (grid > distance[-1])] = np.nan
+    return out
+
+
+def _rounded(values, digits):
+    return [None if np.isnan(v) else round(float(v), digits) for v in values]
+
+
+@telemetry_bp.route("/multi-telemetry", methods=["GET"])
+@job_eligible(estimate_session_route(telemetry=True))
+@offload("telemetry")
+def get_multi_telemetry():
+    """Telemetry of several (driver, lap) pairs on one shared distance grid.
+
+    `laps` is a comma-separated list of `driver:lap`, where the lap may be
+    omitted or `fastest`. Only car data is used (no driver-ahead channel), so
+    the cost grows linearly with the number of laps compared.
+    """
+    year = request.args.get("year", type=int)
+    is_valid, error_msg = validate_year(year)
+    if not is_valid:
+        return error_response(error_msg)
+
+    event_key = request.args.get("event_key", type=str)
+    session_name = request.args.get("session_name", type=str)
+    points = request.args.get("points", DEFAULT_GRID_POINTS, type=int)
+
+    if not all([year, event_key, session_name, request.args.get("laps")]):
+        return error_response(
+            "Year, event_key, session_name and laps parameters are required."
+        )
+
+    try:
+        selection = _parse_lap_selection(request.args.get("laps"))
+    except ValueError as e:
+        return error_response(str(e))
+    if not selection or len(selection) > MAX_COMPARED_LAPS:
+        return error_response(
+            f"Between 1 and {MAX_COMPARED_LAPS} driver laps can be compared."
+        )
+    points = min(max(points, 50), MAX_GRID_POINTS)
+
+    try:
+        if year < 2018:
+            return error_response(
+                "High-resolution telemetry is not available for seasons before 2018.",
+                400,
+            )
+
+        session = load_session(year, event_key, session_name, telemetry=True)
+
+        traces = []
+        for driver_number, lap_number in selection:
+            lap = _pick_lap(session.laps, driver_number, lap_number)
+            if lap is None:
+                label = lap_number if lap_number is not None else "fastest"
+                return error_response(
+                    f"No data for Driver {driver_number} Lap {label}.", 404
+                )
+            car = lap.get_car_data().add_distance()
+            car = car[car["Distance"].notna()]
+            if car.empty:
+                return error_response(
+                    f"No telemetry for Driver {driver_number} "
+                    f"Lap {int(lap['LapNumber'])}.",
+                    404,
+                )
+            traces.append((driver_number, lap, car))
+
+        # One grid for every trace, spanning the longest lap
+        length = max(float(car["Distance"].iloc[-1]) for _, _, car in traces)
+        grid = np.linspace(0.0, length, points)
+
+        reference_time = None
+        drivers = []
+        for driver_number, lap, car in traces:
+            distance = car["Distance"].to_numpy(dtype=float)
+            elapsed = car["Time"].dt.total_seconds().to_numpy()
+            time_s = _resample(distance, elapsed, grid)
+            if reference_time is None:
+                reference_time = time_s
+
+            info = session.get_driver(driver_number)
+            drivers.append(
+                {
+                    "driver_number": driver_number,
+                    "abbreviation": str(info["Abbreviation"]),
+                    "full_name": str(info["FullName"]),
+                    "team": str(info["TeamName"]),
+                    "team_color": (
+                        str(info["TeamColor"]) if "TeamColor" in info else None
+                    ),
+                    "lap": _format_lap_entry(lap, driver_number),
+                    "channels": {
+                        "time": _rounded(time_s, 3),
+                        "speed": _rounded(
+                            _resample(distance, car["Speed"].to_numpy(), grid), 1
+                        ),
+                        "throttle": _rounded(
+                            _resample(distance, car["Throttle"].to_numpy(), grid), 1
+                        ),
+                        "brake": _rounded(
+                            _resample(
+                                distance, car["Brake"].to_numpy(), grid, step=True
+                            ),
+                            0,
+                        ),
+                        "n_gear": _rounded(
+                            _resample(
+                                distance, car["nGear"].to_numpy(), grid, step=True
+                            ),
+                            0,
+                        ),
+                        "rpm": _rounded(
+                            _resample(distance, car["RPM"].to_numpy(), grid), 0
+                        ),
+                        "drs": _rounded(
+                            _resample(
+                                distance,
+                                (car["DRS"].to_numpy() >= 10).astype(float),
+                                grid,
+                                step=True,
+                            ),
+                            0,
+                        ),
+                    },
+                    "delta_to_first": _rounded(time_s - reference_time, 3),
+                }
+            )
+
+        turns = circuits.turns(session, year)
+
+        return (
+            jsonify(
+                {
+                    "circuit_info": {"turns": turns},
+                    "distance": _rounded(grid, 1),
+                    "drivers": drivers,
+                }
+            ),
+            200,
+        )
+    except Exception as e:
+        return error_response(f"An error occurred: {str(e)}", 500)
+
+
+# Throttle (%) that counts as picking the throttle up again after the apex
+PICKUP_THROTTLE = 20.0
+
+
+def _last_event(events, targets, lower):
+    """Per target, the last event index in [lower, target], or -1."""
+    padded = np.r_[-1, events]
+    found = padded[np.searchsorted(padded, targets, side="right") - 1]
+    return np.where(found >= lower, found, -1)
+
+
+def _first_event(events, targets, upper, size):
+    """Per target, the first event index in [target, upper), or -1."""
+    padded = np.r_[events, size]
+    found = padded[np.searchsorted(padded, targets, side="left")]
+    return np.where(found < upper, found, -1)
+
+
+def _values_at(values, idx):
+    out = np.full(len(idx), np.nan)
+    out[idx >= 0] = values[idx[idx >= 0]]
+    return out
+
+
+def _corner_metrics(channels, apexes):
+    """Entry/minimum speed, braking and pickup points and time per corner.
+
+    A corner spans from halfway after the previous apex to halfway before
+    the next one. Its boundaries are found with sorted searches over the
+    distance channel and every corner is measured in one vectorized pass.
+    """
+    distance = channels["distance"].astype(float)
+    speed = channels["speed"].astype(float)
+    size, n = len(distance), len(apexes)
+    bounds = np.concatenate(([-np.inf], (apexes[:-1] + apexes[1:]) / 2, [np.inf]))
+    starts = np.searchsorted(distance, bounds[:-1], side="left")
+    ends = np.searchsorted(distance, bounds[1:], side="left")
+
+    # Minimum speed: sort samples by (corner, speed) and take each corner's first
+    corner = np.clip(np.searchsorted(bounds, distance, side="right") - 1, 0, n - 1)
+    order = np.lexsort((np.nan_to_num(speed, nan=np.inf), corner))
+    first = np.r_[True, corner[order][1:] != corner[order][:-1]]
+    apex_idx = np.full(n, -1)
+    apex_idx[corner[order][first]] = order[first]
+    found = apex_idx >= 0
+    at = np.where(found, apex_idx, 0)
+
+    brake = channels["brake"] > 0
+    brake_on = np.flatnonzero(brake & ~np.r_[False, brake[:-1]])
+    braking = np.where(found, _last_event(brake_on, at, starts), -1)
+    throttle_up = np.flatnonzero(channels["throttle"] >= PICKUP_THROTTLE)
+    pickup = np.where(found, _first_event(throttle_up, at, ends, size), -1)
+    # Without braking, the corner is entered at its first sample
+    entry = np.where(braking >= 0, braking, np.minimum(starts, size - 1))
+    entry = np.where(found, entry, -1)
+
+    edges = np.clip(bounds, distance[0], distance[-1])
+    elapsed = np.interp(edges, distance, channels["time"].astype(float))
+
+    return {
+        "entry_speed": _rounded(_values_at(speed, entry), 1),
+        "min_speed": _rounded(_values_at(speed, apex_idx), 1),
+        "min_speed_distance": _rounded(_values_at(distance, apex_idx), 1),
+        "braking_point": _rounded(_values_at(distance, braking), 1),
+        "throttle_pickup": _rounded(_values_at(distance, pickup), 1),
+        "time": _rounded(np.diff(elapsed), 3),
+    }
+
+
+def _lap_corners(session, year, lap, apexes):
+    channels = _lap_channels(session, year, lap)
+    if channels is None or len(channels["distance"]) < 2:
+        return None
+    return _corner_metrics(channels, apexes)
+
+
+@telemetry_bp.route("/corner-analysis", methods=["GET"])
+@job_eligible(estimate_corner_analysis)
+@offload("telemetry")
+def get_corner_analysis():
+    """Corner-by-corner performance of several (driver, lap) pairs.
+
+    `laps` selects laps as for /multi-telemetry. Metrics are column lists in
+    corner order; `time_delta` is each corner's time relative to the first
+    selected lap. Each lap's metrics are cached per (session, driver, lap).
+    """
+    year = request.args.get("year", type=int)
+    is_valid, error_msg = validate_year(year)
+    if not is_valid:
+        return error_response(error_msg)
+
+    event_key = request.args.get("event_key", type=str)
+    session_name = request.args.get("session_name", type=str)
+
+    if not all([year, event_key, session_name, request.args.get("laps")]):
+        return error_response(
+            "Year, event_key, session_name and laps parameters are required."
+        )
+
+    try:
+        selection = _parse_lap_selection(request.args.get("laps"))
+    except ValueError as e:
+        return error_response(str(e))
+    if not selection or len(selection) > MAX_COMPARED_LAPS:
+        return error_response(
+            f"Between 1 and {MAX_COMPARED_LAPS} driver laps can be compared."
+        )
+
+    try:
+        if year < 2018:
+            return error_response(
+                "High-resolution telemetry is not available for seasons before 2018.",
+                400,
+            )
+
+        session = load_session(year, event_key, session_name)
+        # Corners come from the stored layout; only building a new one loads
+        # telemetry, which FastF1 uses to place the corner markers
+        layout = circuits.circuit_info(session, year)
+        if not layout or not layout["corners"]:
+            return error_response("No corner data for this circuit.", 404)
+        corners = sorted(layout["corners"], key=lambda c: c["distance"])
+        apexes = np.array([c["distance"] for c in corners])
+        key = sessions.session_key(session, year)
+
+        reference = None
+        drivers = []
+        for driver_number, lap_number in selection:
+            lap = _pick_lap(session.laps, driver_number, lap_number)
+            if lap is None:
+                label = lap_number if lap_number is not None else "fastest"
+                return error_response(
+                    f"No data for Driver {driver_number} Lap {label}.", 404
+                )
+            number = int(lap["LapNumber"])
+            metrics = sessions.cached_result(
+                (key, str(lap["DriverNumber"]), number),
+                "corner_analysis",
+                lambda: _lap_corners(session, year, lap, apexes),
+            )
+            if metrics is None:
+                return error_response(
+                    f"No telemetry for Driver {driver_number} Lap {number}.", 404
+                )
+            corner_time = np.array(metrics["time"], dtype=float)
+            if reference is None:
+                reference = corner_time
+
+            info = session.get_driver(driver_number)
+            drivers.append(
+                {
+                    "driver_number": driver_number,
+                    "abbreviation": str(info["Abbreviation"]),
+                    "team_color": (
+                        str(info["TeamColor"]) if "TeamColor" in info else None
+                    ),
+                    "lap": _format_lap_entry(lap, driver_number),
+                    "metrics": metrics,
+                    "time_delta": _rounded(corner_time - reference, 3),
+                }
+            )
+
+        return (
+            jsonify(
+                {
+                    "corners": [
+                        {"number": c["number"], "distance": c["distance"]}
+                        for c in corners
+                    ],
+                    "drivers": drivers,
+                }
+            ),
+            200,
+        )
+    except Exception as e:
+        print(f"[TELEMETRY] Corner analysis error: {e}", file=sys.stderr)
+        traceback.print_exc()
+        return error_response(f"An error occurred: {str(e)}", 500)
+
+
+def _stint_lap_lines(driver_number, laps, car, points):
+    """Yield one NDJSON line per lap, slicing the car data in one pass."""
+    session_time = car["SessionTime"].dt.total_seconds().to_numpy()
+    starts = laps["LapStartTime"].dt.total_seconds().to_numpy()
+    ends = laps["Time"].dt.total_seconds().to_numpy()
+    valid = ~(np.isnan(starts) | np.isnan(ends))
+    lo = np.searchsorted(session_time, np.where(valid, starts, 0), side="left")
+    hi = np.searchsorted(session_time, np.where(valid, ends, 0), side="right")
+
+    channels = {
+        "speed": car["Speed"].to_numpy(dtype=float),
+        "throttle": car["Throttle"].to_numpy(dtype=float),
+        "brake": car["Brake"].to_numpy(dtype=float),
+        "n_gear": car["nGear"].to_numpy(dtype=float),
+        "rpm": car["RPM"].to_numpy(dtype=float),
+        "drs": (car["DRS"].to_numpy(dtype=float) >= 10).astype(float),
+    }
+    digits = {"speed": 1, "throttle": 1, "rpm": 0}
+
+    for i, (_, lap) in enumerate(laps.iterrows()):
+        entry = _format_lap_entry(lap, driver_number)
+        if not valid[i] or hi[i] - lo[i] < 2:
+            entry["telemetry"] = None
+            yield json.dumps(entry) + "\n"
+            continue
+
+        window = slice(lo[i], hi[i])
+        elapsed = session_time[window] - starts[i]
+        speed_ms = channels["speed"][window] / 3.6
+        distance = np.concatenate(
+            [[0.0], np.cumsum(np.diff(elapsed) * (speed_ms[1:] + speed_ms[:-1]) / 2)]
+        )
+
+        idx = np.arange(elapsed.size)
+        if points and elapsed.size > points:
+            idx = np.linspace(0, elapsed.size - 1, points).round().astype(int)
+            idx = np.unique(idx)
+
+        telemetry = {
+            "time": _rounded(elapsed[idx], 3),
+            "distance": _rounded(distance[idx], 1),
+        }
+        for name, values in channels.items():
+            telemetry[name] = _rounded(values[window][idx], digits.get(name, 0))
+        entry["telemetry"] = telemetry
+        yield json.dumps(entry) + "\n"
+
+
+@telemetry_bp.route("/stint-telemetry", methods=["GET"])
+@offload("telemetry")
+def get_stint_telemetry():
+    """Stream every lap of a stint (or lap range) as NDJSON, one lap per line.
+
+    Pass `stint`, or `lap_start`/`lap_end`. `points` optionally downsamples
+    each lap to at most that many samples.
+    """
+    year = request.args.get("year", type=int)
+    is_valid, error_msg = validate_year(year)
+    if not is_valid:
+        return error_response(error_msg)
+
+    event_key = request.args.get("event_key", type=str)
+    session_name = request.args.get("session_name", type=str)
+    driver_number = request.args.get("driver_number", type=str)
+    stint = request.args.get("stint", type=int)
+    lap_start = request.args.get("lap_start", type=int)
+    lap_end = request.args.get("lap_end", type=int)
+    points = request.args.get("points", type=int)
+
+    if not all([year, event_key, session_name, driver_number]):
+        return error_response(
+            "Year, event_key, session_name and driver_number parameters are required."
+        )
+    if stint is None and lap_start is None:
+        return error_response("Either stint or lap_start/lap_end is required.")
+
+    try:
+        if year < 2018:
+            return error_response(
+                "High-resolution telemetry is not available for seasons before 2018.",
+                400,
+            )
+
+        session = load_session(year, event_key, session_name, telemetry=True)
+
+        laps = session.laps.pick_drivers(driver_number)
+        if stint is not None:
+            laps = laps[laps["Stint"] == stint]
+        else:
+            lap_end = lap_end if lap_end is not None else lap_start
+            laps = laps[laps["LapNumber"].between(lap_start, lap_end)]
+        if laps.empty:
+            return error_response(f"No laps found for Driver {driver_number}.", 404)
+
+        # Car data is keyed by number; the request may name an abbreviation
+        car = session.car_data.get(str(laps["DriverNumber"].iloc[0]))
+        if car is None or car.empty:
+            return error_response(f"No telemetry for Driver {driver_number}.", 404)
+
+        laps = laps.sort_values("LapNumber")
+        lines = _stint_lap_lines(driver_number, laps, car, points)
+        return Response(lines, mimetype="application/x-ndjson")
+    except Exception as e:
+        print(f"[TELEMETRY] Stint telemetry error: {e}", file=sys.stderr)
+        traceback.print_exc()
+        return error_response(f"An error occurred: {str(e)}", 500)
+
+
 @telemetry_bp.route("/race-summary", methods=["GET"])
+@offload("session")
 def get_race_summary():
     year = request.args.get("year", type=int)
     is_valid, error_msg = validate_year(year)
@@ -619,15 +1116,31 @@ def get_race_summary():
                 200,
             )
 
-        session = fastf1.get_session(year, event_key, session_name)
-
         # Check if it's any qualifying type session (Qualifying, Shootout, Qualy)
         is_quali = any(
             k in session_name.lower() for k in ["qualifying", "shootout", "qualy"]
         )
 
+        # While the live feed streams this session, answer from its state
+        feed = live.feed_for(
+            fastf1.get_session(year, event_key, session_name), year
+        )
+        if feed is not None:
+            return (
+                jsonify(
+                    {
+                        "results": feed.summary_rows(),
+                        "total_laps": feed.lap_count()["current"],
+                        "available_phases": [],
+                        "track_status_events": feed.status_events(),
+                        "live": True,
+                    }
+                ),
+                200,
+            )
+
         # Load with messages=True for quali to get results (classification)
-        session.load(telemetry=False, weather=False, messages=is_quali)
+        session = load_session(year, event_key, session_name, messages=is_quali)
 
         results = session.results
         laps = session.laps
@@ -646,7 +1159,11 @@ def get_race_summary():
                     or results["BestLapTime"].isna().all()
                 ):
                     if not laps.empty:
-                        best_times = laps.groupby("Driver")["LapTime"].min().to_dict()
+                        best_times = (
+                            laps.groupby("Driver", observed=True)["LapTime"]
+                            .min()
+                            .to_dict()
+                        )
                         results["BestLapTime"] = results["Abbreviation"].map(best_times)
 
                 if (
@@ -0,0 +1,301 @@
+"""Championship scenario evaluation.
+
+Works out, for a standings table and the points still on offer, the best and
+worst final position every entrant can still reach and what the leader needs
+to clinch the title.
+
+Enumerating every finishing order of every remaining session is hopeless, so
+the evaluator first computes cheap lower/upper bounds for the whole field at
+once with numpy broadcasting. Only entrants whose bounds disagree fall back to
+a closer look: a greedy finishing order for the best case, and an exact,
+budgeted search for the worst case that falls back to the conservative bound
+when the budget runs out. Ties on points are resolved in the entrant's
+favour because countback depends on results we cannot predict.
+"""
+
+from functools import lru_cache
+from itertools import combinations
+import numpy as np
+
+RACE_POINTS_2010 = (25, 18, 15, 12, 10, 8, 6, 4, 2, 1)
+RACE_POINTS_2003 = (10, 8, 6, 5, 4, 3, 2, 1)
+RACE_POINTS_1991 = (10, 6, 4, 3, 2, 1)
+SPRINT_POINTS_2022 = (8, 7, 6, 5, 4, 3, 2, 1)
+SPRINT_POINTS_2021 = (3, 2, 1)
+# Search nodes the exact worst-case search may spend per entrant
+SEARCH_BUDGET = 5000
+
+
+def points_system(year):
+    """Return (race_points, sprint_points, fastest_lap_bonus) for a season."""
+    if year >= 2010:
+        race = RACE_POINTS_2010
+    elif year >= 2003:
+        race = RACE_POINTS_2003
+    else:
+        race = RACE_POINTS_1991
+
+    if year >= 2022:
+        sprint = SPRINT_POINTS_2022
+    elif year == 2021:
+        sprint = SPRINT_POINTS_2021
+    else:
+        sprint = ()
+
+    fastest_lap = 1 if 2019 <= year <= 2024 else 0
+    return race, sprint, fastest_lap
+
+
+def build_round_sessions(year, has_sprint):
+    """Return the scoring sessions of one round as tuples of slot values.
+
+    The fastest lap bonus is modelled as its own single-slot session since it
+    can go to any driver regardless of where they finish.
+    """
+    race, sprint, fastest_lap = points_system(year)
+    sessions = [tuple(float(p) for p in race)]
+    if has_sprint and sprint:
+        sessions.append(tuple(float(p) for p in sprint))
+    if fastest_lap:
+        sessions.append((float(fastest_lap),))
+    return tuple(sessions)
+
+
+def _max_gain(sessions, cars, skip=0):
+    """Points one entrant can collect from its best `cars` slots per session."""
+    return float(sum(sum(slots[skip : skip + cars]) for slots in sessions))
+
+
+def _best_case_ahead(i, points, sessions, cars):
+    """Count rivals that still finish ahead of `i` when `i` wins everything.
+
+    Slots left over once `i` has taken its share are handed out greedily:
+    rivals that are ahead anyway soak up points first, then the rival with
+    the most headroom, and only if nobody can absorb a slot is the rival
+    closest to overtaking sacrificed.
+    """
+    others = np.flatnonzero(np.arange(len(points)) != i)
+    target = points[i] + _max_gain(sessions, cars)
+    headroom = target - points[others]
+    ahead = headroom < 0
+
+    for slots in sessions:
+        used = np.zeros(len(others), dtype=int)
+        for value in slots[cars:]:
+            open_ = used < cars
+            if not open_.any():
+                break
+            pool = open_ & ahead
+            if pool.any():
+                j = np.flatnonzero(pool)[0]
+            else:
+                fits = open_ & (headroom >= value)
+                if fits.any():
+                    candidates = np.flatnonzero(fits)
+                    j = candidates[np.argmax(headroom[candidates])]
+                else:
+                    candidates = np.flatnonzero(open_)
+                    j = candidates[np.argmin(headroom[candidates])]
+            headroom[j] -= value
+            used[j] += 1
+            ahead[j] = ahead[j] or headroom[j] < 0
+
+    return int(ahead.sum())
+
+
+class _BudgetExceeded(Exception):
+    pass
+
+
+@lru_cache(maxsize=4096)
+def _combinations(slots, cars):
+    """Distinct (indices, total) ways to take up to `cars` of `slots`."""
+    seen = set()
+    options = []
+    for k in range(cars + 1):
+        for combo in combinations(range(len(slots)), k):
+            values = tuple(slots[c] for c in combo)
+            if values not in seen:
+                seen.add(values)
+                options.append((frozenset(combo), sum(values)))
+    return tuple(options)
+
+
+def _session_options(slots, cars, remaining):
+    """Ways to take up to `cars` slots of one session, best fit first.
+
+    Combinations that cover `remaining` come first, smallest total first;
+    the rest follow largest total first.
+    """
+    return sorted(
+        _combinations(tuple(slots), cars),
+        key=lambda o: (o[1] <= remaining, o[1] if o[1] > remaining else -o[1]),
+    )
+
+
+def _can_all_pass(needs, sessions, cars, budget):
+    """Whether every rival can gain strictly more than its `need` at once.
+
+    Depth-first search over slot assignments, hardest rival first, taking at
+    most `cars` slots per session for each rival. Raises _BudgetExceeded once
+    `budget[0]` search nodes are spent.
+    """
+    available = [list(slots) for slots in sessions]
+    # Most one rival can still take from each session
+    tops = [sum(slots[:cars]) for slots in available]
+    needs = sorted(needs, reverse=True)
+
+    def assign(r):
+        if r == len(needs):
+            return True
+        if sum(map(sum, available)) <= sum(needs[r:]):
+            return False
+        return pick(r, 0, 0.0)
+
+    def pick(r, s, gained):
+        budget[0] -= 1
+        if budget[0] < 0:
+            raise _BudgetExceeded
+        if gained > needs[r]:
+            return assign(r + 1)
+        if s == len(available) or gained + sum(tops[s:]) <= needs[r]:
+            return False
+        slots, top = available[s], tops[s]
+        for combo, value in _session_options(slots, cars, needs[r] - gained):
+            available[s] = [v for k, v in enumerate(slots) if k not in combo]
+            tops[s] = sum(available[s][:cars])
+            try:
+                if pick(r, s + 1, gained + value):
+                    return True
+            finally:
+                available[s], tops[s] = slots, top
+        return False
+
+    return assign(0)
+
+
+def _worst_case_ahead(i, points, sessions, cars):
+    """Count rivals that can all finish ahead of `i` when `i` scores nothing.
+
+    If some set of k rivals can pass `i`, so can the k closest behind, so the
+    answer is found by binary search over k with an exact assignment search
+    for each k. When the search runs out of budget (many rounds left) the
+    count falls back to an upper bound, so the worst position is never
+    reported better than it can be.
+    """
+    others = np.flatnonzero(np.arange(len(points)) != i)
+    need = points[i] - points[others]
+    ahead = int((need < 0).sum())
+    max_gain = _max_gain(sessions, cars)
+    candidates = np.sort(need[(need >= 0) & (need < max_gain)])
+
+    # Together the passing rivals must gain more than the sum of their needs
+    total = sum(map(sum, sessions))
+    lo, hi = 0, int((np.cumsum(candidates) < total).sum())
+    budget = [SEARCH_BUDGET]
+    try:
+        while lo < hi:
+            k = (lo + hi + 1) // 2
+            if _can_all_pass(candidates[:k].tolist(), sessions, cars, budget):
+                lo = k
+            else:
+                hi = k - 1
+    except _BudgetExceeded:
+        return ahead + hi
+    return ahead + lo
+
+
+@lru_cache(maxsize=128)
+def evaluate(points, sessions, cars=1):
+    """Evaluate best/worst reachable positions for a standings state.
+
+    `points` is a tuple of current points, `sessions` a tuple of slot-value
+    tuples for every remaining scoring session and `cars` the number of
+    scoring cars per entrant (1 for drivers, 2 for constructors). Results are
+    memoized per standings state.
+    """
+    pts = np.asarray(points, dtype=float)
+    n = len(pts)
+    if n == 0:
+        return ()
+
+    gain = _max_gain(sessions, cars)
+    rest_gain = _max_gain(sessions, cars, skip=cars)
+    others = ~np.eye(n, dtype=bool)
+    final_max = pts + gain
+
+    # Best case for i: i takes the top slots, rivals share what is left.
+    must_ahead = (pts[None, :] > final_max[:, None]) & others
+    may_ahead = ((pts + rest_gain)[None, :] > final_max[:, None]) & others
+    best_lo = 1 + must_ahead.sum(axis=1)
+    best_hi = 1 + may_ahead.sum(axis=1)
+
+    # Worst case for i: i scores nothing, everybody else may score.
+    already_ahead = (pts[None, :] > pts[:, None]) & others
+    can_pass = (final_max[None, :] > pts[:, None]) & others
+    worst_lo = 1 + already_ahead.sum(axis=1)
+    worst_hi = 1 + can_pass.sum(axis=1)
+
+    results = []
+    for i in range(n):
+        best = int(best_lo[i])
+        if best_lo[i] != best_hi[i]:
+            best = 1 + _best_case_ahead(i, pts, sessions, cars)
+        worst = int(worst_lo[i])
+        if worst_lo[i] != worst_hi[i]:
+            worst = 1 + _worst_case_ahead(i, pts, sessions, cars)
+        results.append(
+            {
+                "max_points": float(final_max[i]),
+                "best_position": best,
+                "worst_position": worst,
+            }
+        )
+    return tuple(results)
+
+
+def clinch_conditions(points, names, round_sessions, cars=1):
+    """Describe what the leader needs to clinch the title.
+
+    `points` and `names` must be sorted by standings position and
+    `round_sessions` holds the scoring sessions of each remaining round in
+    calendar order.
+    """
+    if not points:
+        return None
+
+    leader_points = float(points[0])
+    remaining = sum(_max_gain(sessions, cars) for sessions in round_sessions)
+    rivals = [
+        (name, float(p))
+        for name, p in zip(names[1:], points[1:])
+        if float(p) + remaining >= leader_points
+    ]
+
+    clinch = {
+        "leader": names[0],
+        "points": leader_points,
+        "points_remaining": remaining,
+        "clinched": not rivals,
+        "can_clinch_next_round": False,
+        "rivals": [],
+    }
+    if not rivals or not round_sessions:
+        return clinch
+
+    next_gain = _max_gain(round_sessions[0], cars)
+    remaining_after = remaining - next_gain
+    for name, p in rivals:
+        clinch["rivals"].append(
+            {
+                "name": name,
+                "points": p,
+                "deficit": leader_points - p,
+                # Leader must outscore this rival by at least this much next round
+                "must_outscore_by": max(0.0, p + remaining_after - leader_points + 1),
+            }
+        )
+    clinch["can_clinch_next_round"] = all(
+        r["must_outscore_by"] <= next_gain for r in clinch["rivals"]
+    )
+    return clinch
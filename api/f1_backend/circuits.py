@@ -0,0 +1,294 @@
+"""Circuit layout store shared by every session held at a circuit.
+
+Circuit metadata (corners, marshal sectors and lights, rotation) and
+geometry derived from a session (the track outline) depend on the circuit
+layout, not on the session or year, so they are stored per layout under the
+data directory and reused by every endpoint:
+
+- `layouts/<layout>.json` holds everything known about one layout,
+- `index.json` maps "<location>|<year>" to a layout, so a request can find
+  its layout without loading the session.
+
+A season missing from the index is matched against the stored layouts at
+its location by corner numbers and positions, which FastF1 provides without
+telemetry; telemetry is only loaded when no stored layout matches.
+
+A layout key is the circuit location plus a fingerprint of its corner
+table (number of corners, approximate lap length), which changes when the
+track is reconfigured.
+"""
+
+from functools import lru_cache
+import json
+import os
+import re
+import sys
+import threading
+import numpy as np
+from . import sessions
+from .utils import data_path
+
+# Corner distances move a little between years; round the lap length coarsely
+LAYOUT_LENGTH_STEP_M = 200
+# Corners within this distance of a stored layout's match it (1/10 m units)
+LAYOUT_MATCH_TOLERANCE = 200
+
+_lock = threading.Lock()
+_index = None
+_layouts = {}
+
+
+def _slug(text):
+    return re.sub(r"[^a-z0-9]+", "-", str(text).lower()).strip("-")
+
+
+def _read_json(path, default):
+    try:
+        with open(path) as handle:
+            return json.load(handle)
+    except (FileNotFoundError, ValueError):
+        return default
+
+
+def _write_json(path, value):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as handle:
+        json.dump(value, handle)
+    os.replace(tmp, path)
+
+
+def _load_index():
+    global _index
+    if _index is None:
+        _index = _read_json(data_path("circuits", "index.json"), {})
+    return _index
+
+
+def layout_key(location, circuit_info):
+    """Identify a layout from the circuit's location and corner table."""
+    corners = circuit_info.corners
+    length = float(corners["Distance"].max()) if len(corners) else 0.0
+    steps = int(round(length / LAYOUT_LENGTH_STEP_M))
+    return f"{_slug(location)}-{len(corners)}t-{steps}"
+
+
+def layout_for(location, year):
+    """The layout key recorded for a circuit in a season, if any."""
+    with _lock:
+        return _load_index().get(f"{_slug(location)}|{year}")
+
+
+def remember_layout(location, year, key):
+    with _lock:
+        index = _load_index()
+        entry = f"{_slug(location)}|{year}"
+        if index.get(entry) == key:
+            return
+        # Re-read so concurrent workers don't drop each other's entries
+        index.update(_read_json(data_path("circuits", "index.json"), {}))
+        index[entry] = key
+        _write_json(data_path("circuits", "index.json"), index)
+
+
+def get_layout(key):
+    with _lock:
+        if key not in _layouts:
+            layout = _read_json(data_path("circuits", "layouts", f"{key}.json"), None)
+            if layout is None:
+                return None
+            _layouts[key] = layout
+        return _layouts[key]
+
+
+def update_layout(key, **fields):
+    """Merge fields into a layout and persist it."""
+    with _lock:
+        path = data_path("circuits", "layouts", f"{key}.json")
+        layout = {
+            **_read_json(path, {}),
+            **_layouts.get(key, {}),
+            **fields,
+            "key": key,
+        }
+        _write_json(path, layout)
+        _layouts[key] = layout
+    _simplified.cache_clear()
+    return layout
+
+
+def _letter(value):
+    return value if isinstance(value, str) else ""
+
+
+def corner_table(circuit_info):
+    """JSON-friendly corner markers from a FastF1 CircuitInfo."""
+    corners = circuit_info.corners
+    return [
+        {
+            "number": f"{int(c['Number'])}{_letter(c.get('Letter'))}",
+            "x": float(c["X"]),
+            "y": float(c["Y"]),
+            "angle": float(c["Angle"]),
+            "distance": float(c["Distance"]),
+        }
+        for _, c in corners.iterrows()
+    ]
+
+
+def _marker_table(markers):
+    if markers is None:
+        return []
+    return [
+        {
+            "number": f"{int(m['Number'])}{_letter(m.get('Letter'))}",
+            "x": float(m["X"]),
+            "y": float(m["Y"]),
+            "distance": float(m["Distance"]),
+        }
+        for _, m in markers.iterrows()
+    ]
+
+
+def _has_distances(info):
+    return bool(info.corners["Distance"].notna().all())
+
+
+def match_layout(location, circuit_info):
+    """A stored layout at `location` with the same corners, if any.
+
+    Only corner numbers and positions are compared, so `circuit_info` may
+    come from a session loaded without telemetry.
+    """
+    corners = circuit_info.corners
+    numbers = [
+        f"{int(c['Number'])}{_letter(c.get('Letter'))}" for _, c in corners.iterrows()
+    ]
+    xy = corners[["X", "Y"]].to_numpy(dtype=float)
+    pattern = re.compile(rf"{re.escape(_slug(location))}-{len(corners)}t-\d+")
+    for name in sorted(os.listdir(data_path("circuits", "layouts", ""))):
+        key, ext = os.path.splitext(name)
+        if ext != ".json" or not pattern.fullmatch(key):
+            continue
+        stored = (get_layout(key) or {}).get("corners")
+        if not stored or [c["number"] for c in stored] != numbers:
+            continue
+        offsets = xy - np.array([[c["x"], c["y"]] for c in stored])
+        if np.hypot(offsets[:, 0], offsets[:, 1]).max() <= LAYOUT_MATCH_TOLERANCE:
+            return get_layout(key)
+    return None
+
+
+def _complete(layout):
+    return bool(layout) and "corners" in layout and "marshal_sectors" in layout
+
+
+def circuit_info(session, year):
+    """Cached corners, marshal sectors/lights and rotation for a session.
+
+    Served from the location|year index when this season's layout is known;
+    otherwise `session` must be loaded so FastF1 can fetch its circuit info,
+    which is then stored for every later caller. FastF1 places the markers
+    along the fastest lap's telemetry, so a session loaded without it is
+    matched against the stored layouts first and only reloaded with
+    telemetry when none matches.
+    """
+    location = session.event["Location"]
+    key = layout_for(location, year)
+    layout = get_layout(key) if key else None
+    if _complete(layout):
+        return layout
+
+    info = session.get_circuit_info()
+    if info is not None and not _has_distances(info):
+        layout = match_layout(location, info)
+        if _complete(layout):
+            remember_layout(location, year, layout["key"])
+            return layout
+        session = sessions.load(session, year, telemetry=True)
+        info = session.get_circuit_info()
+    if info is None:
+        return None
+    if not _has_distances(info):
+        raise ValueError("No corner distances available for this circuit.")
+    key = layout_key(location, info)
+    layout = update_layout(
+        key,
+        corners=corner_table(info),
+        marshal_sectors=_marker_table(info.marshal_sectors),
+        marshal_lights=_marker_table(info.marshal_lights),
+        rotation=float(info.rotation),
+    )
+    remember_layout(location, year, key)
+    return layout
+
+
+def turns(session, year):
+    """Turn numbers and distances for telemetry charts, [] if unavailable."""
+    try:
+        layout = circuit_info(session, year)
+    except Exception as e:
+        print(f"[CIRCUIT] No circuit info: {e}", file=sys.stderr)
+        return []
+    if not layout:
+        return []
+    return [
+        {"number": c["number"], "distance": c["distance"]} for c in layout["corners"]
+    ]
+
+
+# --- Outline simplification ---
+
+
+def simplify(points, tolerance):
+    """Ramer-Douglas-Peucker simplification of an (n, 2) polyline."""
+    n = len(points)
+    if n < 3:
+        return points
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        a, b = stack.pop()
+        if b - a < 2:
+            continue
+        segment = points[b] - points[a]
+        rel = points[a + 1 : b] - points[a]
+        norm = np.hypot(*segment)
+        if norm == 0:
+            # Closed loops start and end on the same point
+            dist = np.hypot(rel[:, 0], rel[:, 1])
+        else:
+            dist = np.abs(segment[0] * rel[:, 1] - segment[1] * rel[:, 0]) / norm
+        i = int(np.argmax(dist))
+        if dist[i] > tolerance:
+            k = a + 1 + i
+            keep[k] = True
+            stack.extend([(a, k), (k, b)])
+    return points[keep]
+
+
+def outline_from_position(pos):
+    """Closed outline (1/10 m units) from a lap's position data."""
+    xy = pos[["X", "Y"]].to_numpy(dtype=float)
+    xy = xy[~np.isnan(xy).any(axis=1)]
+    if len(xy) < 3:
+        return None
+    moved = np.any(np.diff(xy, axis=0) != 0, axis=1)
+    xy = xy[np.concatenate([[True], moved])]
+    if not np.array_equal(xy[0], xy[-1]):
+        xy = np.vstack([xy, xy[:1]])
+    return xy.round(1).tolist()
+
+
+@lru_cache(maxsize=256)
+def _simplified(key, tolerance_m):
+    layout = get_layout(key)
+    if not layout or not layout.get("outline"):
+        return None
+    # FastF1 positions are in 1/10 m
+    points = simplify(np.asarray(layout["outline"]), tolerance_m * 10)
+    return points.round(1).tolist()
+
+
+def simplified_outline(key, tolerance_m):
+    return _simplified(key, float(tolerance_m))
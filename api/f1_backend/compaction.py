@@ -0,0 +1,131 @@
+"""Compact dtypes for cached session frames.
+
+FastF1 hands back float64 columns, object-dtype strings and nanosecond
+timedeltas everywhere. Before a session is cached its frames are compacted:
+
+- float64 becomes float32 when the round trip stays within a millimetre /
+  millisecond, and integers are downcast to the smallest type that fits,
+- repeated strings (`Driver`, `Compound`, `Team`, `TrackStatus`, ...) become
+  categoricals,
+- timedeltas are stored as int32 milliseconds.
+
+FastF1's own slicing (e.g. `Lap.get_telemetry()`) needs real timedeltas, so
+`expand_times()` widens the millisecond columns again on the per-request
+copies handed out by `sessions`; the cached frame itself stays compact.
+"""
+
+import numpy as np
+import pandas as pd
+
+MS_ATTR = "f1_ms_columns"
+NAT_MS = np.iinfo(np.int32).min
+FLOAT32_TOLERANCE = 1e-3
+
+# String columns converted to categoricals, per FastF1 session attribute
+CATEGORY_COLUMNS = {
+    "_laps": ("Driver", "Team", "Compound", "TrackStatus"),
+    "_track_status": ("Status", "Message"),
+    "_session_status": ("Status",),
+}
+
+
+def _frame_bytes(frame):
+    return int(frame.memory_usage(deep=True, index=True).sum())
+
+
+def _to_ms(values):
+    """Convert a timedelta64 array to int32 ms, or None if it won't fit."""
+    nat = np.isnat(values)
+    ns = values.astype("m8[ns]").view(np.int64)
+    ms = (ns + 500_000) // 1_000_000
+    valid = ms[~nat]
+    if valid.size and (
+        valid.min() <= NAT_MS or valid.max() > np.iinfo(np.int32).max
+    ):
+        return None
+    return np.where(nat, NAT_MS, ms).astype(np.int32)
+
+
+def compact_frame(frame, categories=()):
+    """Return a compacted shallow copy of `frame`."""
+    out = frame.copy(deep=False)
+    ms_columns = []
+
+    for col in frame.columns:
+        series = frame[col]
+        dtype = series.dtype
+        if not isinstance(dtype, np.dtype):
+            continue
+
+        if dtype.kind == "m":
+            ms = _to_ms(series.to_numpy())
+            if ms is not None:
+                out[col] = ms
+                ms_columns.append(col)
+        elif dtype == np.float64:
+            values = series.to_numpy()
+            compact = values.astype(np.float32)
+            finite = np.isfinite(values)
+            if not finite.any() or (
+                np.abs(compact[finite] - values[finite]).max() <= FLOAT32_TOLERANCE
+            ):
+                out[col] = compact
+        elif dtype.kind in "iu":
+            out[col] = pd.to_numeric(series, downcast="integer").to_numpy()
+        elif dtype == object and col in categories:
+            out[col] = series.astype("category").array
+
+    if ms_columns:
+        out.attrs[MS_ATTR] = ms_columns
+    return out
+
+
+def expand_times(frame):
+    """Widen int32 ms columns of a compact frame back to timedelta64, in place."""
+    ms_columns = frame.attrs.get(MS_ATTR)
+    if not ms_columns:
+        return frame
+
+    for col in ms_columns:
+        if col not in frame.columns:
+            continue
+        values = np.asarray(frame[col]).astype(np.int64)
+        ns = np.where(values == NAT_MS, np.iinfo(np.int64).min, values * 1_000_000)
+        frame[col] = ns.view("m8[ns]")
+
+    frame.attrs = {k: v for k, v in frame.attrs.items() if k != MS_ATTR}
+    return frame
+
+
+def compact_snapshot(snapshot):
+    """Compact every frame of a session snapshot and report the savings."""
+    before = after = 0
+    attrs = {}
+
+    for name, value in snapshot["attrs"].items():
+        if isinstance(value, pd.DataFrame):
+            compact = compact_frame(value, CATEGORY_COLUMNS.get(name, ()))
+            before += _frame_bytes(value)
+            after += _frame_bytes(compact)
+            attrs[name] = compact
+        elif (
+            isinstance(value, dict)
+            and value
+            and all(isinstance(v, pd.DataFrame) for v in value.values())
+        ):
+            compact = {}
+            for key, frame in value.items():
+                compact[key] = compact_frame(frame)
+                before += _frame_bytes(frame)
+                after += _frame_bytes(compact[key])
+            attrs[name] = compact
+        else:
+            attrs[name] = value
+
+    report = {
+        "bytes_before": before,
+        "bytes_after": after,
+        "bytes_saved": before - after,
+        "ratio": round(after / before, 3) if before else None,
+    }
+    return {**snapshot, "attrs": attrs, "compaction": report}
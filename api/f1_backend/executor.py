@@ -0,0 +1,230 @@
+"""Bounded admission control for heavy FastF1 work.
+
+Cold `session.load(telemetry=True)` calls can take tens of seconds and a lot
+of memory. Heavy routes run their view on a small named pool per endpoint
+class, which caps how many of them do that work at once and how many may
+wait for a slot.
+
+The WSGI thread that accepted a heavy request waits for the pool to finish,
+so every request in flight on a pool (running or queued) holds one server
+thread. Admission therefore counts those requests across all pools and
+answers 503 straight away once they would take more than
+`F1_SERVER_THREADS - F1_RESERVED_THREADS` threads, leaving the reserved
+threads free for cheap routes. Each pool also rejects beyond its own
+workers + queue. A request that must not hold its WSGI thread at all can opt
+into job mode (`?async=1`, see `jobs.py`) to get a 202 and poll for the
+result.
+
+Pool sizes can be overridden with `F1_POOL_<NAME>_WORKERS` and
+`F1_POOL_<NAME>_QUEUE` environment variables.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+import os
+import sys
+import threading
+from flask import copy_current_request_context, request
+from .utils import error_response
+
+# Endpoint class -> (max concurrent workers, max queued requests)
+POOL_LIMITS = {
+    "telemetry": (2, 4),
+    "session": (4, 8),
+}
+
+# Request threads the WSGI server runs (e.g. gunicorn --threads), and how
+# many of them heavy routes must leave free for everything else
+SERVER_THREADS = 16
+RESERVED_THREADS = 4
+
+
+class PoolSaturatedError(Exception):
+    """Raised when a pool or the thread budget is full and the request is rejected."""
+
+
+class _Pool:
+    def __init__(self, name, workers, max_queue):
+        self.name = name
+        self.workers = workers
+        self.max_queue = max_queue
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix=f"f1-{name}"
+        )
+        self.lock = threading.Lock()
+        self.queued = 0
+        self.active = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def submit(self, fn, *args, **kwargs):
+        with self.lock:
+            if self.queued + self.active >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise PoolSaturatedError(
+                    f"The {self.name} pool is saturated, please retry shortly."
+                )
+            self.queued += 1
+
+        def run():
+            with self.lock:
+                self.queued -= 1
+                self.active += 1
+            try:
+                result = fn(*args, **kwargs)
+            except Exception:
+                with self.lock:
+                    self.failed += 1
+                raise
+            finally:
+                with self.lock:
+                    self.active -= 1
+                    self.completed += 1
+            return result
+
+        return self.executor.submit(run)
+
+    def stats(self):
+        with self.lock:
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "active": self.active,
+                "queued": self.queued,
+                "in_flight": self.queued + self.active,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+            }
+
+
+class _Admission:
+    """Requests holding a WSGI thread while they run or wait on a pool."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.rejected = 0
+
+    def enter(self):
+        with self.lock:
+            if self.in_flight >= self.limit:
+                self.rejected += 1
+                raise PoolSaturatedError(
+                    "Too many heavy requests in progress, please retry shortly."
+                )
+            self.in_flight += 1
+
+    def leave(self):
+        with self.lock:
+            self.in_flight -= 1
+
+    def stats(self):
+        with self.lock:
+            return {
+                "limit": self.limit,
+                "in_flight": self.in_flight,
+                "rejected": self.rejected,
+            }
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+_admission = None
+
+
+def _env_int(name, default):
+    try:
+        return max(1, int(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+def get_admission():
+    """Return the process-wide heavy request budget, creating it on first use."""
+    global _admission
+    with _pools_lock:
+        if _admission is None:
+            threads = _env_int("F1_SERVER_THREADS", SERVER_THREADS)
+            reserved = _env_int("F1_RESERVED_THREADS", RESERVED_THREADS)
+            _admission = _Admission(max(1, threads - reserved))
+        return _admission
+
+
+def get_pool(name):
+    """Return the named pool, creating it on first use."""
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None:
+            workers, max_queue = POOL_LIMITS.get(name, (2, 8))
+            key = name.upper()
+            pool = _Pool(
+                name,
+                _env_int(f"F1_POOL_{key}_WORKERS", workers),
+                _env_int(f"F1_POOL_{key}_QUEUE", max_queue),
+            )
+            _pools[name] = pool
+        return pool
+
+
+def submit(pool_name, fn, *args, **kwargs):
+    """Submit `fn` to a named pool and return its Future."""
+    return get_pool(pool_name).submit(fn, *args, **kwargs)
+
+
+def pool_stats():
+    """Snapshot of queue depth and counters for every pool in use."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return {pool.name: pool.stats() for pool in pools}
+
+
+def admission_stats():
+    """Heavy requests holding a server thread, against their limit."""
+    return get_admission().stats()
+
+
+def in_pool_thread():
+    return threading.current_thread().name.startswith("f1-")
+
+
+def offload(pool_name):
+    """Run a Flask view on a bounded pool, admitting at most its limits.
+
+    The request context is copied into the pool thread, so the view can keep
+    using `request` as usual. The calling WSGI thread blocks until the view
+    returns, so it counts against the process-wide thread budget for as long
+    as the request is running or queued; requests beyond that budget or the
+    pool's own limit are answered with 503 straight away.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            # Avoid deadlocking a pool by re-submitting from one of its threads
+            if in_pool_thread():
+                return view(*args, **kwargs)
+            admission = get_admission()
+            try:
+                admission.enter()
+            except PoolSaturatedError as e:
+                print(f"[EXECUTOR] Rejected {request.path}: {e}", file=sys.stderr)
+                return error_response(str(e), 503)
+            try:
+                future = submit(
+                    pool_name, copy_current_request_context(view), *args, **kwargs
+                )
+            except PoolSaturatedError as e:
+                print(f"[EXECUTOR] Rejected {request.path}: {e}", file=sys.stderr)
+                return error_response(str(e), 503)
+            else:
+                return future.result()
+            finally:
+                admission.leave()
+
+        wrapper.pool_name = pool_name
+        return wrapper
+
+    return decorator
@@ -0,0 +1,407 @@
+"""Opt-in background job mode for slow session loads.
+
+When a session is not in the FastF1 cache, `/lap-telemetry`, `/fastest-lap`
+and `/weekend-summary` can run past the serverless time limit. Clients can
+opt in with `?async=1` (or `Prefer: respond-async`, or F1_JOB_MODE=always on
+the server). If the request is then estimated to exceed the latency budget,
+it is answered with `202 Accepted` and a job id while the work carries on in
+the background; the client polls `/api/jobs/<id>` for the result.
+
+Jobs are kept in a local SQLite database under the data directory so any
+worker process can answer a poll. There is no external broker.
+"""
+
+from contextlib import closing, contextmanager
+from functools import wraps
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+import traceback
+import uuid
+import fastf1
+from flask import current_app, jsonify, request
+from . import executor, lap_store, season_store, sessions
+from .utils import data_path, error_response
+
+# Rough cost of a session.load in seconds, keyed by (cached, telemetry)
+LOAD_COST_SECONDS = {
+    (False, True): 25.0,
+    (False, False): 8.0,
+    (True, True): 4.0,
+    (True, False): 1.0,
+}
+# Slicing one lap with get_telemetry() and storing it (lap_store.store)
+LAP_SLICE_COST_SECONDS = 0.3
+DEFAULT_LATENCY_BUDGET = 8.0
+JOB_TTL_SECONDS = 24 * 60 * 60
+# Finished jobs over data that is still changing are only reused this long
+LIVE_JOB_TTL_SECONDS = 60
+CURRENT_SEASON_JOB_TTL_SECONDS = 60 * 60
+MAX_WAIT_SECONDS = 25.0
+
+_JOB_ENV_KEY = "f1.job_id"
+_PENDING = ("queued", "running")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    request_key TEXT NOT NULL,
+    path TEXT NOT NULL,
+    status TEXT NOT NULL,
+    status_code INTEGER,
+    result TEXT,
+    pid INTEGER,
+    created REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_request_key ON jobs (request_key);
+"""
+
+
+@contextmanager
+def _connect():
+    """Open the job database, committing on success and always closing."""
+    with closing(sqlite3.connect(data_path("jobs.sqlite3"), timeout=10)) as conn:
+        conn.row_factory = sqlite3.Row
+        conn.executescript(_SCHEMA)
+        with conn:
+            yield conn
+
+
+def _latency_budget():
+    try:
+        return float(os.environ.get("F1_LATENCY_BUDGET_S", DEFAULT_LATENCY_BUDGET))
+    except ValueError:
+        return DEFAULT_LATENCY_BUDGET
+
+
+def _job_mode_requested():
+    if os.environ.get("F1_JOB_MODE", "").lower() == "always":
+        return True
+    if request.args.get("async", "").lower() in ("1", "true", "yes"):
+        return True
+    return "respond-async" in request.headers.get("Prefer", "").lower()
+
+
+def _pid_alive(pid):
+    if not pid or pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass
+    return True
+
+
+def is_session_cached(session, telemetry=False):
+    """Best-effort check whether FastF1 already has a session on disk."""
+    cache_path = current_app.config.get("FASTF1_CACHE_PATH")
+    api_path = getattr(session, "api_path", None)
+    if not cache_path or not api_path:
+        return False
+
+    parts = [p for p in api_path.strip("/").split("/") if p]
+    candidates = [os.path.join(cache_path, *parts)]
+    if parts and parts[0] == "static":
+        candidates.append(os.path.join(cache_path, *parts[1:]))
+
+    for directory in candidates:
+        if not os.path.isdir(directory):
+            continue
+        files = os.listdir(directory)
+        if telemetry:
+            if "car_data.ff1pkl" in files and "position_data.ff1pkl" in files:
+                return True
+        elif any(f.endswith(".ff1pkl") for f in files):
+            return True
+    return False
+
+
+def estimate_session_load(session, year, telemetry=False):
+    """Estimated wall time of loading a single session, in seconds."""
+    if sessions.is_cached(session, year, telemetry):
+        return 0.0
+    return LOAD_COST_SECONDS[(is_session_cached(session, telemetry), telemetry)]
+
+
+def estimate_session_route(telemetry=False):
+    """Estimator for routes that load one session from the query args."""
+
+    def estimate():
+        year = request.args.get("year", type=int)
+        event_key = request.args.get("event_key", type=str)
+        session_name = request.args.get("session_name", type=str)
+        if not all([year, event_key, session_name]) or year < 2018:
+            return 0.0
+        session = fastf1.get_session(year, event_key, session_name)
+        return estimate_session_load(session, year, telemetry)
+
+    return estimate
+
+
+def _estimate_stored_laps(pairs):
+    """Cost of serving (driver, lap) pairs through the per-lap store.
+
+    A pair with lap None (the driver's fastest) counts as not stored.
+    """
+    year = request.args.get("year", type=int)
+    event_key = request.args.get("event_key", type=str)
+    session_name = request.args.get("session_name", type=str)
+    if not all([year, event_key, session_name]) or year < 2018:
+        return 0.0
+    session = fastf1.get_session(year, event_key, session_name)
+    missing = [
+        (driver, lap)
+        for driver, lap in pairs
+        if lap is None or not lap_store.contains(session, year, driver, lap)
+    ]
+    if not missing:
+        return estimate_session_load(session, year)
+    return (
+        estimate_session_load(session, year, telemetry=True)
+        + len(missing) * LAP_SLICE_COST_SECONDS
+    )
+
+
+def estimate_lap_telemetry():
+    """Estimator for /lap-telemetry: cheap once both laps are stored."""
+    pairs = [
+        (request.args.get(f"driver{i}_number", ""), request.args.get(f"lap{i}_number"))
+        for i in (1, 2)
+    ]
+    return _estimate_stored_laps(
+        [(driver, int(lap) if lap and lap.isdigit() else None) for driver, lap in pairs]
+    )
+
+
+def estimate_corner_analysis():
+    """Estimator for /corner-analysis (`laps=driver:lap,...`)."""
+    pairs = []
+    for item in request.args.get("laps", "").split(","):
+        driver, _, lap = item.strip().partition(":")
+        if driver:
+            pairs.append((driver, int(lap) if lap.strip().isdigit() else None))
+    return _estimate_stored_laps(pairs)
+
+
+def estimate_weekend():
+    """Estimator for /weekend-summary, which loads every session of an event."""
+    year = request.args.get("year", type=int)
+    event_key = request.args.get("event_key", type=str)
+    if not year or not event_key or year < 2018:
+        return 0.0
+    event = fastf1.get_event(year, event_key)
+    total = 0.0
+    for i in range(1, 6):
+        try:
+            total += estimate_session_load(event.get_session(i), year)
+        except Exception:
+            continue
+    return total
+
+
+def estimate_season():
+    """Estimator for season aggregates, which summarise every new session."""
+    year = request.args.get("year", type=int)
+    if not year or year < 2018:
+        return 0.0
+    missing = season_store.missing_sessions(year)
+    workers = max(1, season_store.worker_count())
+    return len(missing) * LOAD_COST_SECONDS[(False, False)] / workers
+
+
+def _requested_sessions(year):
+    event_key = request.args.get("event_key", type=str)
+    if not event_key:
+        return []
+    session_name = request.args.get("session_name", type=str)
+    if session_name:
+        return [fastf1.get_session(year, event_key, session_name)]
+    event = fastf1.get_event(year, event_key)
+    found = []
+    for i in range(1, 6):
+        try:
+            found.append(event.get_session(i))
+        except Exception:
+            continue
+    return found
+
+
+def _freshness_bucket():
+    """Time bucket for requests whose answer can still change, else None.
+
+    A live session changes with every lap and the current season's
+    aggregates with every new session, so their jobs are only shared within
+    one bucket.
+    """
+    year = request.args.get("year", type=int)
+    if not year:
+        return None
+    try:
+        live = any(sessions.is_live(s) for s in _requested_sessions(year))
+    except Exception:
+        live = False
+    if live:
+        ttl = LIVE_JOB_TTL_SECONDS
+    elif "event_key" not in request.args and year >= time.gmtime().tm_year:
+        ttl = CURRENT_SEASON_JOB_TTL_SECONDS
+    else:
+        return None
+    return int(time.time() // ttl)
+
+
+def _request_key():
+    args = sorted((k, v) for k, v in request.args.items(multi=True) if k != "async")
+    raw = json.dumps([request.path, args, _freshness_bucket()])
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def row_to_status(row):
+    return {
+        "job_id": row["id"],
+        "status": row["status"],
+        "path": row["path"],
+        "created": row["created"],
+        "updated": row["updated"],
+        "poll_url": f"/api/jobs/{row['id']}",
+    }
+
+
+def get_job(job_id):
+    """Fetch a job row, failing it if the worker that owned it has died."""
+    with _connect() as conn:
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        orphaned = (
+            row is not None and row["status"] in _PENDING and not _pid_alive(row["pid"])
+        )
+        if orphaned:
+            _finish(
+                conn,
+                job_id,
+                "failed",
+                500,
+                json.dumps({"error": "The worker running this job exited."}),
+            )
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    return row
+
+
+def _finish(conn, job_id, status, status_code, result):
+    conn.execute(
+        "UPDATE jobs SET status = ?, status_code = ?, result = ?, updated = ? "
+        "WHERE id = ?",
+        (status, status_code, result, time.time(), job_id),
+    )
+
+
+def _run_job(app, job_id, view, path, query_string, args, kwargs):
+    with app.test_request_context(path, query_string=query_string):
+        request.environ[_JOB_ENV_KEY] = job_id
+        with _connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'running', updated = ? WHERE id = ?",
+                (time.time(), job_id),
+            )
+
+        try:
+            response = app.make_response(view(*args, **kwargs))
+            status = "done" if response.status_code < 400 else "failed"
+            code = response.status_code
+            body = response.get_data(as_text=True)
+        except Exception as e:
+            print(f"[JOBS] Job {job_id} failed: {e}", file=sys.stderr)
+            traceback.print_exc()
+            status, code = "failed", 500
+            body = json.dumps({"error": f"An unexpected error occurred: {str(e)}"})
+
+        with _connect() as conn:
+            _finish(conn, job_id, status, code, body)
+
+
+def _enqueue(view, args, kwargs, estimate):
+    key = _request_key()
+    now = time.time()
+
+    with _connect() as conn:
+        conn.execute("DELETE FROM jobs WHERE updated < ?", (now - JOB_TTL_SECONDS,))
+        row = conn.execute(
+            "SELECT * FROM jobs WHERE request_key = ? AND status != 'failed' "
+            "ORDER BY created DESC LIMIT 1",
+            (key,),
+        ).fetchone()
+        if row is not None and (row["status"] == "done" or _pid_alive(row["pid"])):
+            return row
+
+        job_id = uuid.uuid4().hex
+        conn.execute(
+            "INSERT INTO jobs (id, request_key, path, status, pid, created, updated) "
+            "VALUES (?, ?, ?, 'queued', ?, ?, ?)",
+            (job_id, key, request.path, os.getpid(), now, now),
+        )
+
+    try:
+        executor.submit(
+            getattr(view, "pool_name", "session"),
+            _run_job,
+            current_app._get_current_object(),
+            job_id,
+            getattr(view, "__wrapped__", view),
+            request.path,
+            request.query_string,
+            args,
+            kwargs,
+        )
+    except executor.PoolSaturatedError:
+        with _connect() as conn:
+            conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+        raise
+
+    print(
+        f"[JOBS] Queued {job_id} for {request.path} (estimated {estimate:.0f}s)",
+        file=sys.stderr,
+    )
+    return get_job(job_id)
+
+
+def job_eligible(estimator):
+    """Let a route answer 202 with a job id when it would blow the budget.
+
+    Must be applied above `executor.offload` so the job runs the undecorated
+    view directly on the route's pool.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.environ.get(_JOB_ENV_KEY) or not _job_mode_requested():
+                return view(*args, **kwargs)
+
+            try:
+                estimate = estimator()
+            except Exception as e:
+                print(f"[JOBS] Latency estimate failed: {e}", file=sys.stderr)
+                estimate = 0.0
+            if estimate <= _latency_budget():
+                return view(*args, **kwargs)
+
+            try:
+                row = _enqueue(view, args, kwargs, estimate)
+            except executor.PoolSaturatedError as e:
+                return error_response(str(e), 503)
+
+            payload = row_to_status(row)
+            payload["estimated_seconds"] = estimate
+            response = jsonify(payload)
+            response.status_code = 202
+            response.headers["Location"] = payload["poll_url"]
+            response.headers["Retry-After"] = "2"
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,232 @@
+"""Pre-sliced per-lap telemetry, stored once per (driver, lap).
+
+`Lap.get_telemetry()` merges car and position data and interpolates the
+distance channel on every call, which made each `/lap-telemetry` request pay
+for it again. Instead each lap is sliced once, the first time any request
+needs it (or ahead of time with
+`python -m f1_backend.lap_store <year> <event> <session>`), and appended to
+`<DATA_PATH>/laps/v<FORMAT_VERSION>/<session key>/`:
+
+- `chunks.bin`: one zlib-compressed chunk per lap, each the fixed-schema
+  channels stored column after column,
+- `index.jsonl`: one line per stored lap with its driver number,
+  abbreviation, lap number and the chunk's offset, length and row count.
+
+A chunk is written before its index line, so readers never see a partial
+lap. Serving a stored lap is a seek, one read and a decode, and needs the
+session loaded without telemetry only. Laps that fail to slice are not
+stored, so they are retried (and their error surfaced) on the next request.
+Neither are laps of a live session, whose telemetry is still being revised.
+"""
+
+from contextlib import contextmanager
+import json
+import os
+import sys
+import threading
+import zlib
+import numpy as np
+import pandas as pd
+from . import sessions
+from .utils import data_path
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+# Bump whenever CHANNELS or the file layout changes
+FORMAT_VERSION = 2
+# (name, dtype); integer channels use -1 for missing samples
+CHANNELS = (
+    ("time", "<f4"),
+    ("distance", "<f4"),
+    ("speed", "<f4"),
+    ("throttle", "<f4"),
+    ("rpm", "<f4"),
+    ("brake", "<i1"),
+    ("drs", "<i1"),
+    ("n_gear", "<i1"),
+)
+_SOURCES = {
+    "speed": "Speed",
+    "throttle": "Throttle",
+    "rpm": "RPM",
+    "brake": "Brake",
+    "drs": "DRS",
+    "n_gear": "nGear",
+}
+
+_key_locks = {}
+_indexes = {}
+_lock = threading.Lock()
+
+
+def _path(key, name):
+    return data_path("laps", f"v{FORMAT_VERSION}", key, name)
+
+
+@contextmanager
+def _append_lock(key):
+    """Serialise appends to one session's store across threads and workers."""
+    with _lock:
+        lock = _key_locks.setdefault(key, threading.Lock())
+    with lock, open(_path(key, ".lock"), "a") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def encode(telemetry):
+    """One lap's merged telemetry as (compressed chunk, row count)."""
+    distance = telemetry["Distance"]
+    columns = {
+        "time": telemetry["Time"].dt.total_seconds().to_numpy(dtype=float),
+        "distance": (distance - distance.min()).to_numpy(dtype=float),
+    }
+    for name, column in _SOURCES.items():
+        values = pd.to_numeric(telemetry[column], errors="coerce")
+        columns[name] = values.to_numpy(dtype=float)
+
+    parts = []
+    for name, dtype in CHANNELS:
+        values = columns[name]
+        if np.dtype(dtype).kind == "i":
+            values = np.where(np.isnan(values), -1, values)
+        parts.append(values.astype(dtype).tobytes())
+    return zlib.compress(b"".join(parts), 6), len(telemetry)
+
+
+def decode(chunk, rows):
+    """The channels of one chunk as numpy arrays keyed by channel name."""
+    raw = zlib.decompress(chunk)
+    columns, offset = {}, 0
+    for name, dtype in CHANNELS:
+        dtype = np.dtype(dtype)
+        columns[name] = np.frombuffer(raw, dtype, count=rows, offset=offset)
+        offset += rows * dtype.itemsize
+    return columns
+
+
+def _index(key):
+    """The session's index, re-read only when index.jsonl has grown.
+
+    Maps (driver number, lap) and (abbreviation, lap) to (offset, length,
+    rows).
+    """
+    path = _path(key, "index.jsonl")
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return {}
+    with _lock:
+        cached = _indexes.get(key)
+    if cached and cached[0] == size:
+        return cached[1]
+
+    index = {}
+    with open(path, "r", encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # a line still being appended by another worker
+            location = (entry["offset"], entry["length"], entry["rows"])
+            index[(entry["driver_number"], entry["lap"])] = location
+            if entry.get("driver"):
+                index[(entry["driver"], entry["lap"])] = location
+    with _lock:
+        _indexes[key] = (size, index)
+    return index
+
+
+def contains(session, year, driver, lap_number):
+    """Whether a lap is stored; `driver` is a number or abbreviation.
+
+    `session` need not be loaded.
+    """
+    key = sessions.session_key(session, year)
+    return (str(driver), int(lap_number)) in _index(key)
+
+
+def read(session, year, driver_number, lap_number):
+    """Stored channels of one lap, or None when it was not sliced yet."""
+    key = sessions.session_key(session, year)
+    location = _index(key).get((str(driver_number), int(lap_number)))
+    if location is None:
+        return None
+    offset, length, rows = location
+    with open(_path(key, "chunks.bin"), "rb") as handle:
+        handle.seek(offset)
+        chunk = handle.read(length)
+    return decode(chunk, rows)
+
+
+def store(session, year, lap):
+    """Slice one lap of a session loaded with telemetry, store and return it.
+
+    Raises whatever `get_telemetry()` raises; returns None (and stores
+    nothing) when the lap has no telemetry. A live session's lap is sliced
+    and returned without being stored.
+    """
+    key = sessions.session_key(session, year)
+    driver_number, lap_number = str(lap["DriverNumber"]), int(lap["LapNumber"])
+    telemetry = lap.get_telemetry()
+    if telemetry.empty:
+        return None
+    chunk, rows = encode(telemetry)
+    if sessions.is_live(session):
+        return decode(chunk, rows)
+
+    with _append_lock(key):
+        # Another worker may have stored it while we were slicing
+        if (driver_number, lap_number) not in _index(key):
+            with open(_path(key, "chunks.bin"), "ab") as handle:
+                offset = handle.seek(0, os.SEEK_END)
+                handle.write(chunk)
+            entry = {
+                "driver_number": driver_number,
+                "driver": str(lap["Driver"]) if pd.notna(lap["Driver"]) else None,
+                "lap": lap_number,
+                "offset": offset,
+                "length": len(chunk),
+                "rows": rows,
+            }
+            with open(_path(key, "index.jsonl"), "a", encoding="utf-8") as handle:
+                handle.write(json.dumps(entry) + "\n")
+    return decode(chunk, rows)
+
+
+def ingest(session, year):
+    """Slice and store every lap not stored yet; returns the failed laps."""
+    failed = []
+    for _, lap in session.laps.iterlaps():
+        if pd.isna(lap["LapNumber"]):
+            continue
+        if contains(session, year, lap["DriverNumber"], lap["LapNumber"]):
+            continue
+        try:
+            store(session, year, lap)
+        except Exception as e:
+            label = f"{lap['DriverNumber']}:{int(lap['LapNumber'])}"
+            print(f"[LAPSTORE] Could not slice {label}: {e}", file=sys.stderr)
+            failed.append(label)
+    return failed
+
+
+if __name__ == "__main__":
+    import fastf1
+
+    if len(sys.argv) != 4:
+        sys.exit("usage: python -m f1_backend.lap_store <year> <event> <session>")
+    year = int(sys.argv[1])
+    session = fastf1.get_session(year, sys.argv[2], sys.argv[3])
+    session = sessions.load(session, year, telemetry=True)
+    failed = ingest(session, year)
+    stored = len({v for v in _index(sessions.session_key(session, year)).values()})
+    print(f"{stored} laps stored, {len(failed)} failed")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,594 @@
+"""Live session mode fed by a FastF1 live-timing recording.
+
+`python -m fastf1.livetiming save <file>` appends one message per line while
+a session runs; a finished recording can be replayed as a stand-in. Set
+F1_LIVE_FILE to such a file and a background thread tails it:
+
+- only newly appended lines are parsed (the read offset is kept), and each
+  message is merged into in-memory driver, lap and track status state,
+- every batch of changes becomes a numbered delta in a short ring buffer
+  that `/api/live/stream` pushes to clients as server-sent events,
+- routes that support live data (`/race-summary`, `/race-trace`, recap
+  insights) read the state through `feed_for(session, year)`.
+
+F1_LIVE_REPLAY_SPEED > 0 paces messages by their recorded timestamps
+(1 = real time) so a complete recording plays back like a live session.
+"""
+
+from collections import deque
+import ast
+import copy
+import json
+import os
+import sys
+import threading
+import time
+import pandas as pd
+from .utils import format_timedelta
+
+POLL_SECONDS = 0.5
+DELTA_BUFFER = 2000
+HEARTBEAT_SECONDS = 15
+
+# Topics whose payloads are merged into state; telemetry (.z) is skipped
+TOPICS = (
+    "SessionInfo",
+    "SessionStatus",
+    "DriverList",
+    "TimingData",
+    "TimingAppData",
+    "TrackStatus",
+    "LapCount",
+    "RaceControlMessages",
+)
+_INCIDENTS = {"4": "Safety Car", "5": "Red Flag", "6": "VSC"}
+_STATUS_EVENTS = {"4": "SC", "5": "Red Flag", "6": "VSC"}
+
+_feed = None
+
+
+def _merge(target, update):
+    """Apply a partial live-timing update to a nested dict in place."""
+    if isinstance(update, list):
+        update = {str(i): v for i, v in enumerate(update)}
+    for key, value in update.items():
+        if isinstance(value, (dict, list)) and isinstance(target.get(key), dict):
+            _merge(target[key], value)
+        elif isinstance(value, list):
+            target[key] = {str(i): v for i, v in enumerate(value)}
+        else:
+            target[key] = value
+
+
+def parse_line(line):
+    """(topic, payload, timestamp) messages of one recording line."""
+    line = line.strip()
+    if not line:
+        return []
+    try:
+        raw = json.loads(line)
+    except ValueError:
+        try:
+            raw = ast.literal_eval(line)
+        except (ValueError, SyntaxError):
+            return []
+    if isinstance(raw, dict):
+        # Raw SignalR frame: {"M": [{"A": [topic, payload, timestamp]}]}
+        return [tuple(m["A"][:3]) for m in raw.get("M", []) if len(m.get("A", ())) >= 3]
+    if isinstance(raw, list) and len(raw) >= 3:
+        return [tuple(raw[:3])]
+    return []
+
+
+def _seconds(text):
+    """'1:32.456' / '32.456' / '+1.234' as seconds, None if not a time."""
+    if not isinstance(text, str) or not text.strip("+ "):
+        return None
+    try:
+        minutes, _, seconds = text.strip("+ ").rpartition(":")
+        return float(minutes or 0) * 60 + float(seconds)
+    except ValueError:
+        return None
+
+
+class LiveFeed:
+    """In-memory state of one live session, updated from a recording."""
+
+    def __init__(self, path, replay_speed=0.0):
+        self.path = path
+        self.replay_speed = replay_speed
+        self.raw = {topic: {} for topic in TOPICS}
+        self.drivers = {}
+        self.laps = []
+        self.status_changes = []
+        self.start = None
+        self.seq = 0
+        self.deltas = deque(maxlen=DELTA_BUFFER)
+        # Guards all state; ingestion and views may run on different threads
+        self.changed = threading.Condition(threading.RLock())
+        self._offset = 0
+        self._pending = ""
+        self._last_stamp = None
+        self._laps_frame = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="live-feed", daemon=True)
+
+    # --- Ingestion ---
+
+    def start_following(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _read_new_lines(self):
+        try:
+            with open(self.path, encoding="utf-8", errors="replace") as handle:
+                handle.seek(self._offset)
+                chunk = handle.read()
+                self._offset = handle.tell()
+        except FileNotFoundError:
+            return []
+        text = self._pending + chunk
+        lines = text.split("\n")
+        # Keep a partially written last line for the next read
+        self._pending = lines.pop()
+        return lines
+
+    def _pace(self, stamp):
+        if self.replay_speed <= 0 or stamp is None:
+            return
+        if self._last_stamp is not None:
+            wait = (stamp - self._last_stamp).total_seconds() / self.replay_speed
+            if wait > 0:
+                self._stop.wait(min(wait, 60))
+        self._last_stamp = stamp
+
+    def _run(self):
+        print(f"[LIVE] Following {self.path}", file=sys.stderr)
+        while not self._stop.is_set():
+            lines = self._read_new_lines()
+            for line in lines:
+                for topic, payload, stamp in parse_line(line):
+                    stamp = pd.to_datetime(stamp, utc=True, errors="coerce")
+                    stamp = None if pd.isna(stamp) else stamp.tz_localize(None)
+                    self._pace(stamp)
+                    try:
+                        self.ingest(topic, payload, stamp)
+                    except Exception as e:
+                        print(f"[LIVE] Bad {topic} message: {e}", file=sys.stderr)
+            if not lines:
+                self._stop.wait(POLL_SECONDS)
+
+    def ingest(self, topic, payload, stamp):
+        """Merge one message and publish the resulting delta."""
+        if topic not in TOPICS or not isinstance(payload, (dict, list)):
+            return
+        with self.changed:
+            self._ingest(topic, payload, stamp)
+
+    def _ingest(self, topic, payload, stamp):
+        if self.start is None and stamp is not None:
+            self.start = stamp
+        _merge(self.raw[topic], payload)
+
+        delta = {}
+        if topic == "DriverList":
+            delta["drivers"] = self._update_driver_list(payload)
+        elif topic == "TimingData":
+            delta["drivers"], delta["laps"] = self._update_timing(payload, stamp)
+        elif topic == "TimingAppData":
+            delta["drivers"] = self._update_tyres(payload)
+        elif topic == "TrackStatus":
+            delta["track_status"] = self._update_track_status(stamp)
+        elif topic == "LapCount":
+            delta["lap_count"] = self.lap_count()
+        elif topic == "SessionStatus":
+            delta["session_status"] = self.raw["SessionStatus"].get("Status")
+        elif topic == "RaceControlMessages":
+            # _merge may adopt nested payload dicts into `raw` and update them
+            delta["race_control"] = copy.deepcopy(payload)
+        delta = {k: v for k, v in delta.items() if v}
+        if delta:
+            self._publish(delta, stamp)
+
+    def _publish(self, delta, stamp):
+        with self.changed:
+            self.seq += 1
+            delta["seq"] = self.seq
+            delta["time"] = stamp.isoformat() if stamp is not None else None
+            self.deltas.append(delta)
+            self.changed.notify_all()
+
+    def _driver(self, number):
+        return self.drivers.setdefault(
+            number,
+            {
+                "driver_number": number,
+                "abbreviation": number,
+                "full_name": None,
+                "team_name": None,
+                "team_color": "777777",
+                "position": None,
+                "laps": 0,
+                "gap_to_leader": None,
+                "interval": None,
+                "last_lap_time": None,
+                "in_pit": False,
+                "retired": False,
+                "stints": [],
+            },
+        )
+
+    def _update_driver_list(self, payload):
+        changed = {}
+        for number, info in payload.items():
+            if not isinstance(info, dict):
+                continue
+            raw = self.raw["DriverList"].get(number, {})
+            driver = self._driver(number)
+            driver.update(
+                abbreviation=raw.get("Tla", driver["abbreviation"]),
+                full_name=raw.get("FullName", driver["full_name"]),
+                team_name=raw.get("TeamName", driver["team_name"]),
+                team_color=raw.get("TeamColour", driver["team_color"]),
+            )
+            # Deltas are replayed later; record this state, not the live dict
+            changed[number] = dict(driver)
+        return changed
+
+    def _update_timing(self, payload, stamp):
+        changed, new_laps = {}, []
+        for number, update in payload.get("Lines", {}).items():
+            if not isinstance(update, dict):
+                continue
+            raw = self.raw["TimingData"]["Lines"][number]
+            driver = self._driver(number)
+            before = dict(driver)
+
+            if "Position" in raw:
+                driver["position"] = int(raw["Position"])
+            driver["gap_to_leader"] = raw.get("GapToLeader")
+            interval = raw.get("IntervalToPositionAhead", {})
+            driver["interval"] = (
+                interval.get("Value") if isinstance(interval, dict) else None
+            )
+            last = raw.get("LastLapTime", {})
+            driver["last_lap_time"] = (
+                _seconds(last.get("Value")) if isinstance(last, dict) else None
+            )
+            driver["in_pit"] = bool(raw.get("InPit"))
+            driver["retired"] = bool(raw.get("Retired"))
+
+            completed = int(raw.get("NumberOfLaps") or 0)
+            if "NumberOfLaps" in update and completed > driver["laps"]:
+                new_laps.append(self._complete_lap(driver, completed, stamp))
+            driver["laps"] = max(driver["laps"], completed)
+
+            if driver != before:
+                changed[number] = {k: v for k, v in driver.items() if k != "stints"}
+        return changed, new_laps
+
+    def _complete_lap(self, driver, lap_number, stamp):
+        elapsed = (stamp - self.start).total_seconds() if stamp is not None else None
+        previous = next(
+            (
+                lap["time"]
+                for lap in reversed(self.laps)
+                if lap["driver_number"] == driver["driver_number"]
+            ),
+            0.0,
+        )
+        lap = {
+            "driver_number": driver["driver_number"],
+            "lap_number": lap_number,
+            "lap_time": driver["last_lap_time"],
+            "position": driver["position"],
+            "time": elapsed,
+            "start_time": previous,
+            "track_status": self.track_status(),
+        }
+        self.laps.append(lap)
+        return lap
+
+    def _update_tyres(self, payload):
+        changed = {}
+        for number, update in payload.get("Lines", {}).items():
+            if not isinstance(update, dict) or "Stints" not in update:
+                continue
+            stints = self.raw["TimingAppData"]["Lines"][number].get("Stints", {})
+            driver = self._driver(number)
+            driver["stints"] = [
+                {
+                    "stint_number": int(i) + 1,
+                    "compound": stint.get("Compound"),
+                    "lap_count": int(stint.get("TotalLaps") or 0),
+                    "start_laps": int(stint.get("StartLaps") or 0),
+                    "new": str(stint.get("New", "")).lower() == "true",
+                }
+                for i, stint in sorted(stints.items(), key=lambda s: int(s[0]))
+            ]
+            changed[number] = {"stints": driver["stints"]}
+        return changed
+
+    def _update_track_status(self, stamp):
+        status = str(self.raw["TrackStatus"].get("Status", "1"))
+        if self.status_changes and self.status_changes[-1]["status"] == status:
+            return None
+        change = {
+            "status": status,
+            "message": self.raw["TrackStatus"].get("Message"),
+            "lap": self.lap_count()["current"],
+            "time": (stamp - self.start).total_seconds() if stamp is not None else None,
+        }
+        self.status_changes.append(change)
+        return change
+
+    # --- Views ---
+
+    def info(self):
+        raw = self.raw["SessionInfo"]
+        start = pd.to_datetime(raw.get("StartDate"), errors="coerce")
+        return {
+            "event_name": raw.get("Meeting", {}).get("Name"),
+            "session_name": raw.get("Name"),
+            "year": int(start.year) if pd.notna(start) else None,
+        }
+
+    def lap_count(self):
+        raw = self.raw["LapCount"]
+        current = raw.get("CurrentLap")
+        if current is None:
+            current = max((d["laps"] for d in self.drivers.values()), default=0)
+        return {"current": int(current), "total": raw.get("TotalLaps")}
+
+    def track_status(self):
+        return str(self.raw["TrackStatus"].get("Status", "1"))
+
+    def standings(self):
+        """Drivers in running order, as race-summary style result rows."""
+        with self.changed:
+            rows = [dict(d) for d in self.drivers.values()]
+        rows.sort(key=lambda d: (d["position"] is None, d["position"] or 0))
+        return rows
+
+    def summary_rows(self):
+        """Drivers as /race-summary result rows, in the historical shape.
+
+        Stint lap ranges come from the cumulative TimingAppData stint
+        lengths; drivers without a position yet are placed after the rest.
+        """
+        with self.changed:
+            drivers = [dict(d) for d in self.drivers.values()]
+            laps = list(self.laps)
+        by_driver = {}
+        for lap in laps:
+            by_driver.setdefault(lap["driver_number"], {})[lap["lap_number"]] = lap
+        drivers.sort(key=lambda d: (d["position"] is None, d["position"] or 0))
+
+        rows = []
+        for place, driver in enumerate(drivers, start=1):
+            driver_laps = by_driver.get(driver["driver_number"], {})
+            timed = [l["lap_time"] for l in driver_laps.values() if l["lap_time"]]
+            best = min(timed, default=None)
+            stints, start = [], 1
+            raw_stints = driver.get("stints", [])
+            for i, stint in enumerate(raw_stints):
+                # TotalLaps includes the laps a used set had already done
+                length = max(0, stint["lap_count"] - stint.get("start_laps", 0))
+                if length == 0:
+                    continue
+                end = start + length - 1
+                compound = str(stint["compound"])
+                stint_laps = []
+                for number in range(start, end + 1):
+                    lap = driver_laps.get(number)
+                    if lap is None:
+                        continue
+                    lap_type = "push"
+                    if number == start and i > 0:
+                        lap_type = "out"
+                    elif number == end and i + 1 < len(raw_stints):
+                        lap_type = "in"
+                    stint_laps.append(_summary_lap(lap, lap_type, compound, best))
+                stints.append(
+                    {
+                        "stint_number": stint["stint_number"],
+                        "run_number": 1,
+                        "compound": compound,
+                        "lap_count": length,
+                        "start_lap": start,
+                        "end_lap": end,
+                        "laps": stint_laps,
+                    }
+                )
+                start = end + 1
+            rows.append(
+                {
+                    "position": (
+                        driver["position"] if driver["position"] is not None else place
+                    ),
+                    "driver_number": driver["driver_number"],
+                    "abbreviation": driver["abbreviation"],
+                    "full_name": driver["full_name"],
+                    "team_name": driver["team_name"],
+                    "team_color": driver["team_color"] or "777777",
+                    "stints": stints,
+                    "max_phase": "Session",
+                }
+            )
+        return rows
+
+    def status_events(self):
+        """SC/VSC/red flag periods as lap ranges, like /race-summary."""
+        with self.changed:
+            changes = list(self.status_changes)
+            current = self.lap_count()["current"]
+        events = []
+        for i, change in enumerate(changes):
+            kind = _STATUS_EVENTS.get(change["status"])
+            if not kind:
+                continue
+            end = changes[i + 1]["lap"] if i + 1 < len(changes) else current
+            events.append(
+                {"type": kind, "start_lap": max(1, change["lap"]), "end_lap": end}
+            )
+        return events
+
+    def incidents(self):
+        """Track status incidents in the shape of recap insights."""
+        with self.changed:
+            changes = list(self.status_changes)
+        return [
+            {"type": _INCIDENTS[c["status"]], "time": c["time"]}
+            for c in changes
+            if c["status"] in _INCIDENTS
+        ]
+
+    def laps_frame(self):
+        """Completed laps as a FastF1-like frame, rebuilt only on new laps."""
+        with self.changed:
+            return self._build_laps_frame()
+
+    def _build_laps_frame(self):
+        if self._laps_frame is None or len(self._laps_frame) != len(self.laps):
+            rows = list(self.laps)
+            frame = pd.DataFrame(
+                {
+                    "DriverNumber": [r["driver_number"] for r in rows],
+                    "LapNumber": [r["lap_number"] for r in rows],
+                    "LapTime": pd.to_timedelta([r["lap_time"] for r in rows], unit="s"),
+                    "Time": pd.to_timedelta([r["time"] for r in rows], unit="s"),
+                    "LapStartTime": pd.to_timedelta(
+                        [r["start_time"] for r in rows], unit="s"
+                    ),
+                    "Position": [r["position"] for r in rows],
+                    "TrackStatus": [r["track_status"] for r in rows],
+                }
+            )
+            self._laps_frame = frame
+        return self._laps_frame
+
+    def driver_info(self):
+        with self.changed:
+            return self._driver_info()
+
+    def _driver_info(self):
+        return {
+            number: {
+                "abbreviation": d["abbreviation"],
+                "team": d["team_name"],
+                "team_color": d["team_color"],
+            }
+            for number, d in self.drivers.items()
+        }
+
+    def snapshot(self):
+        with self.changed:
+            return self._snapshot()
+
+    def _snapshot(self):
+        return {
+            "seq": self.seq,
+            "session": self.info(),
+            "lap_count": self.lap_count(),
+            "track_status": self.track_status(),
+            "session_status": self.raw["SessionStatus"].get("Status"),
+            "drivers": self.standings(),
+            "status_events": self.status_events(),
+        }
+
+    def deltas_after(self, seq):
+        """Deltas newer than `seq`, or None if they left the buffer."""
+        with self.changed:
+            if self.deltas and self.deltas[0]["seq"] > seq + 1:
+                return None
+            return [d for d in self.deltas if d["seq"] > seq]
+
+    def matches(self, session, year):
+        info = self.info()
+        return (
+            info["year"] == year
+            and info["session_name"] == session.name
+            and info["event_name"] == str(session.event["EventName"])
+        )
+
+
+def _summary_lap(lap, lap_type, compound, best):
+    seconds = lap["lap_time"]
+    lap_time = pd.Timedelta(seconds=seconds) if seconds else pd.NaT
+    return {
+        "lap_number": lap["lap_number"],
+        "lap_time": format_timedelta(lap_time),
+        "lap_time_seconds": seconds,
+        "type": lap_type,
+        "phase": "Session",
+        "is_pb": bool(seconds) and seconds == best,
+        "compound": compound,
+        # The feed carries no sector times
+        "sectors": {s: {"time": None, "status": "none"} for s in ("s1", "s2", "s3")},
+    }
+
+
+def current():
+    return _feed
+
+
+def feed_for(session, year):
+    """The live feed if it is streaming this session, else None."""
+    feed = _feed
+    if feed is None:
+        return None
+    try:
+        return feed if feed.matches(session, year) else None
+    except Exception:
+        return None
+
+
+def init_app(app):
+    """Start following F1_LIVE_FILE when it is set."""
+    global _feed
+    path = os.environ.get("F1_LIVE_FILE")
+    if not path or _feed is not None:
+        return
+    try:
+        speed = float(os.environ.get("F1_LIVE_REPLAY_SPEED", 0))
+    except ValueError:
+        speed = 0.0
+    _feed = LiveFeed(path, replay_speed=speed)
+    _feed.start_following()
+
+
+def stream(last_seq=None):
+    """Server-sent events: a snapshot, then deltas as they are published."""
+    feed = _feed
+
+    def event(name, payload, seq):
+        return f"id: {seq}\nevent: {name}\ndata: {json.dumps(payload)}\n\n"
+
+    missed = feed.deltas_after(last_seq) if last_seq is not None else None
+    if missed is None:
+        snapshot = feed.snapshot()
+        seq = snapshot["seq"]
+        yield event("snapshot", snapshot, seq)
+    else:
+        seq = last_seq
+        for delta in missed:
+            seq = delta["seq"]
+            yield event("delta", delta, seq)
+
+    while True:
+        with feed.changed:
+            feed.changed.wait_for(lambda: feed.seq > seq, timeout=HEARTBEAT_SECONDS)
+        deltas = feed.deltas_after(seq)
+        if deltas is None:
+            # Fell behind the buffer; start over from a fresh snapshot
+            snapshot = feed.snapshot()
+            seq = snapshot["seq"]
+            yield event("snapshot", snapshot, seq)
+        elif deltas:
+            for delta in deltas:
+                seq = delta["seq"]
+                yield event("delta", delta, seq)
+        else:
+            yield f": keep-alive {int(time.time())}\n\n"
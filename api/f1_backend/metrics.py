@@ -0,0 +1,242 @@
+"""Per-request phase timings, cache counters and Prometheus exposition.
+
+Every request is split into phases:
+
+- load: FastF1 session loads (`sessions.load` is wrapped in `timed("load")`),
+- serialize: JSON encoding, measured by the app's JSON provider,
+- compute: whatever remains of the view's wall time,
+- send: time from the end of the view until the WSGI server closed the
+  response, which covers streaming the body to the client.
+
+The first three are returned as a `Server-Timing` header on every response.
+All four feed per-route histograms that `/api/_metrics` exposes in the
+Prometheus text format, together with cache hit/miss counters and the
+worker pool gauges. Scrapers must send F1_OPS_TOKEN in an `X-F1-Ops-Token`
+header (or as a bearer token); without it the endpoint answers 404.
+
+State is stored on `request.environ` rather than `flask.g` so timings
+recorded on an offloaded pool thread land on the same request.
+"""
+
+from contextlib import contextmanager
+import threading
+import time
+from flask import has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 60.0)
+
+_ENV_KEY = "f1.timings"
+
+_lock = threading.Lock()
+_histograms = {}
+_requests = {}
+_cache_events = {}
+
+
+class _Histogram:
+    def __init__(self):
+        self.buckets = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.buckets[i] += 1
+
+
+def _state():
+    if not has_request_context():
+        return None
+    return request.environ.get(_ENV_KEY)
+
+
+def add_time(phase, seconds):
+    """Attribute `seconds` to a phase of the current request."""
+    state = _state()
+    if state is not None:
+        state["phases"][phase] = state["phases"].get(phase, 0.0) + seconds
+
+
+@contextmanager
+def timed(phase):
+    """Time a block and attribute it to a phase of the current request."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_time(phase, time.perf_counter() - start)
+
+
+def record_cache(cache, hit):
+    """Count a cache hit or miss, globally and on the current request."""
+    result = "hit" if hit else "miss"
+    with _lock:
+        _cache_events[(cache, result)] = _cache_events.get((cache, result), 0) + 1
+    state = _state()
+    if state is not None:
+        state["cache"].append(f"{cache}:{result}")
+
+
+def _observe(route, phase, seconds):
+    with _lock:
+        hist = _histograms.get((route, phase))
+        if hist is None:
+            hist = _histograms[(route, phase)] = _Histogram()
+        hist.observe(seconds)
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """JSON provider that books `jsonify` time under the serialize phase."""
+
+    def response(self, *args, **kwargs):
+        with timed("serialize"):
+            return super().response(*args, **kwargs)
+
+
+def _route():
+    rule = request.url_rule
+    return rule.rule if rule is not None else "unmatched"
+
+
+def _before_request():
+    request.environ[_ENV_KEY] = {
+        "start": time.perf_counter(),
+        "phases": {},
+        "cache": [],
+    }
+
+
+def _after_request(response):
+    state = _state()
+    if state is None:
+        return response
+
+    end = time.perf_counter()
+    total = end - state["start"]
+    phases = state["phases"]
+    load = phases.get("load", 0.0)
+    serialize = phases.get("serialize", 0.0)
+    compute = max(0.0, total - load - serialize)
+    route = _route()
+
+    timing = [
+        f"load;dur={load * 1000:.1f}",
+        f"compute;dur={compute * 1000:.1f}",
+        f"serialize;dur={serialize * 1000:.1f}",
+        f"total;dur={total * 1000:.1f}",
+    ]
+    if state["cache"]:
+        timing.append(f'cache;desc="{" ".join(state["cache"])}"')
+    response.headers["Server-Timing"] = ", ".join(timing)
+
+    for phase, seconds in (
+        ("load", load),
+        ("compute", compute),
+        ("serialize", serialize),
+        ("total", total),
+    ):
+        _observe(route, phase, seconds)
+
+    key = (route, request.method, str(response.status_code))
+    with _lock:
+        _requests[key] = _requests.get(key, 0) + 1
+
+    response.call_on_close(
+        lambda: _observe(route, "send", time.perf_counter() - end)
+    )
+    return response
+
+
+def init_app(app):
+    """Install the timing hooks and JSON provider on an app."""
+    app.json = TimedJSONProvider(app)
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+
+
+# --- Prometheus exposition ---
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    return ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+
+
+def render_prometheus(pools=None, sessions=None):
+    """Render all metrics in the Prometheus text exposition format."""
+    with _lock:
+        histograms = {
+            k: (list(h.buckets), h.count, h.sum) for k, h in _histograms.items()
+        }
+        requests_total = dict(_requests)
+        cache_events = dict(_cache_events)
+
+    lines = [
+        "# HELP f1_request_phase_seconds Time spent per request phase.",
+        "# TYPE f1_request_phase_seconds histogram",
+    ]
+    for (route, phase), (buckets, count, total) in sorted(histograms.items()):
+        for bound, value in zip(BUCKETS, buckets):
+            labels = _labels(route=route, phase=phase, le=bound)
+            lines.append(f"f1_request_phase_seconds_bucket{{{labels}}} {value}")
+        labels = _labels(route=route, phase=phase, le="+Inf")
+        lines.append(f"f1_request_phase_seconds_bucket{{{labels}}} {count}")
+        labels = _labels(route=route, phase=phase)
+        lines.append(f"f1_request_phase_seconds_sum{{{labels}}} {total:.6f}")
+        lines.append(f"f1_request_phase_seconds_count{{{labels}}} {count}")
+
+    lines += [
+        "# HELP f1_requests_total Requests handled, by route and status.",
+        "# TYPE f1_requests_total counter",
+    ]
+    for (route, method, status), count in sorted(requests_total.items()):
+        labels = _labels(route=route, method=method, status=status)
+        lines.append(f"f1_requests_total{{{labels}}} {count}")
+
+    lines += [
+        "# HELP f1_cache_events_total Cache lookups, by cache and result.",
+        "# TYPE f1_cache_events_total counter",
+    ]
+    for (cache, result), count in sorted(cache_events.items()):
+        lines.append(
+            f"f1_cache_events_total{{{_labels(cache=cache, result=result)}}} {count}"
+        )
+
+    if pools:
+        for name, metric, metric_type, help_text in (
+            (
+                "queued",
+                "f1_pool_queued",
+                "gauge",
+                "Requests waiting for a pool worker.",
+            ),
+            ("active", "f1_pool_active", "gauge", "Pool workers currently busy."),
+            (
+                "rejected",
+                "f1_pool_rejected_total",
+                "counter",
+                "Requests rejected because the pool was full.",
+            ),
+        ):
+            lines += [
+                f"# HELP {metric} {help_text}",
+                f"# TYPE {metric} {metric_type}",
+            ]
+            for pool, stats in sorted(pools.items()):
+                lines.append(f"{metric}{{{_labels(pool=pool)}}} {stats[name]}")
+
+    if sessions is not None:
+        lines += [
+            "# HELP f1_cached_sessions Sessions held in this worker's cache.",
+            "# TYPE f1_cached_sessions gauge",
+            f"f1_cached_sessions {len(sessions['sessions'])}",
+        ]
+
+    return "\n".join(lines) + "\n"
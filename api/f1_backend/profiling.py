@@ -0,0 +1,286 @@
+"""On-demand profiling of single requests.
+
+Set F1_PROFILE_TOKEN to enable. A request that carries the token in an
+`X-F1-Profile` header (or in `?_profile=` when F1_PROFILE_QUERY=1) is run
+with a sampling CPU profiler and tracemalloc. The result is written to the
+profiles directory (F1_PROFILE_DIR, default <DATA_PATH>/profiles):
+
+- `<id>.cpu.folded` / `<id>.cpu.svg`: sampled stacks as collapsed stacks
+  (speedscope, flamegraph.pl) and a self-contained flame graph,
+- `<id>.mem.folded` / `<id>.mem.svg`: live allocations by traceback at the
+  end of the request, weighted by bytes,
+- `<id>.tracemalloc`: the raw snapshot for `tracemalloc.Snapshot.load()`.
+
+The response carries `X-Profile-Id`; `/api/_profiles` lists stored profiles.
+Without the env var no hooks are installed, so there is no overhead.
+
+The sampler walks every thread except idle ones, so offloaded pool work is
+included; concurrent requests on other threads show up too. Only one
+request is profiled at a time.
+"""
+
+from collections import Counter
+import hmac
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from flask import current_app, request
+
+SAMPLE_INTERVAL_S = 0.005
+TRACEMALLOC_FRAMES = 30
+
+# Leaf frames in these modules are threads waiting, not working
+_IDLE_MODULES = ("threading.py", "queue.py", "selectors.py", "socketserver.py")
+_ENV_KEY = "f1.profile"
+
+_busy = threading.Lock()
+
+
+def enabled():
+    return bool(os.environ.get("F1_PROFILE_TOKEN"))
+
+
+def authorized():
+    """Whether the current request carries the profiling token."""
+    token = os.environ.get("F1_PROFILE_TOKEN")
+    if not token:
+        return False
+    supplied = request.headers.get("X-F1-Profile", "")
+    if not supplied and os.environ.get("F1_PROFILE_QUERY") == "1":
+        supplied = request.args.get("_profile", "")
+    return bool(supplied) and hmac.compare_digest(supplied, token)
+
+
+def profile_dir():
+    path = os.environ.get("F1_PROFILE_DIR") or os.path.join(
+        current_app.config["DATA_PATH"], "profiles"
+    )
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _frame_name(frame):
+    code = frame.f_code
+    filename = os.path.basename(code.co_filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+def _fold(frame):
+    """Collapse a frame chain into a root-first `a;b;c` stack."""
+    if os.path.basename(frame.f_code.co_filename) in _IDLE_MODULES:
+        return None
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class _Sampler(threading.Thread):
+    def __init__(self, interval=SAMPLE_INTERVAL_S):
+        super().__init__(name="profile-sampler", daemon=True)
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        me = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = _fold(frame)
+                if stack:
+                    self.stacks[stack] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        return self.stacks
+
+
+def _memory_stacks(snapshot):
+    snapshot = snapshot.filter_traces(
+        (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        )
+    )
+    stacks = Counter()
+    for stat in snapshot.statistics("traceback"):
+        names = [f"{os.path.basename(f.filename)}:{f.lineno}" for f in stat.traceback]
+        # tracemalloc tracebacks are most recent first
+        stacks[";".join(reversed(names))] += stat.size
+    return stacks
+
+
+def _write_folded(path, stacks):
+    with open(path, "w") as handle:
+        for stack, value in stacks.most_common():
+            handle.write(f"{stack} {value}\n")
+
+
+# --- Flame graph rendering ---
+
+_ROW = 16
+_WIDTH = 1200
+
+
+def _tree(stacks):
+    root = {"name": "all", "value": 0, "children": {}}
+    for stack, value in stacks.items():
+        root["value"] += value
+        node = root
+        for name in stack.split(";"):
+            node = node["children"].setdefault(
+                name, {"name": name, "value": 0, "children": {}}
+            )
+            node["value"] += value
+    return root
+
+
+def _depth(node):
+    return 1 + max((_depth(c) for c in node["children"].values()), default=0)
+
+
+def _color(name):
+    h = sum(ord(c) for c in name)
+    return f"rgb({205 + h % 50},{80 + h % 120},{40 + h % 40})"
+
+
+def _escape(text):
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def render_svg(stacks, title, unit):
+    """Render collapsed stacks as a standalone SVG flame graph."""
+    root = _tree(stacks)
+    total = root["value"] or 1
+    height = (_depth(root) + 2) * _ROW
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{_WIDTH}" '
+        f'height="{height}" font-family="monospace" font-size="11">',
+        f'<text x="4" y="{_ROW - 4}">{_escape(title)}</text>',
+    ]
+
+    def draw(node, x, depth):
+        width = node["value"] / total * _WIDTH
+        if width < 0.5:
+            return
+        y = height - (depth + 1) * _ROW
+        label = (
+            f"{node['name']} ({node['value']} {unit}, "
+            f"{node['value'] / total:.1%})"
+        )
+        parts.append(
+            f'<g><title>{_escape(label)}</title><rect x="{x:.1f}" y="{y}" '
+            f'width="{width:.1f}" height="{_ROW - 1}" '
+            f'fill="{_color(node["name"])}"/>'
+        )
+        chars = int(width / 7)
+        if chars > 3:
+            text = node["name"]
+            if len(text) > chars:
+                text = text[: chars - 2] + ".."
+            parts.append(
+                f'<text x="{x + 3:.1f}" y="{y + _ROW - 4}">{_escape(text)}</text>'
+            )
+        parts.append("</g>")
+        for child in sorted(node["children"].values(), key=lambda c: c["name"]):
+            draw(child, x, depth + 1)
+            x += child["value"] / total * _WIDTH
+
+    draw(root, 0.0, 0)
+    parts.append("</svg>")
+    return "\n".join(parts)
+
+
+# --- Request hooks ---
+
+
+def _slug(path):
+    return re.sub(r"[^A-Za-z0-9]+", "-", path).strip("-")[:40] or "root"
+
+
+def _start():
+    if not authorized() or not _busy.acquire(blocking=False):
+        return
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+    tracemalloc.reset_peak()
+    sampler = _Sampler()
+    sampler.start()
+    request.environ[_ENV_KEY] = {
+        "sampler": sampler,
+        "started_tracing": started_tracing,
+        "start": time.perf_counter(),
+    }
+
+
+def _finish(response):
+    state = request.environ.pop(_ENV_KEY, None)
+    if state is None:
+        if authorized():
+            response.headers["X-Profile-Id"] = "busy"
+        return response
+
+    try:
+        stacks = state["sampler"].stop()
+        elapsed = time.perf_counter() - state["start"]
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        if state["started_tracing"]:
+            tracemalloc.stop()
+
+        profile_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{_slug(request.path)}-"
+        profile_id += uuid.uuid4().hex[:6]
+        base = os.path.join(profile_dir(), profile_id)
+        title = f"{request.method} {request.full_path}"
+        memory = _memory_stacks(snapshot)
+
+        _write_folded(base + ".cpu.folded", stacks)
+        _write_folded(base + ".mem.folded", memory)
+        snapshot.dump(base + ".tracemalloc")
+        cpu_title = f"CPU {title} ({elapsed * 1000:.0f} ms)"
+        mem_title = f"Memory {title} (peak {peak / 1e6:.1f} MB)"
+        with open(base + ".cpu.svg", "w") as handle:
+            handle.write(render_svg(stacks, cpu_title, "samples"))
+        with open(base + ".mem.svg", "w") as handle:
+            handle.write(render_svg(memory, mem_title, "B"))
+        response.headers["X-Profile-Id"] = profile_id
+    except Exception as e:
+        print(f"[PROFILE] Failed to write profile: {e}", file=sys.stderr)
+    finally:
+        _busy.release()
+    return response
+
+
+def _teardown(exc):
+    # Only reached with state left over when the request failed before
+    # after_request ran; stop profiling without writing anything
+    state = request.environ.pop(_ENV_KEY, None)
+    if state is None:
+        return
+    state["sampler"].stop()
+    if state["started_tracing"]:
+        tracemalloc.stop()
+    _busy.release()
+
+
+def list_profiles():
+    names = sorted(os.listdir(profile_dir()), reverse=True)
+    return [n for n in names if not n.startswith(".")]
+
+
+def init_app(app):
+    """Install the profiling hooks when F1_PROFILE_TOKEN is set."""
+    if not enabled():
+        return
+    app.before_request(_start)
+    app.after_request(_finish)
+    app.teardown_request(_teardown)
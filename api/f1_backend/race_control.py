@@ -0,0 +1,175 @@
+"""Indexed race control messages per session.
+
+Messages are loaded on their own through a separate Session (like weather,
+without widening the cached session load), classified once and indexed by
+category, driver, lap and time so filtered, paginated queries never rescan
+the message text. A finished session whose cached load already has messages
+(qualifying summaries) is read from that snapshot instead.
+
+A live session is refetched on every request and its index is keyed by the
+message count, so it is only rebuilt when new messages arrive.
+"""
+
+import re
+import fastf1
+import numpy as np
+import pandas as pd
+from . import sessions
+
+CATEGORIES = (
+    "flag",
+    "safety_car",
+    "track_limits",
+    "penalty",
+    "investigation",
+    "drs",
+    "other",
+)
+
+_CAR = re.compile(r"\bCAR (\d+)")
+_PENALTY = re.compile(r"PENALTY|REPRIMAND|DISQUALIFIED|DRIVE THROUGH|STOP/GO")
+_INVESTIGATION = re.compile(r"INVESTIGATION|NOTED|NO FURTHER ACTION|REVIEWED")
+
+
+def _fetch_frame(session, year):
+    if not sessions.is_live(session) and sessions.is_cached(
+        session, year, messages=True
+    ):
+        return sessions.load(session, year, messages=True).race_control_messages
+    source = fastf1.get_session(year, int(session.event["RoundNumber"]), session.name)
+    source.load(laps=False, telemetry=False, weather=False, messages=True)
+    return source.race_control_messages
+
+
+def classify(category, message):
+    """Map a FastF1 message category and text to one of CATEGORIES."""
+    text = message.upper()
+    if "TRACK LIMITS" in text or ("DELETED" in text and "TIME" in text):
+        return "track_limits"
+    if _PENALTY.search(text):
+        return "penalty"
+    if _INVESTIGATION.search(text):
+        return "investigation"
+    if category == "SafetyCar" or "SAFETY CAR" in text:
+        return "safety_car"
+    if category == "Flag":
+        return "flag"
+    if category == "Drs":
+        return "drs"
+    return "other"
+
+
+def _driver(racing_number, message):
+    if pd.notna(racing_number) and str(racing_number).strip():
+        return str(racing_number).strip()
+    match = _CAR.search(message.upper())
+    return match.group(1) if match else None
+
+
+def _text(value):
+    return str(value) if pd.notna(value) else None
+
+
+def build_index(frame):
+    """Classify every message and index it by category, driver and lap."""
+    frame = frame.reset_index(drop=True)
+    messages = frame["Message"].fillna("").astype(str)
+    categories = [
+        classify(c, m) for c, m in zip(frame["Category"].astype(str), messages)
+    ]
+    drivers = [_driver(n, m) for n, m in zip(frame["RacingNumber"], messages)]
+    laps = pd.to_numeric(frame["Lap"], errors="coerce").to_numpy(dtype=float)
+
+    rows = []
+    for i, message in enumerate(messages):
+        time = frame["Time"].iloc[i]
+        sector = frame["Sector"].iloc[i]
+        rows.append(
+            {
+                "time": time.isoformat() if pd.notna(time) else None,
+                "lap": int(laps[i]) if not np.isnan(laps[i]) else None,
+                "category": categories[i],
+                "flag": _text(frame["Flag"].iloc[i]),
+                "scope": _text(frame["Scope"].iloc[i]),
+                "sector": int(sector) if pd.notna(sector) else None,
+                "driver_number": drivers[i],
+                "message": message,
+            }
+        )
+
+    by_category = {}
+    by_driver = {}
+    for i, (category, driver) in enumerate(zip(categories, drivers)):
+        by_category.setdefault(category, []).append(i)
+        if driver:
+            by_driver.setdefault(driver, []).append(i)
+
+    # Messages arrive in time order; keep a lap-sorted view for range queries
+    lap_order = np.argsort(laps, kind="stable")
+    return {
+        "rows": rows,
+        "by_category": {k: np.array(v) for k, v in by_category.items()},
+        "by_driver": {k: np.array(v) for k, v in by_driver.items()},
+        "lap_order": lap_order,
+        "lap_sorted": laps[lap_order],
+        "times": pd.to_datetime(frame["Time"]).to_numpy(dtype="datetime64[ns]"),
+    }
+
+
+def session_index(session, year):
+    """The message index of a session, built once (None without messages)."""
+    key = sessions.session_key(session, year)
+    if sessions.is_live(session):
+        frame = _fetch_frame(session, year)
+        if frame is None or frame.empty:
+            return None
+        return sessions.cached_result(
+            (key, len(frame)), "race_control", lambda: build_index(frame)
+        )
+
+    def build():
+        frame = _fetch_frame(session, year)
+        if frame is None or frame.empty:
+            return None
+        return build_index(frame)
+
+    return sessions.cached_result(key, "race_control", build)
+
+
+def query(
+    index,
+    categories=None,
+    driver=None,
+    lap_from=None,
+    lap_to=None,
+    since=None,
+    until=None,
+):
+    """Row ids matching every given filter, in time order."""
+    selected = np.arange(len(index["rows"]))
+    if since is not None or until is not None:
+        # Row ids are already in time order
+        times = index["times"]
+        lo = 0 if since is None else np.searchsorted(times, since, "left")
+        hi = len(times) if until is None else np.searchsorted(times, until, "right")
+        selected = selected[lo:hi]
+    if categories:
+        ids = [index["by_category"].get(c, np.empty(0, int)) for c in categories]
+        selected = np.intersect1d(selected, np.concatenate(ids))
+    if driver:
+        ids = index["by_driver"].get(driver, np.empty(0, int))
+        selected = np.intersect1d(selected, ids)
+    if lap_from is not None or lap_to is not None:
+        # Messages without a lap sort after every lap and are never in range
+        lo = np.searchsorted(
+            index["lap_sorted"], -np.inf if lap_from is None else lap_from, "left"
+        )
+        hi = np.searchsorted(
+            index["lap_sorted"], np.inf if lap_to is None else lap_to, "right"
+        )
+        selected = np.intersect1d(selected, index["lap_order"][lo:hi])
+    return selected
+
+
+def counts(index):
+    return {c: int(len(index["by_category"].get(c, ()))) for c in CATEGORIES}
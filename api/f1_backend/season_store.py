@@ -0,0 +1,522 @@
+"""Season-wide aggregates built from per-session checkpoints.
+
+Season views need every qualifying, sprint and race session of a year, which
+is dozens of session loads. Each finished session is summarised once
+(per-driver team, classification, points, best qualifying lap and
+representative race pace) in a worker process, or from Ergast results for
+seasons before 2018, and the summary is written as a checkpoint:
+
+    <DATA_PATH>/season/<year>/<round>-<session>.json
+
+Aggregates are then computed from the checkpoints alone, so a new round only
+costs the loads of its own sessions. Checkpoints written by an older
+SUMMARY_VERSION are rebuilt. Precompute a season ahead of requests with:
+
+    python -m f1_backend.season_store 2024
+
+F1_SEASON_WORKERS sets the process pool size (0 runs inline, which is the
+default on serverless hosts that cannot fork).
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import fastf1
+import fastf1.ergast
+import numpy as np
+import pandas as pd
+from flask import current_app
+from . import sessions, upstream
+from .utils import data_path, format_ergast_driver
+
+SUMMARY_VERSION = 4
+SEASON_SESSIONS = ("Qualifying", "Sprint", "Race")
+# Sessions Ergast has results for in the seasons FastF1 has no timing data
+ERGAST_SESSIONS = ("Qualifying", "Race")
+# Drivers with fewer representative laps have no meaningful race pace
+MIN_RACE_LAPS = 10
+
+_year_locks = {}
+_year_locks_guard = threading.Lock()
+
+
+def worker_count():
+    default = 0 if os.environ.get("VERCEL") else min(4, os.cpu_count() or 1)
+    try:
+        return max(0, int(os.environ.get("F1_SEASON_WORKERS", default)))
+    except ValueError:
+        return default
+
+
+def _year_lock(year):
+    with _year_locks_guard:
+        return _year_locks.setdefault(year, threading.Lock())
+
+
+def _checkpoint_path(year, round_number, session_name):
+    name = f"{round_number:02d}-{session_name.replace(' ', '_')}.json"
+    return data_path("season", str(year), name)
+
+
+def _read_checkpoint(path):
+    try:
+        with open(path) as handle:
+            summary = json.load(handle)
+    except (FileNotFoundError, ValueError):
+        return None
+    return summary if summary.get("version") == SUMMARY_VERSION else None
+
+
+def _write_checkpoint(path, summary):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as handle:
+        json.dump(summary, handle)
+    os.replace(tmp, path)
+
+
+def finished_sessions(year):
+    """(round, event name, session name) of every season session already run."""
+    schedule = fastf1.get_event_schedule(year, include_testing=False)
+    now = pd.Timestamp.now(tz="UTC").tz_localize(None)
+    finished = []
+    for _, event in schedule.iterrows():
+        task = (int(event["RoundNumber"]), str(event["EventName"]))
+        if year < 2018:
+            # Old schedules only carry the event date
+            date = event.get("EventDate")
+            if pd.notna(date) and date + pd.Timedelta(days=1) < now:
+                finished.extend((*task, name) for name in ERGAST_SESSIONS)
+            continue
+        for n in range(1, 6):
+            session_name = event.get(f"Session{n}")
+            date = event.get(f"Session{n}DateUtc")
+            if session_name not in SEASON_SESSIONS or pd.isna(date):
+                continue
+            if date + sessions.LIVE_WINDOW < now:
+                finished.append((*task, session_name))
+    return finished
+
+
+# --- Session summaries (run in worker processes) ---
+
+
+def _cache_path():
+    try:
+        return current_app.config.get("FASTF1_CACHE_PATH")
+    except RuntimeError:
+        return os.environ.get("F1_FASTF1_CACHE_PATH")
+
+
+def _init_worker(cache_path, upstream_mode, upstream_archive):
+    if cache_path:
+        fastf1.Cache.enable_cache(cache_path)
+    if upstream_mode:
+        upstream.configure(upstream_mode, upstream_archive)
+
+
+def _number(value, cast=int):
+    return cast(value) if pd.notna(value) else None
+
+
+def _driver_rows(session):
+    rows = {}
+    results = session.results
+    if results is None or results.empty:
+        return rows
+    for _, row in results.iterrows():
+        rows[str(row["DriverNumber"])] = {
+            "abbreviation": str(row["Abbreviation"]),
+            "team": str(row["TeamName"]) if pd.notna(row["TeamName"]) else None,
+            "team_color": (
+                str(row["TeamColor"]) if pd.notna(row["TeamColor"]) else "777777"
+            ),
+            "position": _number(row.get("Position")),
+            "points": _number(row.get("Points"), float) or 0.0,
+            "status": str(row["Status"]) if pd.notna(row.get("Status")) else None,
+        }
+    return rows
+
+
+def _summary(year, round_number, event_name, session_name, drivers):
+    return {
+        "version": SUMMARY_VERSION,
+        "year": year,
+        "round": round_number,
+        "event": event_name,
+        "session": session_name,
+        "drivers": drivers,
+    }
+
+
+def summarize_session(year, round_number, session_name):
+    """Per-driver summary of one session, as a JSON-ready dict."""
+    is_quali = any(k in session_name.lower() for k in ("qualifying", "shootout"))
+    session = fastf1.get_session(year, round_number, session_name)
+    # FastF1 only marks laps Deleted (track limits) from race control messages
+    session.load(laps=True, telemetry=False, weather=False, messages=is_quali)
+    laps = session.laps
+    drivers = _driver_rows(session)
+
+    if is_quali:
+        timed = laps[laps["LapTime"].notna()]
+        if "Deleted" in timed.columns:
+            timed = timed[~timed["Deleted"].fillna(False).astype(bool)]
+        best = timed.groupby("DriverNumber", observed=True)["LapTime"].min()
+        for number, lap_time in best.items():
+            row = drivers.setdefault(str(number), {})
+            row["best_lap"] = lap_time.total_seconds()
+    else:
+        # Green-flag, non-pit laps within 107% of the fastest lap
+        laps = laps.pick_wo_box().pick_track_status("4567", how="none")
+        laps = laps.pick_quicklaps()
+        pace = laps.groupby("DriverNumber", observed=True)["LapTime"].agg(
+            ["median", "count"]
+        )
+        for number, row_pace in pace.iterrows():
+            row = drivers.setdefault(str(number), {})
+            row["race_pace"] = row_pace["median"].total_seconds()
+            row["race_laps"] = int(row_pace["count"])
+
+    event_name = str(session.event["EventName"])
+    return _summary(year, round_number, event_name, session_name, drivers)
+
+
+def summarize_ergast(year, round_number, event_name, session_name):
+    """Summary of a pre-2018 session from Ergast results (no lap data).
+
+    Sessions Ergast has no results for (e.g. qualifying in early seasons)
+    are summarised as a `no_data` marker so they are not fetched again.
+    """
+    ergast = fastf1.ergast.Ergast()
+    if session_name == "Qualifying":
+        res = ergast.get_qualifying_results(season=year, round=round_number)
+    else:
+        res = ergast.get_race_results(season=year, round=round_number)
+    if not res.content or res.content[0].empty:
+        summary = _summary(year, round_number, event_name, session_name, {})
+        return {**summary, "no_data": True}
+
+    drivers = {}
+    for _, row in res.content[0].iterrows():
+        driver = format_ergast_driver(row)
+        entry = {
+            "abbreviation": driver["abbreviation"],
+            "team": driver["team_name"],
+            "team_color": driver["team_color"],
+            "position": _number(row.get("position")),
+        }
+        if session_name == "Qualifying":
+            times = [row.get(q) for q in ("Q1", "Q2", "Q3")]
+            times = [t.total_seconds() for t in times if pd.notna(t)]
+            if times:
+                entry["best_lap"] = min(times)
+        else:
+            entry["points"] = _number(row.get("points"), float) or 0.0
+            entry["status"] = str(row.get("status", ""))
+        # Old entries can lack a permanent number and a code, and the
+        # fallback abbreviation repeats for drivers sharing a surname
+        drivers[str(row["driverId"])] = entry
+    return _summary(year, round_number, event_name, session_name, drivers)
+
+
+# --- Pipeline ---
+
+
+def _summaries(year, wanted):
+    """Load checkpoints, computing the missing ones in a process pool."""
+    found, missing = [], []
+    for round_number, event_name, session_name in wanted:
+        path = _checkpoint_path(year, round_number, session_name)
+        summary = _read_checkpoint(path)
+        if summary is None:
+            missing.append((round_number, event_name, session_name))
+        elif not summary.get("no_data"):
+            found.append(summary)
+    if not missing:
+        return found, []
+
+    failed = []
+
+    def done(task, summary=None, error=None):
+        if error is not None:
+            print(
+                f"[SEASON] {year} {task[1]} {task[2]} failed: {error}", file=sys.stderr
+            )
+            failed.append(task)
+            return
+        _write_checkpoint(_checkpoint_path(year, task[0], task[2]), summary)
+        if not summary.get("no_data"):
+            found.append(summary)
+
+    workers = min(worker_count(), len(missing))
+    if year < 2018 or workers == 0:
+        for task in missing:
+            try:
+                if year < 2018:
+                    done(task, summarize_ergast(year, *task))
+                else:
+                    done(task, summarize_session(year, task[0], task[2]))
+            except Exception as e:
+                done(task, error=e)
+        return found, failed
+
+    mode = upstream.stats()
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(_cache_path(), mode["mode"], mode["archive"]),
+    )
+    with pool:
+        futures = {
+            pool.submit(summarize_session, year, task[0], task[2]): task
+            for task in missing
+        }
+        # Checkpoint as sessions finish so a failure keeps the work done
+        for future in as_completed(futures):
+            try:
+                done(futures[future], future.result())
+            except Exception as e:
+                done(futures[future], error=e)
+    return found, failed
+
+
+def season_summaries(year):
+    """Summaries of every finished session of a season, and the failed ones.
+
+    Concurrent callers for the same year wait for a single pipeline run.
+    """
+    wanted = finished_sessions(year)
+    with _year_lock(year):
+        summaries, failed = _summaries(year, wanted)
+    summaries.sort(key=lambda s: (s["round"], SEASON_SESSIONS.index(s["session"])))
+    return summaries, failed
+
+
+def missing_sessions(year):
+    """Finished sessions that have no checkpoint yet."""
+    return [
+        task
+        for task in finished_sessions(year)
+        if _read_checkpoint(_checkpoint_path(year, task[0], task[2])) is None
+    ]
+
+
+# --- Aggregates ---
+
+
+def _relative(values):
+    """Percent off the best value in a {driver: seconds} mapping."""
+    if not values:
+        return {}
+    best = min(values.values())
+    return {k: (v / best - 1) * 100 for k, v in values.items()}
+
+
+def _median(values):
+    return round(float(np.median(values)), 3) if values else None
+
+
+def pace_index(summaries):
+    """Season pace ranking of drivers and teams from session summaries.
+
+    Per event, qualifying is the gap of each driver's best lap to pole and
+    race pace the gap of their median representative lap to the quickest
+    driver's, both in percent. Season values are medians over events so a
+    single bad weekend does not dominate; the index averages the two.
+    """
+    drivers, teams, rounds = {}, {}, {}
+    for summary in summaries:
+        rounds.setdefault(summary["round"], summary["event"])
+        if summary["session"] not in ("Qualifying", "Race"):
+            continue
+        metric = "quali" if summary["session"] == "Qualifying" else "race"
+        if metric == "quali":
+            times = {
+                number: row["best_lap"]
+                for number, row in summary["drivers"].items()
+                if row.get("best_lap")
+            }
+        else:
+            times = {
+                number: row["race_pace"]
+                for number, row in summary["drivers"].items()
+                if row.get("race_pace") and row.get("race_laps", 0) >= MIN_RACE_LAPS
+            }
+
+        event_teams = {}
+        for number, gap in _relative(times).items():
+            row = summary["drivers"][number]
+            entry = drivers.setdefault(
+                number, {"driver_number": number, "quali": [], "race": []}
+            )
+            entry.update(
+                abbreviation=row.get("abbreviation"),
+                team=row.get("team"),
+                team_color=row.get("team_color"),
+            )
+            entry[metric].append(gap)
+            # A car's pace is its quicker driver's
+            team = row.get("team")
+            if team:
+                event_teams[team] = min(gap, event_teams.get(team, gap))
+                teams.setdefault(
+                    team,
+                    {
+                        "team": team,
+                        "team_color": row.get("team_color"),
+                        "quali": [],
+                        "race": [],
+                    },
+                )
+        for team, gap in event_teams.items():
+            teams[team][metric].append(gap)
+
+    def finish(entry):
+        quali = _median(entry.pop("quali", []))
+        race = _median(entry.pop("race", []))
+        known = [v for v in (quali, race) if v is not None]
+        entry["quali_gap_pct"] = quali
+        entry["race_pace_pct"] = race
+        entry["pace_index"] = round(sum(known) / len(known), 3) if known else None
+        return entry
+
+    def ranked(entries):
+        rows = [finish(e) for e in entries]
+        rows.sort(key=lambda r: (r["pace_index"] is None, r["pace_index"] or 0))
+        return rows
+
+    return {
+        "rounds": [{"round": r, "event": rounds[r]} for r in sorted(rounds)],
+        "drivers": ranked(drivers.values()),
+        "teams": ranked(teams.values()),
+    }
+
+
+def _finished(status):
+    """Whether a race status counts as a classified finish."""
+    status = (status or "").strip()
+    return status == "Finished" or status.startswith("+") or "Lap" in status
+
+
+def _pair_stats():
+    return {"quali_wins": [0, 0], "gaps": [], "race_wins": [0, 0], "races": 0}
+
+
+def _compare(pair, session_name, a, b):
+    if session_name == "Qualifying":
+        if a.get("position") and b.get("position"):
+            pair["quali_wins"][0 if a["position"] < b["position"] else 1] += 1
+        if a.get("best_lap") and b.get("best_lap"):
+            pair["gaps"].append(a["best_lap"] - b["best_lap"])
+    elif session_name == "Race":
+        a_done, b_done = _finished(a.get("status")), _finished(b.get("status"))
+        if a_done and b_done and a.get("position") and b.get("position"):
+            pair["race_wins"][0 if a["position"] < b["position"] else 1] += 1
+        elif a_done != b_done:
+            pair["race_wins"][0 if a_done else 1] += 1
+        else:
+            return
+        pair["races"] += 1
+
+
+def teammate_battles(summaries):
+    """Head-to-head records of every pair of teammates over a season.
+
+    Qualifying compares classification and best-lap gap (driver A minus B)
+    in sessions both drivers set a time; the race record counts Grand Prix
+    finishing order, a classified finish beating a retirement. Points add up
+    Grand Prix and sprint results with each team.
+    """
+    teams = {}
+    for summary in summaries:
+        by_team = {}
+        for key, row in summary["drivers"].items():
+            if row.get("team"):
+                by_team.setdefault(row["team"], []).append((key, row))
+
+        for team_name, entries in by_team.items():
+            team = teams.setdefault(
+                team_name,
+                {"team": team_name, "team_color": None, "drivers": {}, "pairs": {}},
+            )
+            for key, row in entries:
+                team["team_color"] = row.get("team_color") or team["team_color"]
+                driver = team["drivers"].setdefault(
+                    key,
+                    {
+                        "driver": key,
+                        "abbreviation": row.get("abbreviation"),
+                        "points": 0.0,
+                        "races": 0,
+                    },
+                )
+                if summary["session"] != "Qualifying":
+                    driver["points"] += row.get("points") or 0.0
+                if summary["session"] == "Race":
+                    driver["races"] += 1
+
+            entries.sort(key=lambda entry: entry[0])
+            for i, (key_a, a) in enumerate(entries):
+                for key_b, b in entries[i + 1 :]:
+                    pair = team["pairs"].setdefault((key_a, key_b), _pair_stats())
+                    _compare(pair, summary["session"], a, b)
+
+    rows = []
+    for team in teams.values():
+        pairs = []
+        for (key_a, key_b), pair in team["pairs"].items():
+            gaps = pair["gaps"]
+            pairs.append(
+                {
+                    "drivers": [
+                        team["drivers"][key_a]["abbreviation"],
+                        team["drivers"][key_b]["abbreviation"],
+                    ],
+                    "qualifying": {
+                        "wins": pair["quali_wins"],
+                        "sessions": sum(pair["quali_wins"]),
+                        "mean_gap_s": (
+                            round(float(np.mean(gaps)), 3) if gaps else None
+                        ),
+                        "median_gap_s": _median(gaps),
+                    },
+                    "race": {"wins": pair["race_wins"], "races": pair["races"]},
+                }
+            )
+        pairs.sort(key=lambda p: -p["qualifying"]["sessions"] - p["race"]["races"])
+        drivers = sorted(team["drivers"].values(), key=lambda d: -d["points"])
+        for driver in drivers:
+            driver["points"] = round(driver["points"], 1)
+        rows.append(
+            {
+                "team": team["team"],
+                "team_color": team["team_color"],
+                "points": round(sum(d["points"] for d in drivers), 1),
+                "drivers": drivers,
+                "pairs": pairs,
+            }
+        )
+    rows.sort(key=lambda r: -r["points"])
+    return {"teams": rows}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Checkpoint a season's sessions.")
+    parser.add_argument("year", type=int)
+    args = parser.parse_args(argv)
+
+    cache_path = _cache_path()
+    if cache_path:
+        fastf1.Cache.enable_cache(cache_path)
+    summaries, failed = season_summaries(args.year)
+    print(f"{len(summaries)} sessions checkpointed, {len(failed)} failed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,350 @@
+"""Loaded-session cache shared by every blueprint.
+
+Routes call `load_session()` instead of `fastf1.get_session(...).load()`.
+Loaded tables are captured once into a snapshot that is kept in a small
+in-process LRU and, when enabled, published to the cross-worker shared store
+so other processes can attach to it without loading the session again.
+
+Snapshots are compacted before caching (see `compaction`). Every request
+gets its own Session object whose frames are shallow copies of the snapshot
+with times widened back to timedeltas. This relies on pandas copy-on-write,
+which `create_app()` enables for the whole app: a route that assigns into
+one of those frames (e.g. `laps.loc[..., "Phase"]`) copies the touched
+columns first instead of mutating the cached snapshot or writing to a
+read-only shared mapping. Per-driver telemetry is only copied
+and widened for the drivers a request actually touches.
+"""
+
+from collections import OrderedDict
+import os
+import sys
+import threading
+import fastf1
+import pandas as pd
+from . import compaction, metrics, shared_store
+
+# Attributes that identify the session rather than hold loaded data
+_IDENTITY_ATTRS = {"event", "name", "date", "api_path", "f1_api_support"}
+_FLAGS = ("laps", "telemetry", "weather", "messages")
+# How long after its scheduled start a session may still be receiving laps
+LIVE_WINDOW = pd.Timedelta(hours=4)
+# Room for a whole weekend (/weekend-summary loads all five sessions) plus
+# the sessions concurrent requests are working on
+DEFAULT_CACHE_SIZE = 8
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_key_locks = {}
+
+# Values derived from loaded sessions (minisectors, track maps, ...)
+_results = OrderedDict()
+_results_lock = threading.Lock()
+
+
+def _max_sessions():
+    try:
+        return max(1, int(os.environ.get("F1_SESSION_CACHE_SIZE", DEFAULT_CACHE_SIZE)))
+    except ValueError:
+        return DEFAULT_CACHE_SIZE
+
+
+def _max_results():
+    try:
+        return max(1, int(os.environ.get("F1_RESULT_CACHE_SIZE", 128)))
+    except ValueError:
+        return 128
+
+
+def session_key(session, year):
+    """Stable identifier for a session, independent of how it was requested."""
+    round_number = int(session.event["RoundNumber"])
+    return f"{year}-{round_number:02d}-{session.name.replace(' ', '_')}"
+
+
+def is_live(session):
+    """Whether `session` is scheduled to be running (or just finished) now."""
+    date = getattr(session, "date", None)
+    if date is None or pd.isna(date):
+        return False
+    now = pd.Timestamp.now(tz="UTC").tz_localize(None)
+    return date <= now <= date + LIVE_WINDOW
+
+
+def _wanted_flags(laps, telemetry, weather, messages):
+    values = {
+        "laps": laps,
+        "telemetry": telemetry,
+        "weather": weather,
+        "messages": messages,
+    }
+    return frozenset(flag for flag in _FLAGS if values[flag])
+
+
+def _capture(session, flags):
+    """Collect the loaded state of a session into a snapshot dict."""
+    attrs = {
+        name: value
+        for name, value in vars(session).items()
+        if name not in _IDENTITY_ATTRS
+    }
+    return {"flags": frozenset(flags), "attrs": attrs}
+
+
+def _compaction_enabled():
+    return os.environ.get("F1_COMPACT_SESSIONS", "1").lower() not in (
+        "0",
+        "false",
+        "no",
+    )
+
+
+def _rewrap(frame, session):
+    """Shallow-copy a cached frame and point FastF1 metadata at `session`."""
+    copy = compaction.expand_times(frame.copy(deep=False))
+    if "session" in getattr(type(copy), "_metadata", ()):
+        copy.session = session
+    return copy
+
+
+class _LazyFrames(dict):
+    """Per-driver frames that are only rewrapped when first accessed."""
+
+    def __init__(self, frames, session):
+        super().__init__(frames)
+        self._session = session
+        self._ready = set()
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        if key not in self._ready:
+            value = _rewrap(value, self._session)
+            super().__setitem__(key, value)
+            self._ready.add(key)
+        return value
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def values(self):
+        return [self[key] for key in self]
+
+    def items(self):
+        return [(key, self[key]) for key in self]
+
+
+def _is_frame_dict(value):
+    return (
+        isinstance(value, dict)
+        and bool(value)
+        and all(isinstance(v, pd.DataFrame) for v in value.values())
+    )
+
+
+def _hydrate(session, snapshot):
+    for name, value in snapshot["attrs"].items():
+        if isinstance(value, pd.DataFrame):
+            value = _rewrap(value, session)
+        elif _is_frame_dict(value):
+            value = _LazyFrames(value, session)
+        setattr(session, name, value)
+    return session
+
+
+def _lookup(key, wanted):
+    with _cache_lock:
+        snapshot = _cache.get(key)
+        if snapshot is not None and wanted <= snapshot["flags"]:
+            _cache.move_to_end(key)
+            return snapshot
+
+    if not shared_store.enabled():
+        return None
+    snapshot = shared_store.attach(key, wanted)
+    metrics.record_cache("shared_session", snapshot is not None)
+    if snapshot is not None:
+        _remember(key, snapshot)
+    return snapshot
+
+
+def _remember(key, snapshot):
+    evicted = []
+    with _cache_lock:
+        previous = _cache.get(key)
+        if previous is not None and previous.get("shared") and not snapshot.get(
+            "shared"
+        ):
+            evicted.append(key)
+        _cache[key] = snapshot
+        _cache.move_to_end(key)
+        while len(_cache) > _max_sessions():
+            old_key = _cache.popitem(last=False)[0]
+            evicted.append(old_key)
+            _prune_lock(old_key)
+    for old_key in evicted:
+        shared_store.release(old_key)
+
+
+def _key_lock(key):
+    with _cache_lock:
+        return _key_locks.setdefault(key, threading.Lock())
+
+
+def _prune_lock(key):
+    """Forget the load lock of a key that is no longer cached.
+
+    Caller holds `_cache_lock`. A lock still held by a load is kept; at worst
+    a request that fetched the old lock races one using a new lock into a
+    duplicate load, which `_remember` resolves.
+    """
+    lock = _key_locks.get(key)
+    if lock is not None and not lock.locked():
+        del _key_locks[key]
+
+
+def _load_snapshot(session, key, wanted):
+    """Load a session from FastF1, compact it and publish it."""
+    with _cache_lock:
+        previous = _cache.get(key)
+    # Widen the load so one entry serves every route that hit it
+    flags = wanted | (previous["flags"] if previous else frozenset())
+    session.load(
+        laps="laps" in flags,
+        telemetry="telemetry" in flags,
+        weather="weather" in flags,
+        messages="messages" in flags,
+    )
+    snapshot = _capture(session, flags)
+    if _compaction_enabled():
+        snapshot = compaction.compact_snapshot(snapshot)
+        report = snapshot["compaction"]
+        print(
+            f"[SESSIONS] Compacted {key}: saved "
+            f"{report['bytes_saved'] / 1e6:.1f} MB "
+            f"({report['bytes_before'] / 1e6:.1f} -> "
+            f"{report['bytes_after'] / 1e6:.1f} MB)",
+            file=sys.stderr,
+        )
+    if shared_store.enabled():
+        try:
+            shared_store.publish(key, snapshot)
+            # Drop our private copy in favour of the shared mapping
+            snapshot = shared_store.attach(key, flags) or snapshot
+        except Exception as e:
+            print(
+                f"[SESSIONS] Failed to publish {key}: {e}",
+                file=sys.stderr,
+            )
+    _remember(key, snapshot)
+    return snapshot
+
+
+def load(session, year, laps=True, telemetry=False, weather=False, messages=False):
+    """Populate `session` from the cache, loading it from FastF1 on a miss.
+
+    Concurrent requests for the same cold session wait for a single load.
+    Returns the populated session for convenience.
+    """
+    wanted = _wanted_flags(laps, telemetry, weather, messages)
+    key = session_key(session, year)
+
+    with metrics.timed("load"):
+        snapshot = _lookup(key, wanted)
+        metrics.record_cache("session", snapshot is not None)
+        if snapshot is None:
+            try:
+                with _key_lock(key):
+                    snapshot = _lookup(key, wanted)
+                    if snapshot is None:
+                        snapshot = _load_snapshot(session, key, wanted)
+            finally:
+                # A failed load leaves nothing cached to keep the lock for
+                with _cache_lock:
+                    if key not in _cache:
+                        _prune_lock(key)
+        return _hydrate(session, snapshot)
+
+
+def load_session(
+    year,
+    event_key,
+    session_name,
+    laps=True,
+    telemetry=False,
+    weather=False,
+    messages=False,
+):
+    """Get and load a FastF1 session through the cache."""
+    session = fastf1.get_session(year, event_key, session_name)
+    return load(
+        session,
+        year,
+        laps=laps,
+        telemetry=telemetry,
+        weather=weather,
+        messages=messages,
+    )
+
+
+def is_cached(session, year, telemetry=False, weather=False, messages=False):
+    """Whether a load of `session` would be served without FastF1."""
+    wanted = _wanted_flags(True, telemetry, weather, messages)
+    key = session_key(session, year)
+    with _cache_lock:
+        snapshot = _cache.get(key)
+    if snapshot is not None and wanted <= snapshot["flags"]:
+        return True
+    return shared_store.enabled() and shared_store.contains(key, wanted)
+
+
+def cache_stats():
+    with _cache_lock:
+        entries = [
+            {
+                "key": key,
+                "flags": sorted(snapshot["flags"]),
+                "compaction": snapshot.get("compaction"),
+            }
+            for key, snapshot in _cache.items()
+        ]
+    return {
+        "max_sessions": _max_sessions(),
+        "sessions": entries,
+        "shared": shared_store.stats() if shared_store.enabled() else None,
+    }
+
+
+def cached_result(key, name, compute):
+    """Memoize `compute()` under (key, name) in a small LRU.
+
+    `key` is usually `session_key(...)` plus the request's parameters, so an
+    unloaded Session (from `fastf1.get_session`) is enough to hit the cache
+    without loading anything.
+    """
+    cache_key = (key, name)
+    with _results_lock:
+        if cache_key in _results:
+            _results.move_to_end(cache_key)
+            metrics.record_cache(name, True)
+            return _results[cache_key]
+
+    metrics.record_cache(name, False)
+    value = compute()
+    with _results_lock:
+        _results[cache_key] = value
+        _results.move_to_end(cache_key)
+        while len(_results) > _max_results():
+            _results.popitem(last=False)
+    return value
+
+
+def clear():
+    """Drop every session cached by this process."""
+    with _results_lock:
+        _results.clear()
+    with _cache_lock:
+        keys = list(_cache)
+        _cache.clear()
+        for key in list(_key_locks):
+            _prune_lock(key)
+    for key in keys:
+        shared_store.release(key)
@@ -0,0 +1,379 @@
+"""Cross-worker store of loaded session tables backed by memory-mapped files.
+
+Under a multi-worker WSGI server every process used to hold its own copy of
+`session.laps` and the per-driver telemetry. With F1_SHARED_SESSIONS set,
+the first worker to load a session publishes its tables column by column as
+`.npy` files (in /dev/shm when available), and every worker attaches to them
+with `np.load(mmap_mode="r")`. The pages live once in the OS page cache, so
+N workers cost roughly one copy of the hot sessions.
+
+Each attached process holds a reference file under `refs/<pid>`; snapshots
+without live references are evicted least-recently-used first once the
+store grows past F1_SHARED_SESSIONS_MB.
+
+Compacted frames map well: categoricals share their codes and int32 ms
+times are only widened on the per-request copies. Columns that cannot be
+mapped (object or extension dtypes) are pickled alongside the snapshot
+metadata and copied into each worker.
+"""
+
+import atexit
+from contextlib import contextmanager
+import os
+import pickle
+import shutil
+import sys
+import threading
+import time
+import numpy as np
+import pandas as pd
+from .utils import data_path
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to best-effort locking
+    fcntl = None
+
+DEFAULT_BUDGET_MB = 2048
+_META = "meta.pkl"
+
+_attached = {}
+_attached_lock = threading.Lock()
+
+
+def _root():
+    setting = os.environ.get("F1_SHARED_SESSIONS", "")
+    if setting.lower() in ("1", "true", "yes"):
+        if os.path.isdir("/dev/shm"):
+            path = "/dev/shm/f1_pitwall_sessions"
+        else:
+            path = os.path.dirname(data_path("shared_sessions", _META))
+    else:
+        path = setting
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def enabled():
+    return os.environ.get("F1_SHARED_SESSIONS", "").lower() not in (
+        "",
+        "0",
+        "false",
+        "no",
+    )
+
+
+def _budget_bytes():
+    try:
+        mb = float(os.environ.get("F1_SHARED_SESSIONS_MB", DEFAULT_BUDGET_MB))
+    except ValueError:
+        mb = DEFAULT_BUDGET_MB
+    return int(mb * 1024 * 1024)
+
+
+@contextmanager
+def _store_lock():
+    with open(os.path.join(_root(), ".lock"), "a") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def _dirname(key, flags):
+    return f"{key}@{'-'.join(sorted(flags))}"
+
+
+def _entries(key=None):
+    """Yield (dirname, key, flags) for every published snapshot."""
+    root = _root()
+    for name in os.listdir(root):
+        if "@" not in name or name.startswith("."):
+            continue
+        entry_key, tag = name.rsplit("@", 1)
+        if key is not None and entry_key != key:
+            continue
+        if not os.path.exists(os.path.join(root, name, _META)):
+            continue
+        yield name, entry_key, frozenset(f for f in tag.split("-") if f)
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass
+    return True
+
+
+def _live_refs(path):
+    refs_dir = os.path.join(path, "refs")
+    if not os.path.isdir(refs_dir):
+        return 0
+    live = 0
+    for name in os.listdir(refs_dir):
+        try:
+            pid = int(name)
+        except ValueError:
+            continue
+        if _pid_alive(pid):
+            live += 1
+        else:
+            try:
+                os.remove(os.path.join(refs_dir, name))
+            except OSError:
+                pass
+    return live
+
+
+def _dir_size(path):
+    total = 0
+    for base, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(base, name))
+            except OSError:
+                pass
+    return total
+
+
+# --- Frame (de)serialization ---
+
+
+def _write_frame(frame, path):
+    """Write a DataFrame column by column and return its metadata."""
+    os.makedirs(path, exist_ok=True)
+    columns = []
+    for i, name in enumerate(frame.columns):
+        series = frame[name]
+        dtype = series.dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            codes = np.asarray(series.cat.codes)
+            np.save(os.path.join(path, f"{i}.npy"), codes)
+            columns.append(
+                (name, "category", (list(dtype.categories), dtype.ordered))
+            )
+        elif isinstance(dtype, np.dtype) and dtype.kind in "biufcmM":
+            np.save(os.path.join(path, f"{i}.npy"), series.to_numpy())
+            columns.append((name, "array", None))
+        else:
+            # .array drops any FastF1 metadata (e.g. a session reference)
+            columns.append((name, "object", series.array))
+
+    if isinstance(frame.index, pd.RangeIndex):
+        index = ("range", frame.index.start, frame.index.stop, frame.index.step)
+    else:
+        index = ("object", frame.index)
+
+    return {
+        "class": type(frame),
+        "columns": columns,
+        "index": index,
+        "attrs": dict(frame.attrs),
+    }
+
+
+def _read_frame(meta, path):
+    """Rebuild a DataFrame whose array columns are read-only memory maps."""
+    data = {}
+    for i, (name, kind, extra) in enumerate(meta["columns"]):
+        if kind == "array":
+            data[name] = np.load(os.path.join(path, f"{i}.npy"), mmap_mode="r")
+        elif kind == "category":
+            codes = np.load(os.path.join(path, f"{i}.npy"), mmap_mode="r")
+            categories, ordered = extra
+            data[name] = pd.Categorical.from_codes(
+                codes, categories=categories, ordered=ordered
+            )
+        else:
+            data[name] = extra
+
+    kind, *index = meta["index"]
+    index = pd.RangeIndex(*index) if kind == "range" else index[0]
+    # copy=False keeps every column in its own block so nothing is consolidated
+    frame = pd.DataFrame(data, index=index, copy=False)
+    cls = meta["class"]
+    if cls is not pd.DataFrame:
+        frame = cls(frame)
+    frame.attrs.update(meta.get("attrs", {}))
+    return frame
+
+
+def _write_snapshot(snapshot, path):
+    frames, frame_dicts, scalars = {}, {}, {}
+    for name, value in snapshot["attrs"].items():
+        if isinstance(value, pd.DataFrame):
+            frames[name] = _write_frame(value, os.path.join(path, name))
+        elif (
+            isinstance(value, dict)
+            and value
+            and all(isinstance(v, pd.DataFrame) for v in value.values())
+        ):
+            frame_dicts[name] = {
+                k: _write_frame(v, os.path.join(path, name, str(k)))
+                for k, v in value.items()
+            }
+        else:
+            scalars[name] = value
+
+    return {
+        "flags": snapshot["flags"],
+        "frames": frames,
+        "frame_dicts": frame_dicts,
+        "scalars": scalars,
+        "compaction": snapshot.get("compaction"),
+        "created": time.time(),
+    }
+
+
+# --- Public API ---
+
+
+def publish(key, snapshot):
+    """Write a session snapshot to the store unless a superset exists."""
+    flags = snapshot["flags"]
+    if contains(key, flags):
+        return
+
+    root = _root()
+    tmp = os.path.join(root, f".tmp-{key}-{os.getpid()}-{threading.get_ident()}")
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+
+    try:
+        meta = _write_snapshot(snapshot, tmp)
+        with open(os.path.join(tmp, _META), "wb") as handle:
+            pickle.dump(meta, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+    with _store_lock():
+        target = os.path.join(root, _dirname(key, flags))
+        if os.path.exists(target):
+            shutil.rmtree(tmp, ignore_errors=True)
+        else:
+            os.rename(tmp, target)
+        _evict_locked()
+
+    print(f"[SHARED] Published {key} ({_dir_size(target)} bytes)", file=sys.stderr)
+
+
+def contains(key, wanted):
+    return any(wanted <= flags for _, _, flags in _entries(key))
+
+
+def attach(key, wanted):
+    """Map a published snapshot covering `wanted` into this process."""
+    root = _root()
+    with _store_lock():
+        match = None
+        for name, _, flags in _entries(key):
+            if wanted <= flags and (match is None or len(flags) < len(match[1])):
+                match = (name, flags)
+        if match is None:
+            return None
+
+        path = os.path.join(root, match[0])
+        refs_dir = os.path.join(path, "refs")
+        os.makedirs(refs_dir, exist_ok=True)
+        open(os.path.join(refs_dir, str(os.getpid())), "a").close()
+        os.utime(os.path.join(path, _META))
+
+    with open(os.path.join(path, _META), "rb") as handle:
+        meta = pickle.load(handle)
+
+    attrs = dict(meta["scalars"])
+    for name, frame_meta in meta["frames"].items():
+        attrs[name] = _read_frame(frame_meta, os.path.join(path, name))
+    for name, metas in meta["frame_dicts"].items():
+        attrs[name] = {
+            k: _read_frame(m, os.path.join(path, name, str(k)))
+            for k, m in metas.items()
+        }
+
+    with _attached_lock:
+        previous = _attached.get(key)
+        _attached[key] = match[0]
+    if previous and previous != match[0]:
+        _drop_ref(previous)
+
+    return {
+        "flags": match[1],
+        "attrs": attrs,
+        "compaction": meta.get("compaction"),
+        "shared": match[0],
+    }
+
+
+def _drop_ref(dirname):
+    try:
+        os.remove(os.path.join(_root(), dirname, "refs", str(os.getpid())))
+    except OSError:
+        pass
+
+
+def release(key):
+    """Drop this process's reference to a snapshot it attached."""
+    with _attached_lock:
+        dirname = _attached.pop(key, None)
+    if dirname:
+        _drop_ref(dirname)
+
+
+def _evict_locked():
+    """Remove unreferenced snapshots, oldest first, until under budget."""
+    root = _root()
+    entries = []
+    total = 0
+    for name, _, _ in _entries():
+        path = os.path.join(root, name)
+        size = _dir_size(path)
+        total += size
+        entries.append((os.path.getmtime(os.path.join(path, _META)), name, size))
+
+    budget = _budget_bytes()
+    for _, name, size in sorted(entries):
+        if total <= budget:
+            break
+        path = os.path.join(root, name)
+        if _live_refs(path):
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+        print(f"[SHARED] Evicted {name}", file=sys.stderr)
+
+
+def stats():
+    root = _root()
+    entries = []
+    for name, key, flags in _entries():
+        path = os.path.join(root, name)
+        entries.append(
+            {
+                "key": key,
+                "flags": sorted(flags),
+                "bytes": _dir_size(path),
+                "refs": _live_refs(path),
+            }
+        )
+    return {
+        "root": root,
+        "budget_bytes": _budget_bytes(),
+        "total_bytes": sum(e["bytes"] for e in entries),
+        "sessions": entries,
+    }
+
+
+@atexit.register
+def _release_all():
+    with _attached_lock:
+        dirnames = list(_attached.values())
+        _attached.clear()
+    for dirname in dirnames:
+        _drop_ref(dirname)
@@ -0,0 +1,233 @@
+"""Record and replay of upstream HTTP traffic (livetiming, Ergast, ...).
+
+FastF1 and `fastf1.ergast.Ergast` both fetch through `requests`, so a hook on
+`HTTPAdapter.send` sees every upstream call. With F1_UPSTREAM_MODE=record
+each response that comes back from the network is also written to an
+archive. With F1_UPSTREAM_MODE=replay nothing leaves the process: responses
+are served from the archive after a configurable delay, and unknown URLs
+fail with a ConnectionError like an offline network would.
+
+    F1_UPSTREAM_ARCHIVE     archive directory (default <DATA_PATH>/upstream)
+    F1_UPSTREAM_LATENCY_MS  replay delay, either "80" or a "40-120" range
+
+Capture everything the API needs for one session with:
+
+    python -m f1_backend.upstream record 2023 Qatar Qualifying
+
+Replayed responses still pass through FastF1's own cache, so point
+F1_FASTF1_CACHE_PATH at an empty directory to benchmark cold loads.
+"""
+
+import argparse
+import hashlib
+from io import BytesIO
+import json
+import os
+import random
+import sys
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
+
+MODES = ("record", "replay")
+
+# Headers that describe the wire encoding rather than the stored body
+_DROP_HEADERS = {
+    "content-encoding",
+    "content-length",
+    "transfer-encoding",
+    "connection",
+}
+
+_original_send = HTTPAdapter.send
+_state = {"mode": None, "archive": None, "latency": (0.0, 0.0)}
+_counts = {"recorded": 0, "replayed": 0, "missed": 0}
+_lock = threading.Lock()
+
+
+def _count(name):
+    with _lock:
+        _counts[name] += 1
+
+
+def _key(request):
+    """Archive key of a request: method, normalised URL and body."""
+    parts = urlsplit(request.url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    url = urlunsplit((parts.scheme, parts.netloc, parts.path, query, ""))
+    body = request.body or b""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    raw = f"{request.method} {url} {hashlib.sha1(body).hexdigest()}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _paths(key):
+    base = os.path.join(_state["archive"], key[:2], key)
+    return base + ".json", base + ".body"
+
+
+def _record(request, response):
+    meta_path, body_path = _paths(_key(request))
+    os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+    meta = {
+        "method": request.method,
+        "url": request.url,
+        "status": response.status_code,
+        "reason": response.reason,
+        "headers": {
+            k: v
+            for k, v in response.headers.items()
+            if k.lower() not in _DROP_HEADERS
+        },
+        "recorded": time.time(),
+    }
+    with open(body_path + ".tmp", "wb") as handle:
+        handle.write(response.content)
+    with open(meta_path + ".tmp", "w") as handle:
+        json.dump(meta, handle)
+    os.replace(body_path + ".tmp", body_path)
+    os.replace(meta_path + ".tmp", meta_path)
+    _count("recorded")
+
+
+def _replay(adapter, request):
+    meta_path, body_path = _paths(_key(request))
+    try:
+        with open(meta_path) as handle:
+            meta = json.load(handle)
+        with open(body_path, "rb") as handle:
+            body = handle.read()
+    except FileNotFoundError:
+        _count("missed")
+        raise requests.ConnectionError(
+            f"No recorded response for {request.method} {request.url}",
+            request=request,
+        )
+
+    low, high = _state["latency"]
+    if high > 0:
+        time.sleep(random.uniform(low, high))
+
+    raw = HTTPResponse(
+        body=BytesIO(body),
+        headers=meta["headers"],
+        status=meta["status"],
+        reason=meta["reason"],
+        preload_content=False,
+        decode_content=False,
+    )
+    _count("replayed")
+    return adapter.build_response(request, raw)
+
+
+def _send(adapter, request, **kwargs):
+    if _state["mode"] == "replay":
+        return _replay(adapter, request)
+
+    response = _original_send(adapter, request, **kwargs)
+    if _state["mode"] == "record":
+        try:
+            _record(request, response)
+        except OSError as e:
+            print(f"[UPSTREAM] Failed to record {request.url}: {e}", file=sys.stderr)
+    return response
+
+
+def _parse_latency(value):
+    """Parse "80" or "40-120" (milliseconds) into a (low, high) in seconds."""
+    if not value:
+        return (0.0, 0.0)
+    low, _, high = str(value).partition("-")
+    low = float(low) / 1000
+    high = float(high) / 1000 if high else low
+    return (min(low, high), max(low, high))
+
+
+def configure(mode, archive=None, latency_ms=None):
+    """Switch record/replay on (mode in MODES) or off (mode None)."""
+    if mode not in (None, *MODES):
+        raise ValueError(f"Unknown upstream mode: {mode}")
+    _state["mode"] = mode
+    _state["archive"] = archive
+    _state["latency"] = _parse_latency(latency_ms)
+    if mode:
+        os.makedirs(archive, exist_ok=True)
+        HTTPAdapter.send = _send
+    else:
+        HTTPAdapter.send = _original_send
+
+
+def install(app):
+    """Configure record/replay from the environment for an app."""
+    mode = os.environ.get("F1_UPSTREAM_MODE", "").lower()
+    if mode not in MODES:
+        return
+    archive = os.environ.get("F1_UPSTREAM_ARCHIVE") or os.path.join(
+        app.config["DATA_PATH"], "upstream"
+    )
+    configure(mode, archive, os.environ.get("F1_UPSTREAM_LATENCY_MS"))
+    print(f"[UPSTREAM] {mode.capitalize()} mode, archive at {archive}", file=sys.stderr)
+
+
+def stats():
+    with _lock:
+        counts = dict(_counts)
+    low, high = _state["latency"]
+    return {
+        "mode": _state["mode"],
+        "archive": _state["archive"],
+        "latency_ms": [low * 1000, high * 1000],
+        **counts,
+    }
+
+
+def record_session(year, event_key, session_name, archive):
+    """Fetch everything the API reads for one session into an archive."""
+    import fastf1
+    import fastf1.ergast
+
+    configure("record", archive)
+    try:
+        # Bypass FastF1's cache so every request reaches the network
+        with fastf1.Cache.disabled():
+            fastf1.get_event_schedule(year, include_testing=False)
+            session = fastf1.get_session(year, event_key, session_name)
+            round_number = int(session.event["RoundNumber"])
+            if year >= 2018:
+                session.load(laps=True, telemetry=True, weather=True, messages=True)
+                session.get_circuit_info()
+
+            ergast = fastf1.ergast.Ergast()
+            ergast.get_driver_standings(season=year, limit=1000)
+            ergast.get_constructor_standings(season=year, limit=1000)
+            ergast.get_race_results(season=year, round=round_number)
+            ergast.get_qualifying_results(season=year, round=round_number)
+    finally:
+        configure(None)
+    return stats()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record upstream responses.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    record = commands.add_parser("record", help="Record one session")
+    record.add_argument("year", type=int)
+    record.add_argument("event_key")
+    record.add_argument("session_name")
+    record.add_argument(
+        "--archive",
+        default=os.environ.get("F1_UPSTREAM_ARCHIVE", "upstream_archive"),
+    )
+    args = parser.parse_args(argv)
+
+    result = record_session(args.year, args.event_key, args.session_name, args.archive)
+    print(f"Recorded {result['recorded']} responses to {args.archive}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,7 @@
-from flask import jsonify
+from flask import jsonify, current_app
 from datetime import datetime
+import os
+import tempfile
 import pandas as pd
 
 HISTORICAL_TEAM_COLORS = {
@@ -73,6 +75,24 @@ def error_response(message, status_code=400):
     return jsonify({"error": message}), status_code
 
 
+def data_path(*parts):
+    """Return a path under the app's writable data directory.
+
+    Falls back to F1_DATA_PATH or the system temp dir when called outside an
+    application context (CLI tools, worker processes). Parent directories are
+    created on demand.
+    """
+    base = os.environ.get("F1_DATA_PATH")
+    if not base:
+        try:
+            base = current_app.config["DATA_PATH"]
+        except (RuntimeError, KeyError):
+            base = os.path.join(tempfile.gettempdir(), "f1_pitwall")
+    path = os.path.join(base, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
 def format_timedelta(td):
     """Formats a pandas Timedelta into a standard F1 string format."""
     if pd.isna(td):
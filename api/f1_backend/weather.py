@@ -0,0 +1,158 @@
+"""Per-minute weather series per session.
+
+Routes that already load a session with `weather=True` (the weekend recap)
+leave the weather in the cached snapshot, and it is read from there. Other
+sessions are loaded with `weather=False`; widening a cached load to include
+weather would reload every table. Instead a separate Session is loaded with
+weather only (a few KB from the live timing API). Either way the samples
+are resampled to one per minute and kept as float32 arrays:
+
+- in the process-wide result cache (`sessions.cached_result`),
+- on disk as `<DATA_PATH>/weather/<session key>.npz`, so a restart or
+  another worker never fetches the same session twice.
+
+A live session is still being recorded: its series is cached per sample
+interval and never written to disk.
+"""
+
+import os
+import sys
+import time
+import fastf1
+import numpy as np
+from . import sessions
+from .utils import data_path
+
+SAMPLE_SECONDS = 60
+# FastF1 column -> series name
+COLUMNS = {
+    "AirTemp": "air_temp",
+    "TrackTemp": "track_temp",
+    "Humidity": "humidity",
+    "Pressure": "pressure",
+    "WindSpeed": "wind_speed",
+    "WindDirection": "wind_direction",
+    "Rainfall": "rainfall",
+}
+# A session counts as wet/mixed once this share of minutes saw rain
+WET_SHARE = 0.5
+
+
+def _fetch_frame(session, year):
+    """Raw weather samples, without loading the rest of the session.
+
+    A finished session already cached with weather is read from its
+    snapshot; otherwise a fresh Session is used so the cached load of
+    `session` is not widened.
+    """
+    if not sessions.is_live(session) and sessions.is_cached(
+        session, year, weather=True
+    ):
+        return sessions.load(session, year, weather=True).weather_data
+    source = fastf1.get_session(year, int(session.event["RoundNumber"]), session.name)
+    source.load(laps=False, telemetry=False, weather=True, messages=False)
+    return source.weather_data
+
+
+def resample(frame):
+    """Per-minute means of every weather column, as float32 arrays.
+
+    Wind direction is averaged on the circle and rainfall becomes 1.0 for
+    any minute with rain. Minutes without samples are interpolated.
+    """
+    seconds = frame["Time"].dt.total_seconds().to_numpy()
+    bins = np.floor(seconds / SAMPLE_SECONDS).astype(int)
+    first = int(bins.min())
+    bins -= first
+    n = int(bins.max()) + 1
+    counts = np.bincount(bins, minlength=n)
+    have = counts > 0
+    safe = np.maximum(counts, 1)
+
+    def mean(values):
+        return np.bincount(bins, values, n) / safe
+
+    series = {"start_s": np.float32(first * SAMPLE_SECONDS)}
+    for column, name in COLUMNS.items():
+        if column not in frame.columns:
+            continue
+        values = frame[column].to_numpy(dtype=float)
+        if name == "wind_direction":
+            radians = np.deg2rad(values)
+            angle = np.arctan2(mean(np.sin(radians)), mean(np.cos(radians)))
+            binned = np.rad2deg(angle) % 360
+        elif name == "rainfall":
+            binned = (mean(values) > 0).astype(float)
+        else:
+            binned = mean(values)
+        if not have.all():
+            idx = np.arange(n)
+            binned = np.interp(idx, idx[have], binned[have])
+        series[name] = binned.astype(np.float32)
+    return series
+
+
+def _path(key):
+    return data_path("weather", f"{key}.npz")
+
+
+def _fetch_series(session, year):
+    frame = _fetch_frame(session, year)
+    if frame is None or frame.empty:
+        return None
+    return resample(frame)
+
+
+def _load_or_fetch(session, year, key):
+    path = _path(key)
+    try:
+        with np.load(path) as stored:
+            return {name: stored[name] for name in stored.files}
+    except (FileNotFoundError, ValueError, OSError):
+        pass
+
+    series = _fetch_series(session, year)
+    if series is None:
+        return None
+    tmp = f"{path}.{os.getpid()}.tmp.npz"
+    np.savez(tmp, **series)
+    os.replace(tmp, path)
+    return series
+
+
+def session_weather(session, year):
+    """Per-minute weather arrays for a session (None when there is no feed).
+
+    `session` need not be loaded.
+    """
+    key = sessions.session_key(session, year)
+    if sessions.is_live(session):
+        sample = int(time.time() // SAMPLE_SECONDS)
+        return sessions.cached_result(
+            (key, sample), "weather", lambda: _fetch_series(session, year)
+        )
+    return sessions.cached_result(
+        key, "weather", lambda: _load_or_fetch(session, year, key)
+    )
+
+
+def track_summary(session, year):
+    """Conditions and mean temperatures for recap insights."""
+    summary = {"weather": "N/A", "air_temp": None, "track_temp": None}
+    try:
+        series = session_weather(session, year)
+    except Exception as e:
+        print(f"[WEATHER] No weather for {session.name}: {e}", file=sys.stderr)
+        return summary
+    if not series:
+        return summary
+
+    if "rainfall" in series:
+        wet = float(series["rainfall"].mean())
+        summary["weather"] = (
+            "Wet" if wet >= WET_SHARE else ("Mixed" if wet > 0 else "Dry")
+        )
+    for name in ("air_temp", "track_temp"):
+        if name in series:
+            summary[name] = round(float(series[name].mean()), 1)
+    return summary
@@ -0,0 +1,45 @@
+"""Route tests served from the synthetic season in `bench.fixtures`.
+
+    cd api && python -m pytest tests
+"""
+
+import pytest
+from bench.fixtures import SyntheticSeason, install
+
+
+@pytest.fixture(scope="session")
+def season():
+    # Short races keep cold loads fast; the shape matches the benchmarks
+    return SyntheticSeason(race_laps=12, session_laps=6, hz=2.0)
+
+
+@pytest.fixture
+def app(season, tmp_path, monkeypatch):
+    # Keep job, layout and cache state out of the developer's data directory
+    monkeypatch.setenv("F1_DATA_PATH", str(tmp_path / "data"))
+    monkeypatch.setenv("F1_FASTF1_CACHE_PATH", str(tmp_path / "fastf1_cache"))
+    for name in ("F1_SHARED_SESSIONS", "F1_JOB_MODE", "F1_UPSTREAM_MODE"):
+        monkeypatch.delenv(name, raising=False)
+    # Worker processes would not see the patched FastF1
+    monkeypatch.setenv("F1_SEASON_WORKERS", "0")
+
+    from f1_backend import circuits, create_app, sessions
+
+    monkeypatch.setattr(circuits, "_index", None)
+    monkeypatch.setattr(circuits, "_layouts", {})
+    circuits._simplified.cache_clear()
+    sessions.clear()
+    with install(season):
+        yield create_app()
+    sessions.clear()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def race(season):
+    event = season.schedule(season.year).iloc[0]["EventName"]
+    return {"year": season.year, "event_key": event, "session_name": "Race"}
@@ -0,0 +1,70 @@
+from itertools import permutations, product
+import random
+from f1_backend import championship
+
+
+def _brute_force_worst(points, sessions, cars):
+    """Worst position of every entrant over every possible set of results."""
+    entrants = range(len(points))
+    car_owner = [e for e in entrants for _ in range(cars)]
+    per_session = [
+        list(permutations(range(len(car_owner)), len(slots))) for slots in sessions
+    ]
+    worst = [1] * len(points)
+    for outcome in product(*per_session):
+        final = list(points)
+        for slots, finishers in zip(sessions, outcome):
+            for value, car in zip(slots, finishers):
+                final[car_owner[car]] += value
+        for i in entrants:
+            ahead = sum(final[j] > final[i] for j in entrants if j != i)
+            worst[i] = max(worst[i], 1 + ahead)
+    return worst
+
+
+def _worst(points, sessions, cars=1):
+    # Bypass the memo so budget changes take effect
+    result = championship.evaluate.__wrapped__(tuple(points), sessions, cars)
+    return [row["worst_position"] for row in result]
+
+
+def _random_sessions(rng, count):
+    sessions = []
+    for _ in range(count):
+        slots = [float(rng.randint(1, 12)) for _ in range(rng.randint(1, 3))]
+        sessions.append(tuple(sorted(slots, reverse=True)))
+    return tuple(sessions)
+
+
+def test_worst_position_needs_two_rivals_sharing_the_slots():
+    points = (16.0, 24.0, 17.0, 6.0)
+    sessions = ((8.0,), (10.0, 9.0))
+
+    # 6 + 10 + 8 and 16 + 9 both pass the driver on 17
+    assert _worst(points, sessions)[2] == 4
+
+
+def test_worst_position_matches_brute_force():
+    rng = random.Random(0)
+    for _ in range(150):
+        points = tuple(float(rng.randint(0, 30)) for _ in range(5))
+        sessions = _random_sessions(rng, rng.randint(1, 3))
+        assert _worst(points, sessions) == _brute_force_worst(points, sessions, 1)
+
+
+def test_constructor_worst_position_matches_brute_force():
+    rng = random.Random(1)
+    for _ in range(40):
+        points = tuple(float(rng.randint(0, 30)) for _ in range(3))
+        sessions = _random_sessions(rng, 2)
+        assert _worst(points, sessions, 2) == _brute_force_worst(points, sessions, 2)
+
+
+def test_worst_position_falls_back_to_the_conservative_bound(monkeypatch):
+    monkeypatch.setattr(championship, "SEARCH_BUDGET", 0)
+    points = (16.0, 24.0, 17.0, 6.0)
+    sessions = ((8.0,), (10.0, 9.0))
+
+    # Everyone within reach of 17 counts as passing
+    assert _worst(points, sessions)[2] == 4
+    assert _worst(points, sessions)[0] == 4
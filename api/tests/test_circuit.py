@@ -0,0 +1,62 @@
+import math
+import fastf1
+from f1_backend import circuits, sessions
+
+
+def test_cold_track_map_builds_layout(client, race):
+    # Nothing is indexed yet, and the fixture leaves corner distances NaN
+    # unless telemetry was loaded, as FastF1 does
+    response = client.get("/api/track-map", query_string=race)
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["points"]
+    assert body["corners"]
+    assert all(math.isfinite(c["distance"]) for c in body["corners"])
+
+
+def test_track_map_reuses_indexed_outline(client, race):
+    assert client.get("/api/track-map", query_string=race).status_code == 200
+    sessions.clear()
+
+    response = client.get("/api/track-map", query_string=race)
+
+    assert response.status_code == 200
+    assert sessions.cache_stats()["sessions"] == []
+
+
+def test_circuit_info_loads_telemetry_for_unindexed_layout(app, race):
+    with app.app_context():
+        session = sessions.load_session(
+            race["year"], race["event_key"], race["session_name"]
+        )
+        assert session.get_circuit_info().corners["Distance"].isna().all()
+
+        layout = circuits.circuit_info(session, race["year"])
+
+        assert all(math.isfinite(c["distance"]) for c in layout["corners"])
+        location = fastf1.get_session(
+            race["year"], race["event_key"], race["session_name"]
+        ).event["Location"]
+        assert circuits.layout_for(location, race["year"]) == layout["key"]
+
+
+def test_new_season_finds_stored_layout_without_telemetry(client, race):
+    assert client.get("/api/track-map", query_string=race).status_code == 200
+    sessions.clear()
+    next_season = {**race, "year": race["year"] + 1}
+
+    response = client.get("/api/track-map", query_string=next_season)
+
+    assert response.status_code == 200
+    assert [entry["flags"] for entry in sessions.cache_stats()["sessions"]] == [
+        ["laps"]
+    ]
+
+
+def test_track_map_without_timed_laps_is_not_found(client, race, monkeypatch):
+    monkeypatch.setattr(fastf1.core.Laps, "pick_fastest", lambda self, *a: None)
+
+    response = client.get("/api/track-map", query_string=race)
+
+    assert response.status_code == 404
@@ -0,0 +1,75 @@
+import os
+import pandas as pd
+from f1_backend import race_control, sessions, weather
+
+
+def _cached_flags():
+    entries = sessions.cache_stats()["sessions"]
+    return {flag for entry in entries for flag in entry["flags"]}
+
+
+def test_weather_loads_without_widening_the_cached_session(client, race):
+    response = client.get("/api/weather", query_string={**race, "laps": 1})
+
+    assert response.status_code == 200
+    assert response.get_json()["lap_numbers"]
+    assert _cached_flags() == {"laps"}
+
+
+def test_race_control_loads_without_widening_the_cached_session(client, race):
+    sessions.load_session(race["year"], race["event_key"], race["session_name"])
+
+    response = client.get("/api/race-control", query_string=race)
+
+    assert response.status_code == 200
+    assert response.get_json()["messages"]
+    assert _cached_flags() == {"laps"}
+
+
+def test_weekend_summary_reads_weather_from_the_loaded_sessions(
+    client, season, monkeypatch
+):
+    fetches = []
+    get_session = weather.fastf1.get_session
+    monkeypatch.setattr(
+        weather.fastf1,
+        "get_session",
+        lambda *args: fetches.append(args) or get_session(*args),
+    )
+    event = season.schedule(season.year).iloc[0]["EventName"]
+
+    response = client.get(
+        "/api/weekend-summary",
+        query_string={"year": season.year, "event_key": event},
+    )
+
+    assert response.status_code == 200
+    tracks = [s["insights"]["track"] for s in response.get_json()["sessions"]]
+    assert tracks and all(track["weather"] != "N/A" for track in tracks)
+    assert fetches == []
+
+
+def test_live_weather_is_not_persisted(app, race, monkeypatch):
+    monkeypatch.setattr(sessions, "is_live", lambda session: True)
+    session = weather.fastf1.get_session(
+        race["year"], race["event_key"], race["session_name"]
+    )
+
+    with app.app_context():
+        assert weather.session_weather(session, race["year"])
+        key = sessions.session_key(session, race["year"])
+        assert not os.path.exists(weather._path(key))
+
+
+def test_live_race_control_index_follows_new_messages(app, race, monkeypatch):
+    monkeypatch.setattr(sessions, "is_live", lambda session: True)
+    session = race_control.fastf1.get_session(
+        race["year"], race["event_key"], race["session_name"]
+    )
+    message = race_control._fetch_frame(session, race["year"]).iloc[:1]
+    feed = [message]
+    monkeypatch.setattr(race_control, "_fetch_frame", lambda *args: feed[0])
+
+    assert len(race_control.session_index(session, race["year"])["rows"]) == 1
+    feed[0] = pd.concat([message, message])
+    assert len(race_control.session_index(session, race["year"])["rows"]) == 2
@@ -0,0 +1,49 @@
+import threading
+import time
+from f1_backend import executor
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_cheap_route_answers_while_heavy_requests_hold_threads(app, monkeypatch):
+    monkeypatch.setenv("F1_SERVER_THREADS", "4")
+    monkeypatch.setenv("F1_RESERVED_THREADS", "2")
+    monkeypatch.setattr(executor, "_admission", None)
+    monkeypatch.setattr(executor, "_pools", {})
+
+    release = threading.Event()
+
+    @executor.offload("telemetry")
+    def slow():
+        release.wait(5)
+        return "done"
+
+    app.add_url_rule("/api/_test_slow", view_func=slow)
+
+    statuses = []
+
+    def heavy():
+        statuses.append(app.test_client().get("/api/_test_slow").status_code)
+
+    threads = [threading.Thread(target=heavy) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    try:
+        _wait_for(lambda: executor.admission_stats()["in_flight"] == 2)
+
+        client = app.test_client()
+        assert client.get("/api/_test_slow").status_code == 503
+        assert client.get("/api").status_code == 200
+        assert executor.admission_stats()["rejected"] == 1
+    finally:
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+    assert statuses == [200, 200]
+    assert executor.admission_stats()["in_flight"] == 0
@@ -0,0 +1,24 @@
+from f1_backend import jobs, sessions
+
+
+def _key(app, query_string):
+    with app.test_request_context("/api/fastest-lap", query_string=query_string):
+        return jobs._request_key()
+
+
+def test_finished_session_jobs_share_a_key(app, race, monkeypatch):
+    monkeypatch.setattr(jobs.time, "time", lambda: 0.0)
+    first = _key(app, race)
+    monkeypatch.setattr(jobs.time, "time", lambda: 12 * 60 * 60.0)
+
+    assert _key(app, race) == first
+
+
+def test_live_session_jobs_expire_with_the_bucket(app, race, monkeypatch):
+    monkeypatch.setattr(sessions, "is_live", lambda session: True)
+    monkeypatch.setattr(jobs.time, "time", lambda: 0.0)
+    first = _key(app, race)
+    assert _key(app, race) == first
+
+    monkeypatch.setattr(jobs.time, "time", lambda: float(jobs.LIVE_JOB_TTL_SECONDS))
+    assert _key(app, race) != first
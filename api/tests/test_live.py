@@ -0,0 +1,86 @@
+from f1_backend.live import LiveFeed
+
+
+def test_replayed_deltas_keep_the_state_they_were_published_with():
+    feed = LiveFeed("unused.jsonl")
+    feed.ingest("DriverList", {"1": {"Tla": "VER", "TeamName": "Red Bull"}}, None)
+    feed.ingest("DriverList", {"1": {"TeamName": "Ferrari"}}, None)
+    feed.ingest(
+        "RaceControlMessages",
+        {"Messages": {"0": {"Message": "GREEN LIGHT - PIT EXIT OPEN"}}},
+        None,
+    )
+    feed.ingest(
+        "RaceControlMessages", {"Messages": {"0": {"Message": "RED FLAG"}}}, None
+    )
+
+    first, second, third, _ = feed.deltas_after(0)
+    assert first["drivers"]["1"]["team_name"] == "Red Bull"
+    assert second["drivers"]["1"]["team_name"] == "Ferrari"
+    assert third["race_control"]["Messages"]["0"]["Message"] == (
+        "GREEN LIGHT - PIT EXIT OPEN"
+    )
+
+
+def test_summary_rows_match_the_historical_shape():
+    feed = LiveFeed("unused.jsonl")
+    feed.ingest(
+        "DriverList",
+        {
+            "1": {"Tla": "VER", "TeamName": "Red Bull", "TeamColour": "3671C6"},
+            "44": {"Tla": "HAM", "TeamName": "Ferrari", "TeamColour": "E8002D"},
+        },
+        None,
+    )
+    for lap, time in ((1, "1:32.000"), (2, "1:31.500"), (3, "1:35.000")):
+        feed.ingest(
+            "TimingData",
+            {
+                "Lines": {
+                    "1": {
+                        "Position": "1",
+                        "NumberOfLaps": lap,
+                        "LastLapTime": {"Value": time},
+                    }
+                }
+            },
+            None,
+        )
+    feed.ingest(
+        "TimingAppData",
+        {
+            "Lines": {
+                "1": {
+                    "Stints": {
+                        # A used set: two laps old when fitted
+                        "0": {"Compound": "SOFT", "StartLaps": 2, "TotalLaps": 4},
+                        "1": {"Compound": "HARD", "StartLaps": 0, "TotalLaps": 1},
+                    }
+                }
+            }
+        },
+        None,
+    )
+
+    leader, unplaced = feed.summary_rows()
+
+    assert unplaced["abbreviation"] == "HAM"
+    assert unplaced["position"] == 2
+    assert set(leader) == {
+        "position",
+        "driver_number",
+        "abbreviation",
+        "full_name",
+        "team_name",
+        "team_color",
+        "stints",
+        "max_phase",
+    }
+    soft, hard = leader["stints"]
+    assert (soft["start_lap"], soft["end_lap"], soft["lap_count"]) == (1, 2, 2)
+    assert (hard["start_lap"], hard["end_lap"], hard["lap_count"]) == (3, 3, 1)
+    assert [lap["lap_number"] for lap in soft["laps"]] == [1, 2]
+    assert soft["laps"][1]["is_pb"] is True
+    assert soft["laps"][1]["type"] == "in"
+    assert hard["laps"][0]["type"] == "out"
+    assert hard["laps"][0]["lap_time"] == "1:35.000"
@@ -0,0 +1,53 @@
+from unittest import mock
+import pandas as pd
+from bench.fixtures import ErgastResponse
+from f1_backend import season_store
+
+
+def _ergast(results):
+    ergast = mock.Mock()
+    ergast.get_race_results.return_value = ErgastResponse(results, {})
+    ergast.get_qualifying_results.return_value = ErgastResponse(results, {})
+    return mock.patch("fastf1.ergast.Ergast", return_value=ergast)
+
+
+def test_ergast_summary_keeps_drivers_sharing_a_surname():
+    # Before 2014 drivers had no permanent code
+    results = pd.DataFrame(
+        [
+            {
+                "driverId": driver_id,
+                "driverCode": None,
+                "givenName": given,
+                "familyName": "Schumacher",
+                "constructorId": team,
+                "constructorName": team.title(),
+                "position": position,
+                "points": points,
+                "status": "Finished",
+            }
+            for driver_id, given, team, position, points in (
+                ("michael_schumacher", "Michael", "ferrari", 1, 10.0),
+                ("ralf_schumacher", "Ralf", "williams", 2, 6.0),
+            )
+        ]
+    )
+    with _ergast(results):
+        summary = season_store.summarize_ergast(2001, 1, "Australian GP", "Race")
+
+    assert set(summary["drivers"]) == {"michael_schumacher", "ralf_schumacher"}
+    assert summary["drivers"]["ralf_schumacher"]["abbreviation"] == "SCH"
+    assert summary["drivers"]["ralf_schumacher"]["points"] == 6.0
+
+
+def test_ergast_session_without_results_is_checkpointed(app):
+    tasks = [(1, "Australian Grand Prix", "Qualifying")]
+    with app.app_context(), _ergast(pd.DataFrame()) as ergast:
+        for _ in range(2):
+            summaries, failed = season_store._summaries(1990, tasks)
+            assert summaries == []
+            assert failed == []
+
+        assert ergast.call_count == 1
+        path = season_store._checkpoint_path(1990, 1, "Qualifying")
+        assert season_store._read_checkpoint(path)["no_data"] is True
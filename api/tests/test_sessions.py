@@ -0,0 +1,29 @@
+import pandas as pd
+from f1_backend import sessions
+
+
+def test_create_app_enables_copy_on_write(app):
+    assert pd.get_option("mode.copy_on_write") is True
+
+
+def test_request_frames_do_not_write_through_to_the_cache(app, race):
+    args = (race["year"], race["event_key"], race["session_name"])
+    first = sessions.load_session(*args)
+    first.laps.loc[first.laps.index[0], "Stint"] = -1
+
+    second = sessions.load_session(*args)
+
+    assert second.laps["Stint"].iloc[0] != -1
+
+
+def test_weekend_summary_stays_cached(client, season, monkeypatch):
+    event = season.schedule(season.year).iloc[0]["EventName"]
+    params = {"year": season.year, "event_key": event}
+    assert client.get("/api/weekend-summary", query_string=params).status_code == 200
+    assert len(sessions.cache_stats()["sessions"]) == 5
+
+    # The route skips sessions that fail to load, so count loads instead
+    reloads = []
+    monkeypatch.setattr(sessions, "_load_snapshot", lambda *a: reloads.append(a))
+    assert client.get("/api/weekend-summary", query_string=params).status_code == 200
+    assert reloads == []
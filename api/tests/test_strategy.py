@@ -0,0 +1,7 @@
+def test_pit_stops_without_stops(client, race, season):
+    # Short synthetic races are run without stops, leaving the pit columns empty
+    assert season.race_laps <= 20
+
+    response = client.get("/api/pit-stops", query_string=race)
+
+    assert response.status_code == 200
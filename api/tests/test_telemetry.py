@@ -0,0 +1,62 @@
+import json
+import math
+from f1_backend import lap_store, sessions
+
+
+def test_cold_corner_analysis_builds_layout(client, race):
+    response = client.get(
+        "/api/corner-analysis", query_string={**race, "laps": "1,16:5"}
+    )
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["corners"]
+    assert all(math.isfinite(c["distance"]) for c in body["corners"])
+    assert len(body["drivers"]) == 2
+
+
+def test_corner_analysis_reuses_stored_layout(client, race):
+    params = {**race, "laps": "1"}
+    assert client.get("/api/corner-analysis", query_string=params).status_code == 200
+    sessions.clear()
+
+    response = client.get("/api/corner-analysis", query_string=params)
+
+    assert response.status_code == 200
+    flags = [entry["flags"] for entry in sessions.cache_stats()["sessions"]]
+    assert flags == [["laps"]]
+
+
+def _stint_telemetry(response):
+    lines = response.get_data(as_text=True).splitlines()
+    return [json.loads(line)["telemetry"] for line in lines if line]
+
+
+def test_stint_telemetry_accepts_abbreviation(client, race):
+    params = {**race, "stint": 1, "points": 50}
+    by_number = client.get(
+        "/api/stint-telemetry", query_string={**params, "driver_number": "1"}
+    )
+    by_abbreviation = client.get(
+        "/api/stint-telemetry", query_string={**params, "driver_number": "VER"}
+    )
+
+    assert by_number.status_code == 200
+    assert by_abbreviation.status_code == 200
+    telemetry = _stint_telemetry(by_abbreviation)
+    assert any(telemetry)
+    assert telemetry == _stint_telemetry(by_number)
+
+
+def test_live_laps_are_sliced_but_not_stored(app, race, monkeypatch):
+    monkeypatch.setattr(sessions, "is_live", lambda session: True)
+    with app.app_context():
+        session = sessions.load_session(
+            race["year"], race["event_key"], race["session_name"], telemetry=True
+        )
+        _, lap = next(session.laps.iterlaps())
+
+        assert lap_store.store(session, race["year"], lap)["speed"].size
+        assert not lap_store.contains(
+            session, race["year"], lap["DriverNumber"], lap["LapNumber"]
+        )
@@ -1,47 +1,211 @@
 import { db } from "./database";
 
-const CACHE_DURATION_HOURS = 24; // Default cache duration for current data
-const ETERNAL_CACHE_HOURS = 99999; // A very long duration for static, historical data
-const CACHE_VERSION = 6; // Increment to invalidate all client-side caches
+const CACHE_VERSION = 7; // Increment to invalidate all client-side caches
+// Total size of cached responses; least recently used entries are evicted
+// beyond it. Override with VITE_CACHE_BUDGET_MB.
+const CACHE_BUDGET_BYTES =
+  (Number(import.meta.env.VITE_CACHE_BUDGET_MB) || 150) * 1024 * 1024;
+// Current-season entries are served without asking the server for this long,
+// then revalidated with If-None-Match
+const FRESH_MINUTES = 5;
+// Access times are written back at most this often per entry
+const ACCESS_WRITE_INTERVAL_MS = 60 * 1000;
+
+// Lap telemetry channels stored as typed arrays. Missing values are NaN in
+// float channels and -1 in brake/gear.
+const TELEMETRY_CHANNELS = {
+  time: Float32Array,
+  distance: Float32Array,
+  speed: Float32Array,
+  throttle: Float32Array,
+  rpm: Float32Array,
+  brake: Int8Array,
+  n_gear: Int8Array,
+  drs: Uint8Array,
+};
+
+function isCurrentSeason(year) {
+  return year >= new Date().getFullYear();
+}
+
+/**
+ * Approximate in-memory size of a cached value in bytes.
+ */
+function byteSize(value) {
+  if (value === null || value === undefined) return 0;
+  if (ArrayBuffer.isView(value)) return value.byteLength;
+  if (typeof value === "string") return value.length * 2;
+  if (typeof value !== "object") return 8;
+  let size = 0;
+  for (const key in value) {
+    size += key.length * 2 + byteSize(value[key]);
+  }
+  return size;
+}
+
+/**
+ * Converts telemetry rows into one typed array per channel.
+ */
+function toChannels(rows) {
+  const channels = {};
+  for (const [name, ArrayType] of Object.entries(TELEMETRY_CHANNELS)) {
+    channels[name] = new ArrayType(rows.length);
+  }
+  rows.forEach((row, i) => {
+    for (const name of Object.keys(TELEMETRY_CHANNELS)) {
+      const value = row[name];
+      if (name === "drs") {
+        channels.drs[i] = value ? 1 : 0;
+      } else if (value === null || value === undefined) {
+        channels[name][i] = channels[name] instanceof Int8Array ? -1 : NaN;
+      } else {
+        channels[name][i] = Number(value);
+      }
+    }
+  });
+  return channels;
+}
+
+/**
+ * Stores each driver's lap telemetry as typed-array `channels` instead of
+ * row objects, which are far larger and slow to read back from IndexedDB.
+ */
+function packLapTelemetry(data) {
+  const packed = { ...data };
+  for (const key of ["driver1", "driver2"]) {
+    if (!data[key]) continue;
+    const { telemetry, ...driver } = data[key];
+    packed[key] = { ...driver, channels: toChannels(telemetry || []) };
+  }
+  return packed;
+}
+
+/**
+ * Evicts least recently used entries until the cache fits in `budget` bytes.
+ */
+async function evictToBudget(budget = CACHE_BUDGET_BYTES) {
+  const entries = await db.api_cache_meta.orderBy("accessed").toArray();
+  let total = entries.reduce((sum, entry) => sum + entry.size, 0);
+  const evicted = [];
+  for (const entry of entries) {
+    if (total <= budget) break;
+    evicted.push(entry.url);
+    total -= entry.size;
+  }
+  if (evicted.length === 0) return;
+  console.log(`[Cache] Evicting ${evicted.length} least recently used entries`);
+  await db.transaction("rw", db.api_cache, db.api_cache_meta, async () => {
+    await db.api_cache.bulkDelete(evicted);
+    await db.api_cache_meta.bulkDelete(evicted);
+  });
+}
+
+function isQuotaError(e) {
+  return (
+    e?.name === "QuotaExceededError" || e?.inner?.name === "QuotaExceededError"
+  );
+}
+
+async function storeEntry(entry, size) {
+  const write = () =>
+    db.transaction("rw", db.api_cache, db.api_cache_meta, async () => {
+      await db.api_cache.put(entry);
+      await db.api_cache_meta.put({ url: entry.url, size, accessed: Date.now() });
+    });
+  try {
+    await write();
+  } catch (e) {
+    if (!isQuotaError(e)) throw e;
+    // The browser's quota is tighter than our budget: make room and retry once
+    await evictToBudget(CACHE_BUDGET_BYTES / 2);
+    await write();
+  }
+  await evictToBudget();
+}
+
+function touchEntry(url) {
+  const now = Date.now();
+  db.api_cache_meta
+    .where("url")
+    .equals(url)
+    .modify((meta) => {
+      if (now - meta.accessed > ACCESS_WRITE_INTERVAL_MS) meta.accessed = now;
+    })
+    .catch((e) => console.warn(`[Cache] Could not update ${url}:`, e));
+}
 
 /**
- * Fetches data from a URL, with client-side caching in IndexedDB.
+ * Fetches data from a URL, with a size-bounded LRU cache in IndexedDB.
+ *
+ * Entries are kept until evicted. With `revalidate` (current-season data),
+ * an entry older than FRESH_MINUTES is revalidated with a conditional
+ * request; a 304 keeps the cached copy without downloading it again.
  * @param {string} url The URL to fetch.
- * @param {number} cacheHours The number of hours to cache the response.
- * @returns {Promise<any>} The JSON response data.
+ * @param {object} [options]
+ * @param {boolean} [options.revalidate] Revalidate stale entries with the server.
+ * @param {function} [options.transform] Turns the JSON response into the value
+ *   that is cached and returned.
+ * @returns {Promise<any>} The (transformed) JSON response data.
  */
-async function fetchAndCache(url, cacheHours = CACHE_DURATION_HOURS) {
+async function fetchAndCache(url, { revalidate = false, transform } = {}) {
   // Append version to URL to force cache invalidation on version bump
   const separator = url.includes("?") ? "&" : "?";
   const versionedUrl = `${url}${separator}v=${CACHE_VERSION}`;
 
-  const cacheMillis = cacheHours * 60 * 60 * 1000;
-
-  // 1. Check for cached data using versioned URL
-  const cached = await db.api_cache.get(versionedUrl);
-  if (cached && Date.now() - cached.timestamp < cacheMillis) {
+  // 1. Serve from the cache unless the entry needs revalidating
+  let cached;
+  try {
+    cached = await db.api_cache.get(versionedUrl);
+  } catch (e) {
+    console.warn(`[Cache] Read failed for ${versionedUrl}:`, e);
+  }
+  const fresh =
+    cached &&
+    (!revalidate || Date.now() - cached.timestamp < FRESH_MINUTES * 60 * 1000);
+  if (fresh) {
     console.log(`[Cache] HIT for ${versionedUrl}`);
+    touchEntry(versionedUrl);
     return cached.data;
   }
 
-  console.log(`[Cache] MISS for ${versionedUrl}. Fetching from network...`);
+  // 2. Fetch from network, conditionally when we hold an entry with an ETag
+  const headers = cached?.etag ? { "If-None-Match": cached.etag } : {};
+  let res;
+  try {
+    res = await fetch(versionedUrl, { headers });
+  } catch (e) {
+    if (!cached) throw e;
+    console.warn(`[Cache] Offline, serving stale ${versionedUrl}`);
+    return cached.data;
+  }
 
-  // 2. If not cached or expired, fetch from network
-  // We fetch the original URL, but store it under the versioned key?
-  // actually, let's fetch the original URL from network (backend ignores extra params usually)
-  // or better, fetch the versioned URL so backend logs show version too.
-  const res = await fetch(versionedUrl);
+  if (res.status === 304 && cached) {
+    console.log(`[Cache] REVALIDATED ${versionedUrl}`);
+    await db.api_cache.update(versionedUrl, { timestamp: Date.now() });
+    touchEntry(versionedUrl);
+    return cached.data;
+  }
   if (!res.ok) {
     throw new Error(`HTTP error! status: ${res.status}`);
   }
-  const data = await res.json();
+  console.log(`[Cache] MISS for ${versionedUrl}. Fetched from network.`);
+  const json = await res.json();
+  const data = transform ? transform(json) : json;
 
-  // 3. Store the new data in the cache under versioned key
-  await db.api_cache.put({
-    url: versionedUrl,
-    data,
-    timestamp: Date.now(),
-  });
+  // 3. Store the new data under the versioned key
+  try {
+    await storeEntry(
+      {
+        url: versionedUrl,
+        data,
+        etag: res.headers.get("ETag"),
+        timestamp: Date.now(),
+      },
+      byteSize(data),
+    );
+  } catch (e) {
+    console.warn(`[Cache] Could not store ${versionedUrl}:`, e);
+  }
 
   return data;
 }
@@ -49,45 +213,33 @@ async function fetchAndCache(url, cacheHours = CACHE_DURATION_HOURS) {
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || "/api";
 
 /**
- * Gets the schedule for a given year. Caches data for past years indefinitely.
+ * Gets the schedule for a given year. Current-season data is revalidated.
  */
 export async function getEvents(year) {
   const url = `${API_BASE_URL}/events?year=${year}`;
-  const cacheHours =
-    year < new Date().getFullYear()
-      ? ETERNAL_CACHE_HOURS
-      : CACHE_DURATION_HOURS;
-  return await fetchAndCache(url, cacheHours);
+  return await fetchAndCache(url, { revalidate: isCurrentSeason(year) });
 }
 
 /**
- * Gets the sessions for a given event. Caches data for past years indefinitely.
+ * Gets the sessions for a given event. Current-season data is revalidated.
  */
 export async function getSessions(year, eventKey) {
   if (!year || !eventKey) return { sessions: [] };
   const url = `${API_BASE_URL}/sessions?year=${year}&event_key=${eventKey}`;
-  const cacheHours =
-    year < new Date().getFullYear()
-      ? ETERNAL_CACHE_HOURS
-      : CACHE_DURATION_HOURS;
-  return await fetchAndCache(url, cacheHours);
+  return await fetchAndCache(url, { revalidate: isCurrentSeason(year) });
 }
 
 /**
- * Gets the drivers for a given session. Caches data for past years indefinitely.
+ * Gets the drivers for a given session. Current-season data is revalidated.
  */
 export async function getDrivers(year, eventKey, sessionName) {
   if (!year || !eventKey || !sessionName) return { drivers: [] };
   const url = `${API_BASE_URL}/drivers?year=${year}&event_key=${eventKey}&session_name=${sessionName}`;
-  const cacheHours =
-    year < new Date().getFullYear()
-      ? ETERNAL_CACHE_HOURS
-      : CACHE_DURATION_HOURS;
-  return await fetchAndCache(url, cacheHours);
+  return await fetchAndCache(url, { revalidate: isCurrentSeason(year) });
 }
 
 /**
- * Gets the lap-by-lap comparison for two drivers. This data is static and cached indefinitely.
+ * Gets the lap-by-lap comparison for two drivers. This data is static and cached until evicted.
  */
 export async function getRaceComparison(
   year,
@@ -98,11 +250,12 @@ export async function getRaceComparison(
 ) {
   if (!year || !eventKey || !sessionName || !driver1 || !driver2) return null;
   const url = `${API_BASE_URL}/race-comparison?year=${year}&event_key=${eventKey}&session_name=${sessionName}&driver1_number=${driver1}&driver2_number=${driver2}`;
-  return await fetchAndCache(url, ETERNAL_CACHE_HOURS);
+  return await fetchAndCache(url);
 }
 
 /**
- * Gets the telemetry for specific laps for two drivers. This data is static and cached indefinitely.
+ * Gets the telemetry for specific laps for two drivers. This data is static and
+ * cached until evicted; each driver's `channels` are typed arrays.
  */
 export async function getLapTelemetry(
   year,
@@ -124,7 +277,7 @@ export async function getLapTelemetry(
   )
     return null;
   const url = `${API_BASE_URL}/lap-telemetry?year=${year}&event_key=${eventKey}&session_name=${sessionName}&driver1_number=${driver1}&driver2_number=${driver2}&lap1_number=${lap1}&lap2_number=${lap2}`;
-  return await fetchAndCache(url, ETERNAL_CACHE_HOURS);
+  return await fetchAndCache(url, { transform: packLapTelemetry });
 }
 
 /**
@@ -133,11 +286,7 @@ export async function getLapTelemetry(
 export async function getRaceSummary(year, eventKey, sessionName) {
   if (!year || !eventKey || !sessionName) return null;
   const url = `${API_BASE_URL}/race-summary?year=${year}&event_key=${eventKey}&session_name=${sessionName}`;
-  const cacheHours =
-    year < new Date().getFullYear()
-      ? ETERNAL_CACHE_HOURS
-      : CACHE_DURATION_HOURS;
-  return await fetchAndCache(url, cacheHours);
+  return await fetchAndCache(url, { revalidate: isCurrentSeason(year) });
 }
 
 /**
@@ -146,11 +295,7 @@ export async function getRaceSummary(year, eventKey, sessionName) {
 export async function getWeekendSummary(year, eventKey) {
   if (!year || !eventKey) return null;
   const url = `${API_BASE_URL}/weekend-summary?year=${year}&event_key=${eventKey}`;
-  const cacheHours =
-    year < new Date().getFullYear()
-      ? ETERNAL_CACHE_HOURS
-      : CACHE_DURATION_HOURS;
-  return await fetchAndCache(url, cacheHours);
+  return await fetchAndCache(url, { revalidate: isCurrentSeason(year) });
 }
 
 /**
@@ -159,9 +304,5 @@ export async function getWeekendSummary(year, eventKey) {
 export async function getStandings(year) {
   if (!year) return null;
   const url = `${API_BASE_URL}/standings?year=${year}`;
-  const cacheHours =
-    year < new Date().getFullYear()
-      ? ETERNAL_CACHE_HOURS
-      : CACHE_DURATION_HOURS;
-  return await fetchAndCache(url, cacheHours);
+  return await fetchAndCache(url, { revalidate: isCurrentSeason(year) });
 }
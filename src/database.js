@@ -2,10 +2,19 @@ import Dexie from "dexie";
 
 export const db = new Dexie("F1TelemetryCache");
 
-// Single schema version. Cache busting is handled by the CACHE_VERSION
-// constant in api.js which appends a version param to every URL.
-// Incrementing CACHE_VERSION there automatically invalidates stale entries
-// without needing a new Dexie schema migration each time.
+// Cache busting is handled by the CACHE_VERSION constant in api.js which
+// appends a version param to every URL. Incrementing CACHE_VERSION there
+// automatically invalidates stale entries without needing a new Dexie schema
+// migration each time.
 db.version(1).stores({
   api_cache: "&url, timestamp",
 });
+
+// Responses and their bookkeeping are kept apart so LRU eviction only scans
+// the small api_cache_meta rows (size and last access), never the payloads.
+db.version(2)
+  .stores({
+    api_cache: "&url",
+    api_cache_meta: "&url, accessed",
+  })
+  .upgrade((tx) => tx.table("api_cache").clear());